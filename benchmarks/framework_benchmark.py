@@ -0,0 +1,298 @@
+# framework_benchmark.py
+# Narzut frameworka: raportowanie wyników, asercje, logowanie, wyszukiwanie urządzeń, wykrywanie testów
+# i ładowanie konfiguracji - dla zestawów od 10 do 100 000 testów, z urządzeniami symulowanymi.
+# Uruchomienie: python -m benchmarks.framework_benchmark [--save-baseline] [--threshold 0.25] [--quick]
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+from core.assertions import TEST_ASSERT_EQUAL, clear_test_context, set_test_context
+from core.logger import Logger
+from core.measurement import measure
+from core.peripheral_manager import Peripheral, PeripheralManager
+from core.test_framework import TestFramework
+from core.test_group_factory import create_test_group
+
+SIZES = [10, 100, 1000, 10000, 100000]
+QUICK_SIZES = [10, 100, 1000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "framework_baseline.json")
+DEFAULT_THRESHOLD = 0.25  # Dopuszczalny wzrost czasu względem wzorca (25%)
+MIN_TIME = 0.2  # Minimalny czas pomiaru jednego przypadku [s]
+MAX_REPEATS = 50  # Maksymalna liczba powtórzeń przypadku (wynik - najszybsze powtórzenie)
+SIMULATED_DEVICES = 16  # Liczba urządzeń symulowanych w PeripheralManager
+TESTS_PER_RUNNER = 100  # Liczba testów w jednym generowanym pliku *_runner.py
+MAX_CONFIG_DEVICES = 1000  # Największa liczba wpisów GPIO w generowanej konfiguracji YAML
+
+
+class SimulatedDevice(Peripheral):
+    """
+    Urządzenie bez sprzętu - inicjalizacja i zwalnianie nic nie robią.
+    """
+    def get_required_resources(self):
+        return {}
+
+    def initialize(self):
+        pass
+
+    def release(self):
+        pass
+
+
+def simulated_devices(count=SIMULATED_DEVICES):
+    """
+    Urządzenia symulowane o różnych nazwach klas (get_device wyszukuje po nazwie klasy).
+    """
+    return {"protocols": [], "peripherals": [type(f"SimulatedDevice{i}", (SimulatedDevice,), {})()
+                                             for i in range(count)]}
+
+
+def _per_operation(function, operations):
+    """
+    Czas jednej operacji [s]: najszybsze z powtórzeń function() (wykonującej operations operacji).
+    Wyjście konsoli trafia do /dev/null - mierzony jest koszt formatowania i zapisu, nie terminala.
+    """
+    with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+        result = measure(function, iterations=MAX_REPEATS, duration=MIN_TIME, warmup=1)
+    return result.min / operations
+
+
+def bench_report_test_result(size, workdir):
+    framework = TestFramework(PeripheralManager(simulated_devices(), Logger()), Logger())
+    report = framework.report_test_result
+
+    def run():
+        for index in range(size):
+            report("Benchmark", "Test", True)
+    return _per_operation(run, size)
+
+
+def bench_assertion(aggregate):
+    def bench(size, workdir):
+        framework = TestFramework(PeripheralManager(simulated_devices(), Logger()), Logger())
+        framework.aggregate_results = aggregate
+
+        def run():
+            set_test_context(framework, "Benchmark", "Test")
+            for index in range(size):
+                TEST_ASSERT_EQUAL(index, index)
+            clear_test_context()
+        return _per_operation(run, size)
+    return bench
+
+
+def bench_logger(to_file):
+    def bench(size, workdir):
+        logger = Logger(os.path.join(workdir, "benchmark.log") if to_file else None)
+
+        def run():
+            for index in range(size):
+                logger.log("[PASS] Benchmark, Test", to_console=not to_file, to_log_file=to_file)
+        return _per_operation(run, size)
+    return bench
+
+
+def bench_get_device(size, workdir):
+    manager = PeripheralManager(simulated_devices(), Logger())
+    name = f"SimulatedDevice{SIMULATED_DEVICES - 1}"  # Ostatnie urządzenie - najdłuższe wyszukiwanie
+
+    def run():
+        for index in range(size):
+            manager.get_device("peripherals", name)
+    return _per_operation(run, size)
+
+
+def bench_suite_run(size, workdir):
+    """
+    Cały przebieg run_all_tests: size testów po jednej asercji w grupach po TESTS_PER_RUNNER.
+    """
+    def test(framework, group_name, test_name):
+        TEST_ASSERT_EQUAL(1, 1)
+
+    def run():
+        logger = Logger()
+        framework = TestFramework(PeripheralManager(simulated_devices(), logger), logger)
+        for start in range(0, size, TESTS_PER_RUNNER):
+            count = min(TESTS_PER_RUNNER, size - start)
+            framework.add_test_group(create_test_group(f"Group {start // TESTS_PER_RUNNER}", None, None,
+                                                       [(f"Test {i}", test) for i in range(count)]))
+        framework.run_all_tests()
+    return _per_operation(run, size)
+
+
+_RUNNER_TEMPLATE = '''from core.test_group_factory import create_test_group
+
+
+def _test(framework, group_name, test_name):
+    pass
+
+
+group = create_test_group("Group {index}", None, None, [("Test %d" % i, _test) for i in range({count})])
+'''
+
+
+def _forget_tests_package():
+    for name in [name for name in sys.modules if name == "tests" or name.startswith("tests.")]:
+        del sys.modules[name]
+
+
+def bench_discovery(size, workdir):
+    """
+    load_test_groups na wygenerowanym katalogu tests/ z size testami (czas na test).
+    """
+    from run_tests import load_test_groups
+    root = os.path.join(workdir, f"discovery_{size}")
+    directory = os.path.join(root, "tests")
+    os.makedirs(directory)
+    with open(os.path.join(directory, "__init__.py"), "w"):
+        pass
+    for start in range(0, size, TESTS_PER_RUNNER):
+        with open(os.path.join(directory, f"group{start // TESTS_PER_RUNNER}_runner.py"), "w") as f:
+            f.write(_RUNNER_TEMPLATE.format(index=start // TESTS_PER_RUNNER,
+                                            count=min(TESTS_PER_RUNNER, size - start)))
+    saved_modules = {name: module for name, module in sys.modules.items()
+                     if name == "tests" or name.startswith("tests.")}
+    sys.path.insert(0, root)
+    importlib.invalidate_caches()
+
+    def run():
+        _forget_tests_package()  # Każde powtórzenie importuje moduły od nowa
+        groups = load_test_groups(directory)
+        discovered = sum(len(group.tests) for group in groups)
+        if discovered != size:
+            raise RuntimeError(f"Discovered {discovered} tests, expected {size}.")
+    try:
+        return _per_operation(run, size)
+    finally:
+        sys.path.remove(root)
+        _forget_tests_package()
+        sys.modules.update(saved_modules)
+
+
+def bench_configuration(size, workdir):
+    """
+    load_peripheral_configuration dla konfiguracji z size wpisami GPIO (czas na wpis);
+    rozmiary powyżej MAX_CONFIG_DEVICES są pomijane (None).
+    Wymaga modułów sprzętowych (RPi.GPIO, spidev) - bez nich przypadek jest pomijany.
+    """
+    if size > MAX_CONFIG_DEVICES:
+        return None
+    try:
+        from core.peripheral_config_loader import load_peripheral_configuration
+    except ImportError as e:
+        raise RuntimeError(f"skipped ({e})")
+    path = os.path.join(workdir, f"peripherals_{size}.yaml")
+    with open(path, "w") as f:
+        f.write("peripherals:\n  gpio:\n")
+        for pin in range(size):
+            f.write(f"    - pin: {pin}\n      mode: {'out' if pin % 2 else 'in'}\n")
+    return _per_operation(lambda: load_peripheral_configuration(path), size)
+
+
+BENCHMARKS = [
+    ("report_test_result", bench_report_test_result),
+    ("assert_equal_aggregated", bench_assertion(True)),
+    ("assert_equal_per_assertion", bench_assertion(False)),
+    ("logger_console", bench_logger(False)),
+    ("logger_file", bench_logger(True)),
+    ("get_device", bench_get_device),
+    ("suite_run", bench_suite_run),
+    ("load_test_groups", bench_discovery),
+    ("load_peripheral_configuration", bench_configuration),
+]
+
+
+def _format_time(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.3f} ms"
+    if seconds >= 1e-6:
+        return f"{seconds * 1e6:9.3f} us"
+    return f"{seconds * 1e9:9.1f} ns"
+
+
+def run_benchmarks(sizes, selected=None):
+    """
+    Wykonuje benchmarki i drukuje czasy na operację (benchmark zwracający None pomija dany rozmiar).
+    :return: Słownik {benchmark: {rozmiar (str): czas na operację [s]}}.
+    """
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="hil_benchmark_")
+    try:
+        for name, bench in BENCHMARKS:
+            if selected and name not in selected:
+                continue
+            print(f"\n=== {name} ===")
+            for size in sizes:
+                try:
+                    seconds = bench(size, workdir)
+                except RuntimeError as e:
+                    print(f"  n={size:>7}  {e}")
+                    break
+                if seconds is None:
+                    print(f"  n={size:>7}  not measured for this size")
+                    continue
+                results.setdefault(name, {})[str(size)] = seconds
+                print(f"  n={size:>7}  {_format_time(seconds)}/op")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Porównuje wyniki ze wzorcem; wynik wolniejszy o więcej niż threshold jest regresją.
+    :return: Lista regresji (benchmark, rozmiar, wynik, wzorzec).
+    """
+    regressions = []
+    print(f"\n=== comparison with baseline (threshold +{threshold:.0%}) ===")
+    for name, sizes in results.items():
+        for size, seconds in sizes.items():
+            reference = baseline.get(name, {}).get(size)
+            if reference is None:
+                continue
+            change = seconds / reference - 1
+            status = "REGRESSION" if change > threshold else "ok"
+            print(f"  {name:<30} n={size:>7} {_format_time(seconds)}/op  baseline {_format_time(reference)}/op  "
+                  f"{change:+7.1%}  {status}")
+            if change > threshold:
+                regressions.append((name, size, seconds, reference))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the framework's own overhead.")
+    parser.add_argument("--sizes", metavar="N", type=int, nargs="+", help=f"Suite sizes (default: {SIZES}).")
+    parser.add_argument("--quick", action="store_true", help=f"Use sizes {QUICK_SIZES}.")
+    parser.add_argument("--only", metavar="NAME", action="append", help="Run only the named benchmark.")
+    parser.add_argument("--baseline", metavar="FILE", default=DEFAULT_BASELINE,
+                        help="Baseline JSON file (default: benchmarks/framework_baseline.json).")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown against the baseline as a fraction (default: {DEFAULT_THRESHOLD}).")
+    arguments = parser.parse_args(argv)
+
+    results = run_benchmarks(arguments.sizes or (QUICK_SIZES if arguments.quick else SIZES), arguments.only)
+    if arguments.save_baseline:
+        with open(arguments.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                      f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {arguments.baseline}.")
+        return
+    if not os.path.exists(arguments.baseline):
+        print(f"\nNo baseline at {arguments.baseline}; run with --save-baseline on the reference machine.")
+        return
+    with open(arguments.baseline, "r") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline["results"], arguments.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {arguments.threshold:.0%}.")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
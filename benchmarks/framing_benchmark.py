@@ -0,0 +1,94 @@
+# framing_benchmark.py
+# Porównanie przyrostowych dekoderów z core.framing z naiwnym sklejaniem bytes.
+# Uruchomienie: python -m benchmarks.framing_benchmark
+import random
+import time
+from core.framing import SLIPCodec, COBSCodec, LengthPrefixedCodec, CRC16_CCITT_FALSE
+
+BAUD_RATES = [115200, 921600, 3000000]
+READ_PERIOD = 0.001  # Typowy odstęp między odczytami z portu szeregowego [s]
+STREAM_SIZE = 2 * 1024 * 1024
+
+
+def make_stream(codec, stream_size, frame_size, seed=0):
+    """
+    Buduje strumień zakodowanych ramek o łącznym rozmiarze około stream_size bajtów.
+    """
+    rng = random.Random(seed)
+    payload = bytes(rng.getrandbits(8) for _ in range(frame_size))
+    frame = codec.encode(payload)
+    return frame * max(1, stream_size // len(frame))
+
+
+def split_stream(stream, baudrate):
+    """
+    Dzieli strumień na fragmenty takie, jakie zwracałby port odczytywany co READ_PERIOD.
+    """
+    chunk = max(1, int(baudrate / 10 * READ_PERIOD))
+    view = memoryview(stream)
+    return [view[i:i + chunk] for i in range(0, len(stream), chunk)]
+
+
+def naive_slip(chunks):
+    """
+    Typowa implementacja z testów: sklejanie bytes i dzielenie po znaczniku END.
+    """
+    frames = []
+    buffer = b""
+    for chunk in chunks:
+        buffer = buffer + bytes(chunk)
+        while b"\xc0" in buffer:
+            frame, _, buffer = buffer.partition(b"\xc0")
+            if frame:
+                frames.append(frame.replace(b"\xdb\xdc", b"\xc0").replace(b"\xdb\xdd", b"\xdb"))
+    return frames
+
+
+def naive_length_prefixed(chunks):
+    """
+    Typowa implementacja z testów: sklejanie bytes i wycinanie ramek z początku bufora.
+    """
+    frames = []
+    buffer = b""
+    for chunk in chunks:
+        buffer = buffer + bytes(chunk)
+        while len(buffer) >= 2:
+            length = int.from_bytes(buffer[:2], "little")
+            if len(buffer) < 2 + length + 2:
+                break
+            body = buffer[:2 + length]
+            if CRC16_CCITT_FALSE.to_bytes(body) == buffer[2 + length:4 + length]:
+                frames.append(body[2:])
+            buffer = buffer[4 + length:]
+    return frames
+
+
+def run_case(name, decode, chunks, stream_size, baudrate):
+    start = time.perf_counter()
+    frames = decode(chunks)
+    elapsed = time.perf_counter() - start
+    throughput = stream_size / elapsed
+    realtime = throughput / (baudrate / 10)
+    print(f"  {name:<34} {elapsed * 1000:9.1f} ms  {throughput / 1e6:8.2f} MB/s  x{realtime:8.1f} realtime  ({len(frames)} frames)")
+    return elapsed
+
+
+def main():
+    cases = [
+        ("SLIP", SLIPCodec, {}, naive_slip),
+        ("COBS", COBSCodec, {}, None),
+        ("Length+CRC16", LengthPrefixedCodec, {"crc": CRC16_CCITT_FALSE}, naive_length_prefixed),
+    ]
+    for frame_size in (64, 4096, 32768):
+        for baudrate in BAUD_RATES:
+            print(f"\n=== frame size {frame_size} B, {baudrate} baud ===")
+            for name, codec_class, kwargs, naive in cases:
+                stream = make_stream(codec_class(**kwargs), STREAM_SIZE, frame_size)
+                chunks = split_stream(stream, baudrate)
+                run_case(f"{name} incremental", lambda c: list(codec_class(**kwargs).decode(c)), chunks, len(stream), baudrate)
+                if naive:
+                    run_case(f"{name} naive concatenation", naive, chunks, len(stream), baudrate)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,19 @@
+import ctypes
+import fcntl
+import os
+import struct
+import subprocess
+import threading
+import time
 import RPi.GPIO as GPIO
-from smbus2 import SMBus
+from smbus2 import SMBus, i2c_msg
 import spidev
 import serial
+from core.adc_acquisition import ADC_CHIPS, ADCBlock, ADCDecoder, BlockBuffer, command_bytes
+from core.can_bus import CANBus
+from core.gpio_capture import EdgeCapture
+from core.gpio_port import GPIOPort, GpioMemBackend, GpioChardevBackend, GPIOMEM_PATH, GPIOCHIP_PATH
+from core.uart_capture import UARTCapture, CaptureReader, DEFAULT_CHUNK_SIZE, DEFAULT_INDEX_INTERVAL
 
 
 class RPiGPIO:
@@ -11,6 +23,7 @@ class RPiGPIO:
         :param pin_config: Słownik w formacie {pin: {'mode': GPIO.OUT, 'initial': GPIO.LOW}}
         """
         self.pin_config = pin_config
+        self.captures = []
 
     def get_required_resources(self):
         """
@@ -18,6 +31,44 @@ class RPiGPIO:
         """
         return {"pins": list(self.pin_config.keys())}
 
+    def capture_edges(self, pin=None, edge="both", capacity=4096, bouncetime=None):
+        """
+        Uruchamia rejestrację zboczy na pinie wejściowym (znaczniki czasu w buforze pierścieniowym).
+        :param pin: Numer pinu; domyślnie jedyny pin tej instancji.
+        :param edge: Rejestrowane zbocza: 'rising', 'falling' lub 'both'.
+        :param capacity: Pojemność bufora (liczba zboczy).
+        :param bouncetime: (Opcjonalny) czas eliminacji drgań styków w ms.
+        :return: Uruchomiony obiekt EdgeCapture.
+        """
+        capture = EdgeCapture(self._pin(pin), edge=edge, capacity=capacity, bouncetime=bouncetime).start()
+        self.captures.append(capture)
+        return capture
+
+    def read(self, pin=None):
+        """
+        Odczytuje stan pinu.
+        :param pin: Numer pinu; domyślnie jedyny pin tej instancji.
+        :return: 0 lub 1.
+        """
+        return GPIO.input(self._pin(pin))
+
+    def write(self, value, pin=None):
+        """
+        Ustawia stan pinu wyjściowego.
+        :param value: 0/1 (GPIO.LOW/GPIO.HIGH).
+        :param pin: Numer pinu; domyślnie jedyny pin tej instancji.
+        """
+        GPIO.output(self._pin(pin), value)
+
+    def _pin(self, pin):
+        if pin is None:
+            if len(self.pin_config) != 1:
+                raise ValueError("Pin must be given for RPiGPIO with more than one pin.")
+            return next(iter(self.pin_config))
+        if pin not in self.pin_config:
+            raise ValueError(f"Pin {pin} is not configured in this RPiGPIO.")
+        return pin
+
     def initialize(self):
         """
         Inicjalizuje piny GPIO.
@@ -33,20 +84,117 @@ class RPiGPIO:
         """
         Zwalnia zarezerwowane piny GPIO.
         """
+        for capture in self.captures:
+            capture.stop()
+        self.captures.clear()
         for pin in self.pin_config.keys():
             GPIO.cleanup(pin)
 
 
+class RPiGPIOPort(RPiGPIO):
+    def __init__(self, pins, mode=GPIO.OUT, initial=0, backend="gpiomem", mem_path=GPIOMEM_PATH,
+                 chip_path=GPIOCHIP_PATH):
+        """
+        Port GPIO: grupa pinów ustawianych i odczytywanych jedną operacją (np. magistrala równoległa, klawiatura).
+        :param pins: Lista pinów GPIO (BCM 0-31); bit i wartości portu odpowiada pins[i].
+        :param mode: GPIO.OUT lub GPIO.IN dla wszystkich pinów albo słownik {pin: tryb}.
+        :param initial: Początkowa wartość portu (dla pinów wyjściowych).
+        :param backend: 'gpiomem' (mmap rejestrów) lub 'chardev' (interfejs znakowy /dev/gpiochipN).
+        :param mem_path: Ścieżka do /dev/gpiomem (lub pliku testowego).
+        :param chip_path: Ścieżka do urządzenia gpiochip.
+        """
+        if backend not in ("gpiomem", "chardev"):
+            raise ValueError(f"Invalid GPIO port backend: {backend}. Use 'gpiomem' or 'chardev'.")
+        modes = mode if isinstance(mode, dict) else {pin: mode for pin in pins}
+        super().__init__({pin: {'mode': modes[pin], 'initial': (initial >> index) & 1}
+                          for index, pin in enumerate(pins)})
+        self.pins = list(pins)
+        self.initial = initial
+        self.backend = backend
+        self.mem_path = mem_path
+        self.chip_path = chip_path
+        self.port = None
+
+    def initialize(self):
+        """
+        Konfiguruje piny i otwiera backend portu.
+        """
+        outputs = [pin for pin in self.pins if self.pin_config[pin]['mode'] == GPIO.OUT]
+        inputs = [pin for pin in self.pins if self.pin_config[pin]['mode'] != GPIO.OUT]
+        if self.backend == "gpiomem":
+            # Kierunek pinów ustawia RPi.GPIO; backend korzysta tylko z rejestrów SET/CLR/LEV
+            super().initialize()
+            self.port = GPIOPort(self.pins, GpioMemBackend(self.mem_path))
+        else:
+            backend = GpioChardevBackend(self.chip_path)
+            self.port = GPIOPort(self.pins, backend)
+            backend.configure(outputs, inputs, initial=self.port.to_physical(self.initial))
+
+    def write(self, value):
+        self.port.write(value)
+
+    def set(self, mask):
+        self.port.set(mask)
+
+    def clear(self, mask):
+        self.port.clear(mask)
+
+    def read(self):
+        return self.port.read()
+
+    def play(self, pattern, interval, repeat=1):
+        return self.port.play(pattern, interval, repeat=repeat)
+
+    def release(self):
+        """
+        Zamyka backend portu i zwalnia piny.
+        """
+        if self.port is not None:
+            self.port.close()
+            self.port = None
+        if self.backend == "gpiomem":
+            super().release()
+        else:
+            for capture in self.captures:
+                capture.stop()
+            self.captures.clear()
+
+
 class RPiPWM:
-    def __init__(self, pin, frequency=1000):
+    # Kanały sprzętowego PWM0 dostępne na złączu (BCM2835-BCM2711, overlay pwm-2chan)
+    HARDWARE_CHANNELS = {12: 0, 18: 0, 13: 1, 19: 1}
+    EXPORT_TIMEOUT = 1.0
+
+    def __init__(self, pin, frequency=1000, backend="software", chip=0, channel=None, sysfs_root="/sys/class/pwm"):
         """
         Klasa do obsługi PWM.
         :param pin: Numer pinu GPIO.
         :param frequency: Częstotliwość PWM w Hz.
+        :param backend: 'software' (RPi.GPIO) lub 'hardware' (sprzętowy PWM przez /sys/class/pwm).
+        :param chip: Numer pwmchip (backend 'hardware').
+        :param channel: Kanał PWM; domyślnie wyznaczany z numeru pinu.
+        :param sysfs_root: Katalog klasy pwm w sysfs (np. fałszywe drzewo katalogów w testach).
         """
+        if backend not in ("software", "hardware"):
+            raise ValueError(f"Invalid PWM backend: {backend}. Use 'software' or 'hardware'.")
+        if backend == "hardware" and channel is None:
+            if pin not in self.HARDWARE_CHANNELS:
+                raise ValueError(f"Pin {pin} has no hardware PWM channel. Use one of {sorted(self.HARDWARE_CHANNELS)}.")
+            channel = self.HARDWARE_CHANNELS[pin]
         self.pin = pin
         self.frequency = frequency
+        self.backend = backend
+        self.chip = chip
+        self.channel = channel
+        self.sysfs_root = sysfs_root
+        self.duty_cycle = 0
         self.pwm = None
+        self._period_ns = 0
+        self._duty_ns = 0
+        self._period_fd = None
+        self._duty_fd = None
+        # Poza sysfs (fałszywe drzewo ze zwykłych plików) zapis musi obcinać poprzednią, dłuższą wartość
+        self._truncate = not os.path.realpath(sysfs_root).startswith("/sys/")
 
     def get_required_resources(self):
         """
@@ -54,27 +202,105 @@ class RPiPWM:
         """
         return {"pins": [self.pin]}
 
+    @property
+    def channel_path(self):
+        return os.path.join(self.sysfs_root, f"pwmchip{self.chip}", f"pwm{self.channel}")
+
+    def _write_attribute(self, name, value):
+        with open(os.path.join(self.channel_path, name), "w") as f:
+            f.write(str(value))
+
     def initialize(self):
         """
         Inicjalizuje PWM na pinie.
         """
+        if self.backend == "hardware":
+            self._initialize_hardware()
+            return
         GPIO.setmode(GPIO.BCM)
         GPIO.setup(self.pin, GPIO.OUT)
         self.pwm = GPIO.PWM(self.pin, self.frequency)
         self.pwm.start(0)
 
+    def _write_fd(self, fd, value):
+        data = str(value).encode()
+        os.pwrite(fd, data, 0)
+        if self._truncate:
+            os.ftruncate(fd, len(data))
+
+    def _initialize_hardware(self):
+        """
+        Eksportuje kanał pwmchip, ustawia okres i włącza wyjście z wypełnieniem 0.
+        Deskryptory plików period/duty_cycle pozostają otwarte, aby zmiana wypełnienia była pojedynczym zapisem.
+        """
+        if not os.path.isdir(self.channel_path):
+            with open(os.path.join(self.sysfs_root, f"pwmchip{self.chip}", "export"), "w") as f:
+                f.write(str(self.channel))
+            # Katalog kanału (i jego uprawnienia nadawane przez udev) pojawia się z opóźnieniem
+            deadline = time.monotonic() + self.EXPORT_TIMEOUT
+            while not os.access(os.path.join(self.channel_path, "period"), os.W_OK):
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"PWM channel {self.channel_path} did not appear after export.")
+                time.sleep(0.01)
+        self._period_fd = os.open(os.path.join(self.channel_path, "period"), os.O_WRONLY)
+        self._duty_fd = os.open(os.path.join(self.channel_path, "duty_cycle"), os.O_WRONLY)
+        self._duty_ns = 0
+        self._write_fd(self._duty_fd, 0)
+        self._set_period(round(1e9 / self.frequency))
+        self._write_attribute("enable", 1)
+
+    def _set_period(self, period_ns):
+        # Jądro odrzuca duty_cycle > period, więc kolejność zapisów zależy od kierunku zmiany
+        duty_ns = round(period_ns * self.duty_cycle / 100)
+        if duty_ns > self._period_ns:
+            self._write_fd(self._period_fd, period_ns)
+            self._write_fd(self._duty_fd, duty_ns)
+        else:
+            self._write_fd(self._duty_fd, duty_ns)
+            self._write_fd(self._period_fd, period_ns)
+        self._period_ns = period_ns
+        self._duty_ns = duty_ns
+
     def set_duty_cycle(self, duty_cycle):
         """
         Ustawia wypełnienie PWM.
         :param duty_cycle: Wypełnienie w procentach (0-100).
         """
-        if self.pwm:
+        if not 0 <= duty_cycle <= 100:
+            raise ValueError(f"Invalid PWM duty cycle: {duty_cycle}. Expected 0-100.")
+        self.duty_cycle = duty_cycle
+        if self._duty_fd is not None:
+            self._duty_ns = round(self._period_ns * duty_cycle / 100)
+            self._write_fd(self._duty_fd, self._duty_ns)
+        elif self.pwm:
             self.pwm.ChangeDutyCycle(duty_cycle)
 
+    def set_frequency(self, frequency):
+        """
+        Zmienia częstotliwość PWM z zachowaniem wypełnienia.
+        :param frequency: Częstotliwość w Hz.
+        """
+        if frequency <= 0:
+            raise ValueError(f"Invalid PWM frequency: {frequency}.")
+        self.frequency = frequency
+        if self._period_fd is not None:
+            self._set_period(round(1e9 / frequency))
+        elif self.pwm:
+            self.pwm.ChangeFrequency(frequency)
+
     def release(self):
         """
         Zatrzymuje PWM i zwalnia pin.
         """
+        if self.backend == "hardware":
+            if self._period_fd is not None:
+                self._write_attribute("enable", 0)
+                os.close(self._period_fd)
+                os.close(self._duty_fd)
+                self._period_fd = self._duty_fd = None
+                with open(os.path.join(self.sysfs_root, f"pwmchip{self.chip}", "unexport"), "w") as f:
+                    f.write(str(self.channel))
+            return
         if self.pwm:
             self.pwm.stop()
         GPIO.cleanup(self.pin)
@@ -92,6 +318,7 @@ class RPiUART:
         self.stopbits = stopbits
         self.reserved_pins = [14, 15]  # Standardowe piny TXD i RXD
         self.serial = None
+        self.capture = None
 
     def get_required_resources(self):
         """
@@ -113,10 +340,88 @@ class RPiUART:
 
     def release(self):
         """
-        Zamyka port UART.
+        Zamyka port UART (trwające przechwytywanie jest zatrzymywane bez otwierania zapisu;
+        ewentualny błąd wątku przechwytywania nie blokuje zamknięcia portu).
+        """
+        try:
+            if self.capture:
+                capture, self.capture = self.capture, None
+                capture.stop()
+        finally:
+            if self.serial:
+                self.serial.close()
+
+    def write(self, data):
+        """
+        Wysyła dane przez UART.
+        :param data: bytes, bytearray lub memoryview.
+        :return: Liczba wysłanych bajtów.
+        """
+        return self.serial.write(data)
+
+    def read(self, size=1):
+        """
+        Odczytuje dane z UART (z uwzględnieniem skonfigurowanego timeoutu).
+        :param size: Maksymalna liczba bajtów do odczytania.
+        :return: Odczytane bajty.
+        """
+        return self.serial.read(size)
+
+    def write_frame(self, codec, payload):
+        """
+        Koduje i wysyła pojedynczą ramkę.
+        :param codec: Obiekt FrameCodec (np. SLIPCodec, COBSCodec, LengthPrefixedCodec).
+        :param payload: Dane ramki.
+        """
+        return self.serial.write(codec.encode(payload))
+
+    def read_frames(self, codec, count=None, timeout=None):
+        """
+        Generator kompletnych ramek odczytywanych przyrostowo z UART.
+        :param codec: Obiekt FrameCodec dekodujący strumień.
+        :param count: (Opcjonalna) liczba ramek, po której generator kończy działanie.
+        :param timeout: (Opcjonalny) całkowity czas oczekiwania na ramki w sekundach.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        received = 0
+        while deadline is None or time.monotonic() < deadline:
+            waiting = self.serial.in_waiting
+            data = self.serial.read(waiting if waiting else 1)
+            if not data:
+                continue
+            for frame in codec.feed(data):
+                yield frame
+                received += 1
+                if count is not None and received >= count:
+                    return
+
+    def start_capture(self, path, chunk_size=DEFAULT_CHUNK_SIZE, index_interval=DEFAULT_INDEX_INTERVAL):
+        """
+        Uruchamia przechwytywanie odbieranych bajtów do pliku zmapowanego w pamięci.
+        W trakcie przechwytywania port jest odczytywany przez wątek w tle.
+        :param path: Ścieżka do pliku danych (indeks czasowy trafia do <path>.idx).
+        :param chunk_size: Rozmiar porcji, o którą powiększany jest plik.
+        :param index_interval: Minimalny odstęp między wpisami indeksu czasowego w sekundach.
+        :return: Obiekt UARTCapture.
+        """
+        if self.capture:
+            raise RuntimeError(f"Capture on {self.port} is already running.")
+        self.capture = UARTCapture(self.serial, path, chunk_size=chunk_size, index_interval=index_interval)
+        self.capture.start()
+        return self.capture
+
+    def stop_capture(self):
+        """
+        Zatrzymuje przechwytywanie.
+        :return: Obiekt CaptureReader do przeszukiwania zapisu.
         """
-        if self.serial:
-            self.serial.close()
+        if not self.capture:
+            raise RuntimeError(f"No capture running on {self.port}.")
+        capture, self.capture = self.capture, None
+        path = capture.stop()
+        if capture.error:
+            raise capture.error
+        return CaptureReader(path)
 
     def get_initialized_params(self):
         """
@@ -132,12 +437,25 @@ class RPiUART:
 
 
 class RPiI2C:
-    def __init__(self, bus=1, frequency=100000):
+    # Wyniki skanowania współdzielone przez wszystkie instancje: {(numer magistrali, metoda sondowania): [adresy]}
+    _scan_cache = {}
+
+    # Adresy 0x00-0x07 i 0x78-0x7F są zarezerwowane przez specyfikację I2C
+    SCAN_FIRST_ADDRESS = 0x08
+    SCAN_LAST_ADDRESS = 0x77
+
+    # Zakresy, w których (jak w i2cdetect) sondowanie zapisem może zmienić stan urządzenia
+    READ_PROBE_RANGES = [(0x30, 0x37), (0x50, 0x5F)]
+
+    def __init__(self, bus=1, frequency=100000, max_transfer=8192):
         """
         Klasa do obsługi magistrali I2C.
         :param bus: Numer magistrali I2C, domyślnie 1.
+        :param frequency: Częstotliwość magistrali w Hz.
+        :param max_transfer: Maksymalna długość pojedynczej wiadomości i2c_rdwr (limit i2c-dev to 8192 bajty).
         """
         self.bus_number = bus
+        self.max_transfer = max_transfer
         
         # Określanie pinów w zależności od magistrali
         if self.bus_number == 1:
@@ -201,19 +519,143 @@ class RPiI2C:
         """
         self.bus.write_i2c_block_data(address, register, data)
 
-    def scan(self):
+    def write_read(self, address, write_data, read_length):
         """
-        Skanuje magistralę I2C w celu wykrycia dostępnych urządzeń.
-        :return: Lista adresów urządzeń.
+        Wykonuje złożoną transakcję (zapis, repeated start, odczyt) przez i2c_rdwr.
+        :param address: Adres urządzenia slave.
+        :param write_data: Dane do zapisania przed odczytem (np. adres rejestru); puste - sam odczyt.
+        :param read_length: Liczba bajtów do odczytania (0 - sam zapis).
+        :return: Odczytane bajty.
+        """
+        messages = []
+        if write_data:
+            messages.append(i2c_msg.write(address, write_data))
+        read = None
+        if read_length:
+            read = i2c_msg.read(address, read_length)
+            messages.append(read)
+        self.bus.i2c_rdwr(*messages)
+        return bytes(read) if read is not None else b""
+
+    def read_bulk(self, address, register, length, register_size=1):
+        """
+        Odczytuje dowolną liczbę bajtów od podanego rejestru (z autoinkrementacją adresu w urządzeniu).
+        Odczyt dzielony jest automatycznie na fragmenty nie dłuższe niż max_transfer.
+        :param address: Adres urządzenia slave.
+        :param register: Adres początkowego rejestru.
+        :param length: Liczba bajtów do odczytania.
+        :param register_size: Rozmiar adresu rejestru w bajtach (1 lub 2, big-endian).
+        :return: Odczytane dane (bytearray).
+        """
+        data = bytearray(length)
+        position = 0
+        while position < length:
+            count = min(self.max_transfer, length - position)
+            data[position:position + count] = self.write_read(
+                address, (register + position).to_bytes(register_size, "big"), count)
+            position += count
+        return data
+
+    def write_bulk(self, address, register, data, register_size=1):
+        """
+        Zapisuje dowolną liczbę bajtów od podanego rejestru (z autoinkrementacją adresu w urządzeniu).
+        Zapis dzielony jest automatycznie na fragmenty mieszczące się w max_transfer.
+        :param address: Adres urządzenia slave.
+        :param register: Adres początkowego rejestru.
+        :param data: Dane do zapisania (bytes, bytearray, memoryview lub lista).
+        :param register_size: Rozmiar adresu rejestru w bajtach (1 lub 2, big-endian).
+        """
+        data = memoryview(bytes(data))
+        chunk = self.max_transfer - register_size
+        for position in range(0, len(data), chunk):
+            header = (register + position).to_bytes(register_size, "big")
+            self.bus.i2c_rdwr(i2c_msg.write(address, header + data[position:position + chunk]))
+
+    def eeprom_read(self, address, memory_address, length, address_size=2):
+        """
+        Odczytuje blok danych z pamięci EEPROM (np. 24Cxx) jedną lub kilkoma transakcjami i2c_rdwr.
+        :param address: Adres urządzenia slave.
+        :param memory_address: Adres początkowy w pamięci.
+        :param length: Liczba bajtów do odczytania.
+        :param address_size: Rozmiar adresu pamięci w bajtach (1 dla 24C01-24C16, 2 dla większych).
+        :return: Odczytane dane (bytearray).
+        """
+        return self.read_bulk(address, memory_address, length, register_size=address_size)
+
+    def eeprom_write(self, address, memory_address, data, page_size=32, address_size=2, write_timeout=0.05):
+        """
+        Zapisuje dane do pamięci EEPROM stronami, nie przekraczając granic stron.
+        Po każdej stronie czeka na zakończenie cyklu zapisu (ACK polling).
+        :param address: Adres urządzenia slave.
+        :param memory_address: Adres początkowy w pamięci.
+        :param data: Dane do zapisania.
+        :param page_size: Rozmiar strony pamięci w bajtach.
+        :param address_size: Rozmiar adresu pamięci w bajtach.
+        :param write_timeout: Maksymalny czas cyklu zapisu strony w sekundach.
+        :raises TimeoutError: Jeśli pamięć nie potwierdzi zakończenia zapisu.
+        """
+        data = memoryview(bytes(data))
+        position = 0
+        while position < len(data):
+            current = memory_address + position
+            count = min(page_size - current % page_size, len(data) - position, self.max_transfer - address_size)
+            header = current.to_bytes(address_size, "big")
+            self.bus.i2c_rdwr(i2c_msg.write(address, header + data[position:position + count]))
+            self._wait_for_ack(address, header, write_timeout)
+            position += count
+
+    def _wait_for_ack(self, address, header, timeout):
         """
-        devices = []
-        for address in range(128):
+        Odpytuje pamięć EEPROM (samym adresem) do momentu, aż potwierdzi swój adres.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
             try:
+                self.bus.i2c_rdwr(i2c_msg.write(address, header))
+                return
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"EEPROM at {address:#04x} did not finish the write cycle within {timeout} s.")
+
+    def scan(self, probe="auto", use_cache=True):
+        """
+        Skanuje magistralę I2C w celu wykrycia dostępnych urządzeń (z pominięciem adresów zarezerwowanych).
+        :param probe: Metoda sondowania: 'quick' (write_quick), 'read' (odczyt bajtu, bezpieczny dla
+                      urządzeń wrażliwych na zapis) lub 'auto' (odczyt w zakresach EEPROM, jak i2cdetect).
+        :param use_cache: Czy zwrócić zapamiętany wynik poprzedniego skanowania tej magistrali tą samą metodą.
+        :return: Lista adresów urządzeń.
+        """
+        key = (self.bus_number, probe)
+        if use_cache and key in RPiI2C._scan_cache:
+            return list(RPiI2C._scan_cache[key])
+        devices = [address for address in range(self.SCAN_FIRST_ADDRESS, self.SCAN_LAST_ADDRESS + 1)
+                   if self._probe(address, probe)]
+        RPiI2C._scan_cache[key] = devices
+        return list(devices)
+
+    def clear_scan_cache(self):
+        """
+        Usuwa zapamiętane wyniki skanowania tej magistrali (dla wszystkich metod sondowania).
+        """
+        for key in [key for key in RPiI2C._scan_cache if key[0] == self.bus_number]:
+            del RPiI2C._scan_cache[key]
+
+    def _probe(self, address, probe):
+        """
+        Sprawdza, czy urządzenie pod podanym adresem odpowiada.
+        """
+        if probe == "auto":
+            probe = "read" if any(low <= address <= high for low, high in self.READ_PROBE_RANGES) else "quick"
+        try:
+            if probe == "read":
+                self.bus.read_byte(address)
+            elif probe == "quick":
                 self.bus.write_quick(address)
-                devices.append(address)
-            except:
-                pass  # Ignoruj urządzenia, które nie odpowiadają
-        return devices
+            else:
+                raise ValueError(f"Invalid I2C probe method: {probe}. Use 'auto', 'quick' or 'read'.")
+        except OSError:
+            return False  # Brak potwierdzenia (NACK) - pod tym adresem nie ma urządzenia
+        return True
 
     def write_byte(self, address, value):
         """
@@ -250,8 +692,35 @@ class RPiI2C:
         self.bus.write_word_data(address, register, value)
 
 
+# Domyślny rozmiar bufora sterownika spidev (parametr modułu bufsiz)
+SPIDEV_DEFAULT_BUFSIZ = 4096
+SPIDEV_BUFSIZ_PATH = "/sys/module/spidev/parameters/bufsiz"
+
+# struct spi_ioc_transfer z linux/spi/spidev.h:
+# tx_buf, rx_buf, len, speed_hz, delay_usecs, bits_per_word, cs_change, tx_nbits, rx_nbits, word_delay_usecs, pad
+_SPI_IOC_TRANSFER = struct.Struct("=QQIIHBBBBBB")
+_SPI_IOC_MAX_TRANSFERS = (1 << 14) // _SPI_IOC_TRANSFER.size - 1
+# Maksymalna liczba kolejek write_then_read przechowywanych w RPiSPI (po jednej na parę długości)
+_COMMAND_BATCH_CACHE = 8
+
+
+def _spi_ioc_message(count):
+    """
+    Zwraca numer ioctl SPI_IOC_MESSAGE(count) (_IOW('k', 0, char[count * 32])).
+    """
+    return (1 << 30) | ((count * _SPI_IOC_TRANSFER.size) << 16) | (ord("k") << 8)
+
+
+def _buffer_address(buffer):
+    """
+    Zwraca adres bufora bytearray w pamięci (dla struktur przekazywanych do ioctl).
+    """
+    return ctypes.addressof(ctypes.c_char.from_buffer(buffer))
+
+
 class RPiSPI:
-    def __init__(self, bus=0, device=0, max_speed_hz=50000, mode=0, bits_per_word=8, cs_high=False, lsbfirst=False, timeout=1.0):
+    def __init__(self, bus=0, device=0, max_speed_hz=50000, mode=0, bits_per_word=8, cs_high=False, lsbfirst=False, timeout=1.0,
+                 cs_pin=None, chunk_size=None):
         """
         Klasa do obsługi magistrali SPI.
         :param bus: Numer magistrali SPI (0 lub 1).
@@ -262,6 +731,9 @@ class RPiSPI:
         :param cs_high: Czy linia Chip Select jest aktywna na wysokim poziomie (True/False).
         :param lsbfirst: Czy bity są przesyłane od najmniej znaczącego bitu (True/False).
         :param timeout: Czas oczekiwania na odpowiedź w sekundach.
+        :param cs_pin: (Opcjonalny) pin GPIO sterowany programowo jako Chip Select. Pozwala utrzymać CS
+                       przez całą transakcję dłuższą niż bufor sterownika (sprzętowy CS jest wtedy wyłączony).
+        :param chunk_size: Maksymalny rozmiar pojedynczego transferu; domyślnie bufsiz modułu spidev.
         """
         self.spi = spidev.SpiDev()
         self.bus = bus
@@ -272,6 +744,9 @@ class RPiSPI:
         self.cs_high = cs_high
         self.lsbfirst = lsbfirst
         self.timeout = timeout
+        self.cs_pin = cs_pin
+        self.chunk_size = chunk_size
+        self._command_batches = {}  # Kolejki write_then_read: {(długość polecenia, długość odpowiedzi): SPIBatch}
 
         # Określanie pinów w zależności od magistrali SPI
         if self.bus == 1:
@@ -280,6 +755,8 @@ class RPiSPI:
             self.reserved_pins = [7, 8, 9, 10, 11]  # SPI0
         else:
             raise ValueError(f"Invalid bus number: {self.bus}. Only 0 and 1 are supported.")
+        if self.cs_pin is not None and self.cs_pin not in self.reserved_pins:
+            self.reserved_pins = self.reserved_pins + [self.cs_pin]
 
 
     def get_required_resources(self):
@@ -297,7 +774,8 @@ class RPiSPI:
         """
         return {
             "device": (f"spidev{self.bus}.{self.device}"),
-            "max_speed_hz": self.max_speed_hz
+            "max_speed_hz": self.max_speed_hz,
+            "chunk_size": self.chunk_size
         }
 
     def initialize(self):
@@ -312,68 +790,512 @@ class RPiSPI:
         # self.spi.cs_high = self.cs_high
         self.spi.lsbfirst = self.lsbfirst
         # self.spi.timeout = self.timeout
+        if self.chunk_size is None:
+            self.chunk_size = self._read_bufsiz()
+        if self.cs_pin is not None:
+            self.spi.no_cs = True
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setup(self.cs_pin, GPIO.OUT, initial=GPIO.LOW if self.cs_high else GPIO.HIGH)
 
-        
+    @staticmethod
+    def _read_bufsiz():
+        """
+        Odczytuje rozmiar bufora sterownika spidev (maksymalną długość jednej wiadomości).
+        """
+        try:
+            with open(SPIDEV_BUFSIZ_PATH) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return SPIDEV_DEFAULT_BUFSIZ
 
     def release(self):
         """
         Zamyka połączenie SPI.
         """
         self.spi.close()
+        if self.cs_pin is not None:
+            GPIO.cleanup(self.cs_pin)
 
+    def _select(self):
+        if self.cs_pin is not None:
+            GPIO.output(self.cs_pin, GPIO.HIGH if self.cs_high else GPIO.LOW)
 
-# Nowe klasy peryferiów
-# class RPi1Wire:
-#     def __init__(self, pin):
-#         self.pin = pin
+    def _deselect(self):
+        if self.cs_pin is not None:
+            GPIO.output(self.cs_pin, GPIO.LOW if self.cs_high else GPIO.HIGH)
 
-#     def get_required_resources(self):
-#         return {"pins": [self.pin]}
+    def transfer(self, data, out=None):
+        """
+        Transfer pełnodupleksowy. Dane dłuższe niż chunk_size są dzielone na fragmenty; przy cs_pin
+        linia CS pozostaje aktywna przez cały transfer, przy sprzętowym CS jest zwalniana między fragmentami.
+        :param data: Dane do wysłania (bytes, bytearray lub memoryview).
+        :param out: (Opcjonalny) bufor bytearray/memoryview na odebrane dane, o długości co najmniej len(data).
+        :return: Bufor z odebranymi danymi.
+        """
+        view = memoryview(data).cast("B")
+        length = len(view)
+        if out is None:
+            out = bytearray(length)
+        chunk = self.chunk_size
+        self._select()
+        try:
+            for position in range(0, length, chunk):
+                block = view[position:position + chunk]
+                out[position:position + len(block)] = bytes(self.spi.xfer2(block))
+        finally:
+            self._deselect()
+        return out
 
-#     def initialize(self):
-#         GPIO.setmode(GPIO.BCM)
-#         GPIO.setup(self.pin, GPIO.IN)
+    def write(self, data):
+        """
+        Zapis bez odbioru danych, z podziałem na fragmenty o rozmiarze chunk_size.
+        :param data: Dane do wysłania (bytes, bytearray lub memoryview).
+        """
+        view = memoryview(data).cast("B")
+        chunk = self.chunk_size
+        self._select()
+        try:
+            for position in range(0, len(view), chunk):
+                self.spi.writebytes2(view[position:position + chunk])
+        finally:
+            self._deselect()
 
-#     def release(self):
-#         GPIO.cleanup(self.pin)
+    def read(self, length, out=None):
+        """
+        Odczyt bez wysyłania danych, z podziałem na fragmenty o rozmiarze chunk_size.
+        :param length: Liczba bajtów do odczytania.
+        :param out: (Opcjonalny) bufor bytearray/memoryview na odebrane dane.
+        :return: Bufor z odebranymi danymi.
+        """
+        if out is None:
+            out = bytearray(length)
+        chunk = self.chunk_size
+        self._select()
+        try:
+            for position in range(0, length, chunk):
+                count = min(chunk, length - position)
+                out[position:position + count] = bytes(self.spi.readbytes(count))
+        finally:
+            self._deselect()
+        return out
 
+    def write_then_read(self, data, length, out=None):
+        """
+        Wysyła polecenie (np. kod rozkazu i adres), a następnie odczytuje odpowiedź w ramach jednej aktywacji CS.
+        Bez cs_pin całość musi zmieścić się w jednym transferze (chunk_size); kolejka SPIBatch dla danej pary
+        długości jest tworzona raz i przy kolejnych wywołaniach tylko uzupełniana (np. odpytywanie statusu).
+        :param data: Dane polecenia.
+        :param length: Liczba bajtów odpowiedzi.
+        :param out: (Opcjonalny) bufor na odpowiedź.
+        :return: Bufor z odpowiedzią.
+        """
+        if out is None:
+            out = bytearray(length)
+        if self.cs_pin is not None:
+            self._select()
+            try:
+                self.spi.writebytes2(data)
+                chunk = self.chunk_size
+                for position in range(0, length, chunk):
+                    count = min(chunk, length - position)
+                    out[position:position + count] = bytes(self.spi.readbytes(count))
+            finally:
+                self._deselect()
+            return out
+        key = (len(data), length)
+        batch = self._command_batches.get(key)
+        if batch is None:
+            if len(self._command_batches) >= _COMMAND_BATCH_CACHE:
+                self._command_batches.clear()
+            batch = self._command_batches[key] = SPIBatch(self)
+            batch.add(data, cs_change=False)
+            batch.add(rx_length=length)
+        else:
+            batch.set_tx(0, data)
+        batch.execute()
+        out[:length] = batch.result(1)
+        return out
 
-# class RPiADC:
-#     def __init__(self, channel):
-#         self.channel = channel
-#         self.spi = spidev.SpiDev()
+    def batch(self):
+        """
+        Tworzy kolejkę transakcji wykonywanych jednym wywołaniem ioctl (SPI_IOC_MESSAGE).
+        :return: Obiekt SPIBatch.
+        """
+        return SPIBatch(self)
 
-#     def get_required_resources(self):
-#         return {"pins": [7, 8, 9, 10, 11]}  # Standardowe piny SPI
 
-#     def initialize(self):
-#         self.spi.open(0, self.channel)
-#         self.spi.max_speed_hz = 1350000
+class SPIBatch:
+    def __init__(self, spi):
+        """
+        Kolejka transakcji SPI wykonywanych jednym wywołaniem ioctl z prealokowanymi buforami.
+        Po pierwszym execute() bufory i tablica struktur spi_ioc_transfer są używane ponownie;
+        dane do wysłania można podmieniać przez set_tx() bez ponownej alokacji.
+        :param spi: Zainicjalizowana instancja RPiSPI.
+        """
+        self.spi = spi
+        self._segments = []  # [(offset, tx_length, rx_length, cs_change, delay_us, speed_hz)]
+        self._tx_data = []
+        self._tx = None
+        self._rx = None
+        self._messages = None
 
-#     def read(self):
-#         adc = self.spi.xfer2([1, (8 + self.channel) << 4, 0])
-#         return ((adc[1] & 3) << 8) + adc[2]
+    def add(self, tx=b"", rx_length=0, cs_change=True, delay_us=0, speed_hz=0):
+        """
+        Dodaje transakcję do kolejki.
+        :param tx: Dane do wysłania.
+        :param rx_length: Liczba bajtów do odebrania (długość segmentu to max(len(tx), rx_length)).
+        :param cs_change: Czy zwolnić CS po tym segmencie (False - następny segment w tej samej aktywacji CS).
+        :param delay_us: Opóźnienie po segmencie w mikrosekundach.
+        :param speed_hz: Prędkość segmentu (0 - domyślna prędkość magistrali).
+        :return: Indeks transakcji (do użycia w result() i set_tx()).
+        """
+        offset = sum(max(segment[1], segment[2]) for segment in self._segments)
+        self._segments.append((offset, len(tx), rx_length, cs_change, delay_us, speed_hz))
+        self._tx_data.append(bytes(tx))
+        self._messages = None
+        return len(self._segments) - 1
 
-#     def release(self):
-#         self.spi.close()
+    def set_tx(self, index, data):
+        """
+        Podmienia dane wysyłane w transakcji bez realokacji buforów.
+        """
+        offset, tx_length = self._segments[index][:2]
+        if len(data) != tx_length:
+            raise ValueError(f"Transaction {index} expects {tx_length} bytes, got {len(data)}.")
+        self._tx_data[index] = bytes(data)
+        if self._tx is not None:
+            self._tx[offset:offset + tx_length] = data
 
+    def _prepare(self):
+        """
+        Alokuje bufory i buduje wiadomości SPI_IOC_MESSAGE; dzieli kolejkę na kilka wiadomości,
+        gdy przekracza ona bufor sterownika, wyłącznie w miejscach, gdzie CS i tak jest zwalniany.
+        """
+        total = sum(max(segment[1], segment[2]) for segment in self._segments)
+        self._tx = bytearray(total)
+        self._rx = bytearray(total)
+        for (offset, tx_length, _, _, _, _), data in zip(self._segments, self._tx_data):
+            self._tx[offset:offset + tx_length] = data
+        tx_address = _buffer_address(self._tx) if total else 0
+        rx_address = _buffer_address(self._rx) if total else 0
+        self._messages = []
+        current, current_length = [], 0
+        for index, (offset, tx_length, rx_length, cs_change, delay_us, speed_hz) in enumerate(self._segments):
+            length = max(tx_length, rx_length)
+            if current and (current_length + length > self.spi.chunk_size or len(current) >= _SPI_IOC_MAX_TRANSFERS):
+                if not self._segments[index - 1][3]:
+                    raise ValueError("SPI batch segment sharing one CS assertion exceeds the spidev buffer size; "
+                                     "use cs_pin or split the transaction.")
+                self._messages.append(current)
+                current, current_length = [], 0
+            current.append((tx_address + offset if tx_length else 0, rx_address + offset if rx_length else 0,
+                            length, speed_hz, delay_us, 1 if cs_change else 0))
+            current_length += length
+        if current:
+            self._messages.append(current)
+        packed = []
+        for message in self._messages:
+            buffer = bytearray(_SPI_IOC_TRANSFER.size * len(message))
+            for position, (tx_address, rx_address, length, speed_hz, delay_us, cs_change) in enumerate(message):
+                # Na ostatnim segmencie wiadomości cs_change oznaczałoby pozostawienie aktywnego CS
+                if position == len(message) - 1:
+                    cs_change = 0
+                _SPI_IOC_TRANSFER.pack_into(buffer, position * _SPI_IOC_TRANSFER.size, tx_address, rx_address, length,
+                                            speed_hz, delay_us, self.spi.bits_per_word, cs_change, 0, 0, 0, 0)
+            packed.append((_spi_ioc_message(len(message)), buffer))
+        self._messages = packed
 
-# class RPiCAN:
-#     def __init__(self, interface='can0'):
-#         self.interface = interface
+    def execute(self):
+        """
+        Wykonuje wszystkie transakcje z kolejki.
+        :return: Bufor odebranych danych (bytearray); poszczególne wyniki dostępne przez result().
+        """
+        if self._messages is None:
+            self._prepare()
+        fd = self.spi.spi.fileno()
+        self.spi._select()
+        try:
+            for request, buffer in self._messages:
+                fcntl.ioctl(fd, request, buffer)
+        finally:
+            self.spi._deselect()
+        return self._rx
+
+    def result(self, index):
+        """
+        Zwraca widok (memoryview) na dane odebrane w transakcji o podanym indeksie.
+        """
+        offset, tx_length, rx_length = self._segments[index][:3]
+        return memoryview(self._rx)[offset:offset + max(tx_length, rx_length)]
+
+
+class RPiADC(RPiSPI):
+    def __init__(self, bus=0, device=0, chip="MCP3008", channels=None, vref=3.3, max_speed_hz=1000000,
+                 frames_per_transfer=64, block_frames=4096, sample_rate=None, chunk_size=None):
+        """
+        Przetwornik ADC MCP3xxx na SPI z ciągłą akwizycją.
+        Próbki wielu kanałów są zbierane jedną wiadomością SPI_IOC_MESSAGE (po 3 bajty z osobną aktywacją CS),
+        dekodowane wektorowo przez NumPy do prealokowanych bloków i przekazywane konsumentowi przez bufor podwójny.
+        :param bus: Numer magistrali SPI.
+        :param device: Numer urządzenia SPI (linia CE).
+        :param chip: Typ układu: 'MCP3004', 'MCP3008', 'MCP3204' lub 'MCP3208'.
+        :param channels: Lista próbkowanych kanałów; domyślnie wszystkie.
+        :param vref: Napięcie odniesienia w woltach.
+        :param max_speed_hz: Prędkość zegara SPI.
+        :param frames_per_transfer: Liczba ramek (próbka z każdego kanału) w jednym wywołaniu ioctl.
+        :param block_frames: Liczba ramek w bloku przekazywanym konsumentowi (wielokrotność frames_per_transfer).
+        :param sample_rate: (Opcjonalna) docelowa częstotliwość ramek w Hz, realizowana opóźnieniem między
+                            próbkami w sterowniku (przybliżona; rzeczywistą podaje ADCBlock.sample_rate).
+                            Domyślnie próbkowanie z maksymalną szybkością magistrali.
+        :param chunk_size: Maksymalny rozmiar pojedynczego transferu; domyślnie bufsiz modułu spidev.
+        """
+        super().__init__(bus=bus, device=device, max_speed_hz=max_speed_hz, chunk_size=chunk_size)
+        if chip not in ADC_CHIPS:
+            raise ValueError(f"Invalid ADC chip: {chip}. Supported: {', '.join(ADC_CHIPS)}.")
+        if block_frames % frames_per_transfer:
+            raise ValueError("ADC block_frames must be a multiple of frames_per_transfer.")
+        self.chip = chip
+        self.channels = list(channels) if channels is not None else list(range(ADC_CHIPS[chip][0]))
+        for channel in self.channels:
+            command_bytes(chip, channel)  # Walidacja numerów kanałów
+        self.vref = vref
+        self.frames_per_transfer = frames_per_transfer
+        self.block_frames = block_frames
+        self.sample_rate = sample_rate
+        self.buffer = None
+        self._batch = None
+        self._decoder = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self.error = None
+
+    def initialize(self):
+        """
+        Otwiera SPI i przygotowuje kolejkę transakcji jednego transferu.
+        """
+        super().initialize()
+        delay_us = 0
+        if self.sample_rate:
+            sample_time_us = 24e6 / self.max_speed_hz
+            delay_us = max(0, min(0xFFFF, round(1e6 / (self.sample_rate * len(self.channels)) - sample_time_us)))
+        self._batch = self.batch()
+        for _ in range(self.frames_per_transfer):
+            for channel in self.channels:
+                self._batch.add(command_bytes(self.chip, channel), rx_length=3, cs_change=True, delay_us=delay_us)
+        self._decoder = ADCDecoder(self.chip, self.frames_per_transfer, len(self.channels))
+
+    def _new_block(self, frames=None):
+        return ADCBlock(frames or self.block_frames, len(self.channels), ADC_CHIPS[self.chip][1], self.vref,
+                        self.channels)
+
+    def read_channel(self, channel):
+        """
+        Pojedynczy odczyt kanału (odziedziczona metoda read(length) pozostaje surowym odczytem SPI).
+        :return: Kod przetwornika (int).
+        """
+        response = self.transfer(command_bytes(self.chip, channel))
+        return ((response[1] & ((1 << (ADC_CHIPS[self.chip][1] - 8)) - 1)) << 8) | response[2]
+
+    def read_voltage(self, channel):
+        return self.read_channel(channel) * self.vref / ((1 << ADC_CHIPS[self.chip][1]) - 1)
+
+    def _fill(self, block):
+        """
+        Wypełnia blok kolejnymi transferami wsadowymi.
+        """
+        codes = block.codes
+        step = self.frames_per_transfer
+        execute, decode = self._batch.execute, self._decoder.decode
+        block.start_time = time.perf_counter_ns()
+        for position in range(0, codes.shape[0], step):
+            decode(execute(), codes[position:position + step])
+        block.end_time = time.perf_counter_ns()
+        block.frames = codes.shape[0]
+
+    def read_block(self, frames=None):
+        """
+        Synchroniczny odczyt bloku próbek (bez wątku akwizycji).
+        :param frames: Liczba ramek (wielokrotność frames_per_transfer); domyślnie block_frames.
+        :return: Nowy obiekt ADCBlock.
+        """
+        frames = frames or self.block_frames
+        if frames % self.frames_per_transfer:
+            raise ValueError("ADC block frames must be a multiple of frames_per_transfer.")
+        block = self._new_block(frames)
+        self._fill(block)
+        return block
+
+    def _acquisition_loop(self):
+        sequence = 0
+        try:
+            while not self._stop_event.is_set():
+                block = self.buffer.back
+                self._fill(block)
+                sequence += 1
+                block.sequence = sequence
+                self.buffer.publish()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.buffer.close()
+
+    def start_acquisition(self):
+        """
+        Uruchamia ciągłą akwizycję w wątku tła.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("ADC acquisition is already running.")
+        if self.buffer is None:
+            self.buffer = BlockBuffer(self._new_block)
+        self.buffer.reopen()
+        self.error = None
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._acquisition_loop, name="RPiADC", daemon=True)
+        self._thread.start()
+
+    def get_block(self, timeout=None):
+        """
+        Zwraca kolejny blok z akwizycji (poprzedni blok zostaje zwolniony i może zostać nadpisany).
+        Luki w numerach ADCBlock.sequence oznaczają bloki odrzucone, bo konsument nie nadążał.
+        :param timeout: Maksymalny czas oczekiwania w sekundach.
+        :return: ADCBlock lub None, jeśli blok nie pojawił się w czasie timeout.
+        :raises RuntimeError: Jeśli akwizycja zakończyła się błędem.
+        """
+        block = self.buffer.get(timeout)
+        if block is None and self.error is not None:
+            raise RuntimeError(f"ADC acquisition failed: {self.error}")
+        return block
+
+    def stop_acquisition(self):
+        """
+        Zatrzymuje akwizycję.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def release(self):
+        """
+        Zatrzymuje akwizycję i zamyka SPI.
+        """
+        self.stop_acquisition()
+        super().release()
+
+
+class RPiCAN:
+    def __init__(self, interface='can0', bitrate=500000, backend='socketcan', configure_link=True, use_sudo=True,
+                 virtual_bus='virtual'):
+        """
+        Klasa do obsługi magistrali CAN.
+        :param interface: Nazwa interfejsu SocketCAN (np. 'can0' dla MCP2515, 'vcan0').
+        :param bitrate: Prędkość magistrali w bit/s (ustawiana przy configure_link).
+        :param backend: 'socketcan' lub 'virtual' (magistrala w obrębie procesu, bez sprzętu).
+        :param configure_link: Czy konfigurować i podnosić interfejs poleceniem ip link.
+        :param use_sudo: Czy uruchamiać ip link przez sudo.
+        :param virtual_bus: Nazwa magistrali wirtualnej (punkty końcowe o tej samej nazwie widzą swoje ramki).
+        """
+        if backend not in ('socketcan', 'virtual'):
+            raise ValueError(f"Invalid CAN backend: {backend}. Use 'socketcan' or 'virtual'.")
+        self.interface = interface
+        self.bitrate = bitrate
+        self.backend = backend
+        self.configure_link = configure_link
+        self.use_sudo = use_sudo
+        self.virtual_bus = virtual_bus
+        self.bus = None
+        self.captures = []
+
+    def get_required_resources(self):
+        """
+        Zwraca zasoby wymagane przez CAN (interfejs sieciowy, bez pinów GPIO).
+        """
+        name = self.interface if self.backend == 'socketcan' else f"virtual:{self.virtual_bus}"
+        return {"pins": [], "ports": [name]}
+
+    def get_initialized_params(self):
+        """
+        Zwraca parametry magistrali CAN po inicjalizacji.
+        """
+        return {
+            "interface": self.interface if self.backend == 'socketcan' else f"virtual:{self.virtual_bus}",
+            "bitrate": self.bitrate,
+            "backend": self.backend
+        }
+
+    def _ip_link(self, *arguments):
+        command = (["sudo"] if self.use_sudo else []) + ["ip", "link", "set", self.interface] + list(arguments)
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Command '{' '.join(command)}' failed: {result.stderr.strip()}")
+
+    def initialize(self):
+        """
+        Konfiguruje interfejs i otwiera magistralę.
+        """
+        if self.backend == 'virtual':
+            self.bus = CANBus.virtual(self.virtual_bus)
+            return
+        if self.configure_link:
+            self._ip_link("down")
+            self._ip_link("up", "type", "can", "bitrate", str(self.bitrate))
+        self.bus = CANBus.socketcan(self.interface)
+
+    def send(self, arbitration_id, data=b"", extended=None):
+        self.bus.send(arbitration_id, data, extended)
+
+    def recv(self, timeout=None):
+        return self.bus.recv(timeout)
+
+    def set_filters(self, filters):
+        self.bus.set_filters(filters)
+
+    def request(self, arbitration_id, data, response_id, timeout=1.0):
+        return self.bus.request(arbitration_id, data, response_id, timeout)
+
+    def send_periodic(self, arbitration_id, data, period):
+        return self.bus.send_periodic(arbitration_id, data, period)
+
+    def stop_periodic(self, arbitration_id=None):
+        self.bus.stop_periodic(arbitration_id)
+
+    def capture(self, filters=None, capacity=1000000):
+        """
+        Uruchamia rejestrację ramek (z filtrami akceptacji stosowanymi przed Pythonem).
+        :return: Uruchomiony obiekt CANCapture.
+        """
+        capture = self.bus.capture(filters, capacity)
+        self.captures.append(capture)
+        return capture
+
+    def release(self):
+        """
+        Zatrzymuje rejestracje, zamyka magistralę i wyłącza interfejs.
+        """
+        for capture in self.captures:
+            capture.stop()
+        self.captures.clear()
+        if self.bus is not None:
+            self.bus.close()
+            self.bus = None
+        if self.backend == 'socketcan' and self.configure_link:
+            self._ip_link("down")
+
+
+# Nowe klasy peryferiów
+# class RPi1Wire:
+#     def __init__(self, pin):
+#         self.pin = pin
 
 #     def get_required_resources(self):
-#         return {"pins": []}  # CAN zwykle nie używa GPIO
+#         return {"pins": [self.pin]}
 
 #     def initialize(self):
-#         import os
-#         os.system(f'sudo ip link set {self.interface} up type can bitrate 500000')
+#         GPIO.setmode(GPIO.BCM)
+#         GPIO.setup(self.pin, GPIO.IN)
 
 #     def release(self):
-#         import os
-#         os.system(f'sudo ip link set {self.interface} down')
-
-
+#         GPIO.cleanup(self.pin)
 
 
 # class RPiHardwarePWM:
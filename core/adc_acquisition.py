@@ -0,0 +1,185 @@
+import threading
+import numpy as np
+
+# Parametry przetworników z rodziny MCP3xxx: (liczba kanałów, rozdzielczość w bitach)
+ADC_CHIPS = {
+    "MCP3004": (4, 10),
+    "MCP3008": (8, 10),
+    "MCP3204": (4, 12),
+    "MCP3208": (8, 12),
+}
+
+
+def command_bytes(chip, channel, differential=False):
+    """
+    Zwraca 3-bajtowe polecenie odczytu kanału (bajt startu, konfiguracja, bajt taktujący odpowiedź).
+    :param chip: Nazwa układu (klucz ADC_CHIPS).
+    :param channel: Numer kanału.
+    :param differential: Czy pomiar różnicowy (para kanałów) zamiast single-ended.
+    """
+    channels, bits = ADC_CHIPS[chip]
+    if not 0 <= channel < channels:
+        raise ValueError(f"Invalid {chip} channel: {channel}. Expected 0-{channels - 1}.")
+    single = 0 if differential else 1
+    if bits == 10:
+        return bytes([0x01, (single << 7) | (channel << 4), 0x00])
+    return bytes([0x04 | (single << 1) | (channel >> 2), (channel & 0x03) << 6, 0x00])
+
+
+class ADCDecoder:
+    def __init__(self, chip, frames, channels):
+        """
+        Wektorowe dekodowanie odpowiedzi MCP3xxx (po 3 bajty na próbkę) do prealokowanych tablic.
+        :param chip: Nazwa układu (klucz ADC_CHIPS).
+        :param frames: Liczba ramek (zestawów próbek ze wszystkich kanałów) w jednym transferze.
+        :param channels: Liczba próbkowanych kanałów.
+        """
+        self.bits = ADC_CHIPS[chip][1]
+        self.frames = frames
+        self.channels = channels
+        self._high_mask = (1 << (self.bits - 8)) - 1
+        self._scratch = np.empty(frames * channels, dtype=np.uint8)
+
+    def decode(self, raw, out):
+        """
+        Dekoduje odebrane bajty bez tworzenia tablic pośrednich.
+        :param raw: Bufor odebranych danych (frames * channels * 3 bajty).
+        :param out: Tablica np.uint16 o kształcie (frames, channels) na kody przetwornika.
+        """
+        samples = np.frombuffer(raw, dtype=np.uint8, count=self.frames * self.channels * 3).reshape(-1, 3)
+        flat = out.reshape(-1)
+        np.bitwise_and(samples[:, 1], self._high_mask, out=self._scratch)
+        np.left_shift(self._scratch, 8, out=flat, dtype=np.uint16)
+        np.bitwise_or(flat, samples[:, 2], out=flat)
+        return out
+
+
+class ADCBlock:
+    def __init__(self, frames, channels, bits, vref, channel_numbers):
+        """
+        Blok próbek: kody przetwornika (frames x channels) i znaczniki czasu.
+        Bloki są wielokrotnie używane przez bufor podwójny - dane są ważne do następnego get_block().
+        """
+        self.codes = np.zeros((frames, channels), dtype=np.uint16)
+        self.bits = bits
+        self.vref = vref
+        self.channel_numbers = list(channel_numbers)
+        self.sequence = 0
+        self.frames = 0
+        self.start_time = 0
+        self.end_time = 0
+
+    @property
+    def sample_rate(self):
+        """
+        Zmierzona częstotliwość ramek w bloku (Hz).
+        """
+        elapsed = self.end_time - self.start_time
+        return self.frames * 1e9 / elapsed if elapsed > 0 else 0.0
+
+    def _column(self, channel):
+        try:
+            return self.channel_numbers.index(channel)
+        except ValueError:
+            raise ValueError(f"ADC channel {channel} is not sampled.")
+
+    def volts(self, channel=None):
+        """
+        Zwraca próbki w woltach (wszystkie kanały lub jeden kanał).
+        """
+        codes = self.codes[:self.frames]
+        if channel is not None:
+            codes = codes[:, self._column(channel)]
+        return codes * (self.vref / ((1 << self.bits) - 1))
+
+    def stats(self, channel):
+        """
+        Statystyki kanału w woltach.
+        :return: Słownik z kluczami mean, min, max, std, rms, peak_to_peak.
+        """
+        values = self.volts(channel)
+        if not values.size:
+            raise ValueError("ADC block is empty.")
+        minimum, maximum = float(values.min()), float(values.max())
+        return {
+            "mean": float(values.mean()),
+            "min": minimum,
+            "max": maximum,
+            "std": float(values.std()),
+            "rms": float(np.sqrt(np.mean(values * values))),
+            "peak_to_peak": maximum - minimum,
+        }
+
+    def count_outside(self, channel, low, high):
+        """
+        Liczba próbek kanału spoza przedziału [low, high] (w woltach).
+        """
+        values = self.volts(channel)
+        return int(np.count_nonzero((values < low) | (values > high)))
+
+
+class BlockBuffer:
+    def __init__(self, make_block):
+        """
+        Bufor podwójny: producent wypełnia blok tylny, konsument czyta blok przedni.
+        Gdy konsument nie zwolnił bloku przedniego, nowy blok jest odrzucany (licznik overruns);
+        nieodebrany blok przedni jest zastępowany nowszym.
+        :param make_block: Funkcja tworząca pusty blok.
+        """
+        self.front = make_block()
+        self.back = make_block()
+        self.overruns = 0
+        self._ready = False
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def publish(self):
+        """
+        Wywoływane przez producenta po wypełnieniu bloku tylnego.
+        :return: True, jeśli blok został przekazany konsumentowi.
+        """
+        with self._condition:
+            if self._busy:
+                self.overruns += 1
+                return False
+            if self._ready:
+                self.overruns += 1
+            self.front, self.back = self.back, self.front
+            self._ready = True
+            self._condition.notify()
+            return True
+
+    def get(self, timeout=None):
+        """
+        Zwalnia poprzedni blok i czeka na kolejny.
+        :return: Blok przedni lub None po upływie czasu / zamknięciu bufora.
+        """
+        with self._condition:
+            self._busy = False
+            if not self._condition.wait_for(lambda: self._ready or self._closed, timeout):
+                return None
+            if not self._ready:
+                return None
+            self._ready = False
+            self._busy = True
+            return self.front
+
+    def release(self):
+        """
+        Zwalnia blok przedni bez oczekiwania na następny.
+        """
+        with self._condition:
+            self._busy = False
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def reopen(self):
+        with self._condition:
+            self._closed = False
+            self._ready = False
+            self._busy = False
+            self.overruns = 0
@@ -0,0 +1,148 @@
+import hashlib
+import numpy as np
+
+# Liczba elementów wokół pierwszej niezgodności pokazywanych w komunikacie
+WINDOW = 4
+# Maksymalna długość tekstu pojedynczego elementu w komunikacie
+MAX_ITEM_LENGTH = 32
+
+
+def as_array(data):
+    """
+    Zwraca tablicę numpy bez kopiowania tam, gdzie to możliwe: bytes/bytearray/memoryview jako uint8,
+    listy i krotki przez np.asarray, tablice bez zmian.
+    """
+    if isinstance(data, np.ndarray):
+        return data
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return np.frombuffer(data, dtype=np.uint8)
+    return np.asarray(data)
+
+
+def _as_bytes(data):
+    """
+    Widok bajtów bufora (bez kopiowania dla obiektów ciągłych w pamięci).
+    """
+    if isinstance(data, np.ndarray):
+        return memoryview(np.ascontiguousarray(data)).cast("B")
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return memoryview(data).cast("B")
+    return memoryview(np.ascontiguousarray(np.asarray(data))).cast("B")
+
+
+def digest(data, algorithm="blake2b"):
+    """
+    Skrót zawartości bufora (hex) - pozwala porównać dużą rejestrację ze wzorcem bez przechowywania wzorca.
+    :param data: bytes, bytearray, memoryview lub tablica numpy.
+    :param algorithm: Nazwa algorytmu hashlib.
+    """
+    return hashlib.new(algorithm, _as_bytes(data)).hexdigest()
+
+
+def _format_item(value):
+    text = repr(value.item() if hasattr(value, "item") else value)
+    return text if len(text) <= MAX_ITEM_LENGTH else text[:MAX_ITEM_LENGTH - 3] + "..."
+
+
+def format_index(shape, index):
+    """
+    Indeks elementu spłaszczonej tablicy w zapisie tablicy o kształcie shape (np. "(3, 17)" dla 2D);
+    indeks spoza kształtu jest podawany jako indeks płaski.
+    """
+    if len(shape) > 1 and index < int(np.prod(shape)):
+        return str(tuple(int(i) for i in np.unravel_index(index, shape)))
+    return str(index)
+
+
+def format_window(values, index, window=WINDOW):
+    """
+    Fragment tablicy (spłaszczonej) wokół indeksu, z elementem index w nawiasach kwadratowych.
+    """
+    flat = values.reshape(-1)
+    start = max(index - window, 0)
+    end = min(index + window + 1, flat.size)
+    items = [f"[{_format_item(flat[i])}]" if i == index else _format_item(flat[i]) for i in range(start, end)]
+    return f"{'... ' if start else ''}{' '.join(items)}{' ...' if end < flat.size else ''}"
+
+
+def _first(mask):
+    """
+    Liczba elementów spełniających maskę i indeks pierwszego z nich (None, jeśli brak).
+    """
+    count = int(np.count_nonzero(mask))
+    return count, (int(np.argmax(mask.reshape(-1))) if count else None)
+
+
+def compare_equal(actual, expected):
+    """
+    Porównanie element po elemencie. Tablice o równym kształcie są najpierw porównywane w całości
+    (np.array_equal); indeks i liczba niezgodności są wyznaczane tylko, gdy się różnią.
+    :return: Słownik: mismatches (liczba różnych elementów we wspólnej części), first (indeks lub None),
+             size_mismatch (krotka kształtów lub None), shape (kształt tablicy zawierającej element first),
+             actual i expected (spłaszczone tablice).
+    """
+    actual_array, expected_array = as_array(actual), as_array(expected)
+    result = {"mismatches": 0, "first": None, "size_mismatch": None, "shape": actual_array.shape,
+              "actual": actual_array.reshape(-1), "expected": expected_array.reshape(-1)}
+    if actual_array.shape != expected_array.shape:
+        result["size_mismatch"] = (actual_array.shape, expected_array.shape)
+    elif np.array_equal(actual_array, expected_array):
+        return result
+    common = min(actual_array.size, expected_array.size)
+    mismatches, first = _first(result["actual"][:common] != result["expected"][:common])
+    result["mismatches"], result["first"] = mismatches, first
+    if first is None and result["size_mismatch"] is not None:
+        result["first"] = common  # Pierwszy element poza krótszą tablicą - indeks w kształcie dłuższej
+        if expected_array.size > actual_array.size:
+            result["shape"] = expected_array.shape
+    return result
+
+
+def outside_tolerance(actual, expected, atol=0.0, rtol=0.0):
+    """
+    Elementy, dla których |actual - expected| > atol + rtol * |expected|.
+    :return: Krotka (liczba, indeks pierwszego lub None, największa odchyłka).
+    """
+    actual_array = as_array(actual).astype(np.float64, copy=False)
+    expected_array = as_array(expected).astype(np.float64, copy=False)
+    if actual_array.shape != expected_array.shape:
+        raise ValueError(f"Shape mismatch: {actual_array.shape} vs {expected_array.shape}.")
+    deviation = np.abs(actual_array - expected_array)
+    count, first = _first(deviation > atol + rtol * np.abs(expected_array))
+    return count, first, float(deviation.max()) if deviation.size else 0.0
+
+
+def outside_band(values, low, high):
+    """
+    Elementy spoza pasma [low, high]; granice mogą być liczbami lub tablicami (np. maska sygnału).
+    :return: Krotka (liczba, indeks pierwszego lub None).
+    """
+    values = as_array(values)
+    return _first((values < low) | (values > high))
+
+
+def monotonic_violations(values, increasing=True, strict=False):
+    """
+    Pary sąsiednich próbek naruszające monotoniczność.
+    :return: Krotka (liczba naruszeń, indeks pierwszej próbki naruszającej lub None).
+    """
+    flat = as_array(values).reshape(-1)
+    previous, following = flat[:-1], flat[1:]  # Porównanie zamiast np.diff - bez przepełnienia typów bez znaku
+    if increasing:
+        mask = following <= previous if strict else following < previous
+    else:
+        mask = following >= previous if strict else following > previous
+    count, first = _first(mask)
+    return count, None if first is None else first + 1
+
+
+def settle_index(values, target, tolerance):
+    """
+    Indeks próbki, od której wszystkie kolejne mieszczą się w target ± tolerance.
+    :return: Indeks lub None, jeśli ostatnia próbka jest poza pasmem (sygnał się nie ustalił).
+    """
+    outside = np.abs(as_array(values).reshape(-1).astype(np.float64, copy=False) - target) > tolerance
+    if not outside.size or outside[-1]:
+        return None
+    last_outside = np.flatnonzero(outside)
+    return int(last_outside[-1]) + 1 if last_outside.size else 0
@@ -1,9 +1,97 @@
 #assertion.py
-_current_context = {}  # Globalny słownik do przechowywania kontekstu
+import threading
+from core import array_compare, timing_analysis
+
+
+class _ThreadContext(threading.local):
+    """
+    Kontekst testu osobny dla każdego wątku (równoległe sloty DUT uruchamiają testy w osobnych wątkach).
+    Wątek bez własnego kontekstu (np. wątek pomocniczy uruchomiony przez test) korzysta z kontekstu
+    trwającego testu, jeśli w procesie trwa dokładnie jeden test; przy kilku równoległych testach asercja
+    z takiego wątku zgłasza RuntimeError (nie wiadomo, do którego testu należy).
+    Udostępnia podzbiór interfejsu słownika używany przez asercje.
+    """
+    _active = {}  # Konteksty ustawione we wszystkich wątkach: {identyfikator wątku: słownik}
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.values = {}
+
+    def _resolve(self):
+        if self.values:
+            return self.values
+        with self._lock:
+            active = list(self._active.values())
+        if len(active) > 1:
+            raise RuntimeError("Assertion called from a thread without test context while several tests "
+                               "run concurrently; pass context= explicitly.")
+        return active[0] if active else self.values
+
+    def __setitem__(self, key, value):
+        self.values[key] = value
+        with self._lock:
+            self._active[threading.get_ident()] = self.values
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
+
+    def get(self, key, default=None):
+        return self._resolve().get(key, default)
+
+    def clear(self):
+        self.values.clear()
+        with self._lock:
+            self._active.pop(threading.get_ident(), None)
+
+    def __bool__(self):
+        return bool(self._resolve())
+
+
+_current_context = _ThreadContext()  # Kontekst bieżącego testu (osobny dla każdego wątku testu)
+
+# Maksymalna liczba nieudanych asercji wymienianych w raporcie testu (pozostałe są tylko liczone)
+MAX_LISTED_FAILURES = 10
+
+
+class ResultCollector:
+    """
+    Zbiera wyniki asercji jednego testu (asercje miękkie - test jest kontynuowany po niepowodzeniu)
+    i raportuje test raz, z liczbą asercji i zwięzłą listą niepowodzeń.
+    """
+    __slots__ = ("assertions", "failed", "failures")
+
+    def __init__(self):
+        self.assertions = 0
+        self.failed = 0
+        self.failures = []  # [(numer asercji, komunikat)]
+
+    def add(self, passed, message=None):
+        self.assertions += 1
+        if not passed:
+            self.failed += 1
+            if len(self.failures) < MAX_LISTED_FAILURES:
+                self.failures.append((self.assertions, message))
+
+    def details(self):
+        if not self.failed:
+            return None
+        listed = "; ".join(f"#{number}: {str(message).strip()}" for number, message in self.failures)
+        more = f"; ... and {self.failed - len(self.failures)} more" if self.failed > len(self.failures) else ""
+        return f"{self.failed} of {self.assertions} assertions failed: {listed}{more}"
+
+    def report(self, framework, group_name, test_name):
+        """
+        Raportuje zebrane wyniki jako jeden wynik testu (test bez asercji nie jest raportowany).
+        """
+        if self.assertions:
+            framework.report_test_result(group_name, test_name, self.failed == 0, self.details(),
+                                         assertions=self.assertions, failed_assertions=self.failed)
+
 
 def set_test_context(framework, group_name, test_name):
     """
     Ustawia globalny kontekst testu.
+    Jeśli framework ma włączone aggregate_results, asercje trafiają do ResultCollector kontekstu.
     :param framework: Instancja frameworku testowego.
     :param group_name: Nazwa grupy testowej.
     :param test_name: Nazwa testu.
@@ -11,6 +99,7 @@ def set_test_context(framework, group_name, test_name):
     _current_context["framework"] = framework
     _current_context["group_name"] = group_name
     _current_context["test_name"] = test_name
+    _current_context["collector"] = ResultCollector() if getattr(framework, "aggregate_results", False) else None
 
 
 def clear_test_context():
@@ -19,6 +108,52 @@ def clear_test_context():
     """
     _current_context.clear()
 
+
+def run_in_test_context(framework, group_name, test_name, function, *args, catch_exceptions=True, **kwargs):
+    """
+    Wykonuje function(*args, **kwargs) w kontekście testu. Przy zbieraniu wyników test jest raportowany raz
+    po zakończeniu, a nieobsłużony wyjątek jest dopisywany jako nieudana asercja.
+    :param catch_exceptions: Czy przechwytywać wyjątki (False - np. dla setup/teardown grupy wyjątek jest
+                             przekazywany dalej po zaraportowaniu zebranych asercji).
+    """
+    set_test_context(framework, group_name, test_name)
+    collector = _current_context.get("collector")
+    try:
+        function(*args, **kwargs)
+    except Exception as e:
+        if collector is None or not catch_exceptions:
+            raise
+        collector.add(False, f"Unhandled exception: {str(e)}")
+    finally:
+        clear_test_context()
+        if collector is not None:
+            collector.report(framework, group_name, test_name)
+
+
+def _report_result(context, passed, message):
+    """
+    Raportuje wynik asercji przez framework z podanego lub globalnego kontekstu
+    (albo zapisuje go w ResultCollector kontekstu).
+    """
+    context = context or _current_context
+    collector = context.get("collector")
+    if collector is not None:
+        collector.add(passed, message)
+        return
+    context.get("framework").report_test_result(
+        context.get("group_name"),
+        context.get("test_name"),
+        passed,
+        None if passed else message
+    )
+
+def _report_info(context, message):
+    """
+    Raportuje komunikat informacyjny bieżącego testu (np. rozkład pomiaru po nieudanej asercji).
+    """
+    context = context or _current_context
+    context.get("framework").report_test_info(context.get("group_name"), context.get("test_name"), message)
+
 def TEST_FAIL_MESSAGE(message, context=None):
     """
     Asercja raportująca niepowodzenie testu z podanym komunikatem.
@@ -27,15 +162,7 @@ def TEST_FAIL_MESSAGE(message, context=None):
     """
     if context or _current_context:
         # Jeśli mamy kontekst (z argumentów lub globalny), wykonaj asercję
-        framework = (context or _current_context).get("framework")
-        group_name = (context or _current_context).get("group_name")
-        test_name = (context or _current_context).get("test_name")
-        framework.report_test_result(
-            group_name,
-            test_name,
-            False,
-            message
-        )
+        _report_result(context, False, message)
     else:
         # Jeśli brak kontekstu, przechowaj symbol do późniejszego wykonania
         return ("TEST_FAIL_MESSAGE", message)
@@ -67,18 +194,8 @@ def TEST_ASSERT_EQUAL(expected, actual, context=None):
     """
     if context or _current_context:
         # Jeśli mamy kontekst (z argumentów lub globalny), wykonaj asercję
-        framework = (context or _current_context).get("framework")
-        group_name = (context or _current_context).get("group_name")
-        test_name = (context or _current_context).get("test_name")
-        if actual != expected:
-            framework.report_test_result(
-                group_name,
-                test_name,
-                False,
-                f"Assertion failed! Expected value = {expected}, actual value = {actual} "
-            )
-        else:
-            framework.report_test_result(group_name, test_name, True)
+        _report_result(context, actual == expected,
+                       f"Assertion failed! Expected value = {expected}, actual value = {actual} ")
     else:
         # Jeśli brak kontekstu, przechowaj symbol do późniejszego wykonania
         return ("TEST_ASSERT_EQUAL", actual, expected)
@@ -91,18 +208,7 @@ def TEST_ASSERT_TRUE(condition, context=None):
     :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
     """
     if context or _current_context:
-        framework = (context or _current_context).get("framework")
-        group_name = (context or _current_context).get("group_name")
-        test_name = (context or _current_context).get("test_name")
-        if not condition:
-            framework.report_test_result(
-                group_name,
-                test_name,
-                False,
-                f"Assertion failed: condition is not true"
-            )
-        else:
-            framework.report_test_result(group_name, test_name, True)
+        _report_result(context, bool(condition), "Assertion failed: condition is not true")
     else:
         return ("TEST_ASSERT_TRUE", condition)
 
@@ -115,17 +221,336 @@ def TEST_ASSERT_IN(item, collection, context=None):
     :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
     """
     if context or _current_context:
-        framework = (context or _current_context).get("framework")
-        group_name = (context or _current_context).get("group_name")
-        test_name = (context or _current_context).get("test_name")
-        if item not in collection:
-            framework.report_test_result(
-                group_name,
-                test_name,
-                False,
-                f"Assertion failed: {item} not in {collection}"
-            )
-        else:
-            framework.report_test_result(group_name, test_name, True)
+        _report_result(context, item in collection, f"Assertion failed: {item} not in {collection}")
     else:
         return ("TEST_ASSERT_IN", item, collection)
+
+
+_NO_PERIOD_MESSAGE = "Assertion failed: no complete period captured"
+
+
+def TEST_ASSERT_PULSE_WIDTH_WITHIN(capture, expected, tolerance, level=1, context=None):
+    """
+    Asercja sprawdzająca, czy wszystkie zarejestrowane impulsy mają szerokość expected ± tolerance.
+    :param capture: Rejestracja zboczy (EdgeCapture).
+    :param expected: Oczekiwana szerokość impulsu w sekundach.
+    :param tolerance: Dopuszczalna odchyłka w sekundach.
+    :param level: Poziom impulsu (1 - impulsy wysokie, 0 - niskie).
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        widths = timing_analysis.pulse_widths(capture, level)
+        passed = widths.size > 0 and bool((abs(widths - expected) <= tolerance).all())
+        _report_result(context, passed,
+                       f"Assertion failed: pulse width outside {expected:g} ± {tolerance:g} s "
+                       f"({timing_analysis.format_summary(widths)})")
+    else:
+        return ("TEST_ASSERT_PULSE_WIDTH_WITHIN", capture, expected, tolerance, level)
+
+
+def TEST_ASSERT_FREQUENCY_WITHIN(capture, expected, tolerance, context=None):
+    """
+    Asercja sprawdzająca średnią częstotliwość sygnału.
+    :param capture: Rejestracja zboczy (EdgeCapture).
+    :param expected: Oczekiwana częstotliwość w Hz.
+    :param tolerance: Dopuszczalna odchyłka w Hz.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        if not timing_analysis.periods(capture).size:
+            _report_result(context, False, _NO_PERIOD_MESSAGE)
+            return
+        measured = timing_analysis.frequency(capture)
+        _report_result(context, abs(measured - expected) <= tolerance,
+                       f"Assertion failed: frequency {measured:.6g} Hz outside {expected:g} ± {tolerance:g} Hz "
+                       f"(periods: {timing_analysis.format_summary(timing_analysis.periods(capture))})")
+    else:
+        return ("TEST_ASSERT_FREQUENCY_WITHIN", capture, expected, tolerance)
+
+
+def TEST_ASSERT_DUTY_CYCLE_WITHIN(capture, expected, tolerance, context=None):
+    """
+    Asercja sprawdzająca średnie wypełnienie sygnału.
+    :param capture: Rejestracja zboczy (EdgeCapture).
+    :param expected: Oczekiwane wypełnienie w procentach.
+    :param tolerance: Dopuszczalna odchyłka w punktach procentowych.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        if not timing_analysis.periods(capture).size:
+            _report_result(context, False, _NO_PERIOD_MESSAGE)
+            return
+        measured = timing_analysis.duty_cycle(capture)
+        _report_result(context, abs(measured - expected) <= tolerance,
+                       f"Assertion failed: duty cycle {measured:.3f}% outside {expected:g} ± {tolerance:g}%")
+    else:
+        return ("TEST_ASSERT_DUTY_CYCLE_WITHIN", capture, expected, tolerance)
+
+
+def TEST_ASSERT_JITTER_BELOW(capture, max_jitter, context=None):
+    """
+    Asercja sprawdzająca, czy odchylenie standardowe okresu nie przekracza podanej wartości.
+    :param capture: Rejestracja zboczy (EdgeCapture).
+    :param max_jitter: Maksymalny jitter (std okresu) w sekundach.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        if not timing_analysis.periods(capture).size:
+            _report_result(context, False, _NO_PERIOD_MESSAGE)
+            return
+        std, peak_to_peak = timing_analysis.jitter(capture)
+        _report_result(context, std <= max_jitter,
+                       f"Assertion failed: period jitter {std:.6g} s (peak-to-peak {peak_to_peak:.6g} s) "
+                       f"exceeds {max_jitter:g} s")
+    else:
+        return ("TEST_ASSERT_JITTER_BELOW", capture, max_jitter)
+
+
+def TEST_ASSERT_LATENCY_BELOW(stimulus, response, max_latency, stimulus_level=1, response_level=1, context=None):
+    """
+    Asercja sprawdzająca, czy każda odpowiedź nastąpiła nie później niż max_latency po pobudzeniu.
+    :param stimulus: Rejestracja zboczy pinu pobudzenia.
+    :param response: Rejestracja zboczy pinu odpowiedzi.
+    :param max_latency: Maksymalne opóźnienie w sekundach.
+    :param stimulus_level: Poziom, do którego przechodzi pobudzenie (1 - zbocze narastające).
+    :param response_level: Poziom, do którego przechodzi odpowiedź.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        measured = timing_analysis.latencies(stimulus, response, stimulus_level, response_level)
+        passed = measured.size > 0 and bool((measured <= max_latency).all())
+        _report_result(context, passed,
+                       f"Assertion failed: latency exceeds {max_latency:g} s "
+                       f"({timing_analysis.format_summary(measured)})")
+    else:
+        return ("TEST_ASSERT_LATENCY_BELOW", stimulus, response, max_latency, stimulus_level, response_level)
+
+
+def TEST_ASSERT_ADC_WITHIN(block, channel, low, high, context=None):
+    """
+    Asercja sprawdzająca, czy wszystkie próbki kanału w bloku ADC mieszczą się w przedziale [low, high] woltów.
+    :param block: Blok próbek (ADCBlock).
+    :param channel: Numer kanału przetwornika.
+    :param low: Dolna granica w woltach.
+    :param high: Górna granica w woltach.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        outside = block.count_outside(channel, low, high)
+        stats = block.stats(channel)
+        _report_result(context, outside == 0,
+                       f"Assertion failed: {outside} of {block.frames} samples on ADC channel {channel} outside "
+                       f"[{low:g}, {high:g}] V (min={stats['min']:.4g} V, max={stats['max']:.4g} V)")
+    else:
+        return ("TEST_ASSERT_ADC_WITHIN", block, channel, low, high)
+
+
+def TEST_ASSERT_ADC_MEAN_WITHIN(block, channel, expected, tolerance, context=None):
+    """
+    Asercja sprawdzająca, czy średnie napięcie kanału w bloku ADC wynosi expected ± tolerance.
+    :param block: Blok próbek (ADCBlock).
+    :param channel: Numer kanału przetwornika.
+    :param expected: Oczekiwane napięcie w woltach.
+    :param tolerance: Dopuszczalna odchyłka w woltach.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        mean = block.stats(channel)["mean"]
+        _report_result(context, abs(mean - expected) <= tolerance,
+                       f"Assertion failed: ADC channel {channel} mean {mean:.4g} V outside "
+                       f"{expected:g} ± {tolerance:g} V")
+    else:
+        return ("TEST_ASSERT_ADC_MEAN_WITHIN", block, channel, expected, tolerance)
+
+
+def TEST_ASSERT_ADC_RIPPLE_BELOW(block, channel, max_peak_to_peak, context=None):
+    """
+    Asercja sprawdzająca, czy tętnienia (wartość międzyszczytowa) kanału nie przekraczają max_peak_to_peak woltów.
+    :param block: Blok próbek (ADCBlock).
+    :param channel: Numer kanału przetwornika.
+    :param max_peak_to_peak: Maksymalna wartość międzyszczytowa w woltach.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        ripple = block.stats(channel)["peak_to_peak"]
+        _report_result(context, ripple <= max_peak_to_peak,
+                       f"Assertion failed: ADC channel {channel} ripple {ripple:.4g} Vpp exceeds {max_peak_to_peak:g} Vpp")
+    else:
+        return ("TEST_ASSERT_ADC_RIPPLE_BELOW", block, channel, max_peak_to_peak)
+
+
+def TEST_ASSERT_PERCENTILE_BELOW(measurement, percentile, limit, context=None):
+    """
+    Asercja sprawdzająca, czy percentyl czasu wywołania nie przekracza limitu, np. p99 <= 5 ms.
+    Przy niepowodzeniu drukuje rozkład pomiaru (percentyle i histogram).
+    :param measurement: Wynik pomiaru (Measurement z core.measurement.measure).
+    :param percentile: Percentyl (0-100), np. 99.
+    :param limit: Maksymalny czas w sekundach.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        measured = measurement.percentile(percentile)
+        passed = measurement.count > 0 and measured <= limit
+        _report_result(context, passed,
+                       f"Assertion failed: p{percentile:g} latency {measured:.6g} s exceeds {limit:g} s "
+                       f"(n={measurement.count})")
+        if not passed:
+            _report_info(context, f"Distribution: {measurement.distribution()}")
+    else:
+        return ("TEST_ASSERT_PERCENTILE_BELOW", measurement, percentile, limit)
+
+
+def TEST_ASSERT_THROUGHPUT_ABOVE(measurement, minimum, context=None):
+    """
+    Asercja sprawdzająca, czy przepustowość pomiaru wynosi co najmniej minimum jednostek na sekundę.
+    Przy niepowodzeniu drukuje rozkład pomiaru (percentyle i histogram).
+    :param measurement: Wynik pomiaru (Measurement z core.measurement.measure).
+    :param minimum: Minimalna przepustowość [measurement.unit/s].
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        measured = measurement.throughput
+        passed = measured >= minimum
+        _report_result(context, passed,
+                       f"Assertion failed: throughput {measured:.6g} {measurement.unit}/s below {minimum:g} "
+                       f"{measurement.unit}/s (n={measurement.count})")
+        if not passed:
+            _report_info(context, f"Distribution: {measurement.distribution()}")
+    else:
+        return ("TEST_ASSERT_THROUGHPUT_ABOVE", measurement, minimum)
+
+
+def TEST_ASSERT_ARRAY_EQUAL(actual, expected, context=None):
+    """
+    Asercja porównująca bufory/tablice element po elemencie (bytes, bytearray, listy, tablice numpy).
+    Komunikat niepowodzenia ma ograniczoną długość: liczba niezgodności, indeks pierwszej i fragmenty obu tablic.
+    :param actual: Odczytany bufor.
+    :param expected: Bufor wzorcowy.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        result = array_compare.compare_equal(actual, expected)
+        first = result["first"]
+        message = None
+        if first is not None:
+            size = (f"shape {result['size_mismatch'][0]} != expected {result['size_mismatch'][1]}, "
+                    if result["size_mismatch"] else "")
+            shown = []
+            for name in ("expected", "actual"):
+                values = result[name]
+                shown.append(f"{name}: {array_compare.format_window(values, first) if first < values.size else '<end>'}")
+            message = (f"Assertion failed: arrays differ ({size}{result['mismatches']} mismatched elements, "
+                       f"first at [{array_compare.format_index(result['shape'], first)}]); {'; '.join(shown)}")
+        _report_result(context, first is None, message)
+    else:
+        return ("TEST_ASSERT_ARRAY_EQUAL", actual, expected)
+
+
+def TEST_ASSERT_ARRAY_WITHIN(actual, expected, atol, rtol=0.0, context=None):
+    """
+    Asercja sprawdzająca, czy |actual - expected| <= atol + rtol * |expected| dla każdego elementu.
+    :param actual: Zmierzone wartości.
+    :param expected: Wartości wzorcowe (tablica o tym samym kształcie).
+    :param atol: Tolerancja bezwzględna.
+    :param rtol: Tolerancja względna.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        count, first, deviation = array_compare.outside_tolerance(actual, expected, atol, rtol)
+        message = None
+        if first is not None:
+            actual_array, expected_array = array_compare.as_array(actual), array_compare.as_array(expected)
+            message = (f"Assertion failed: {count} of {actual_array.size} elements outside tolerance "
+                       f"(atol={atol:g}, rtol={rtol:g}, max deviation {deviation:.6g}), first at "
+                       f"[{array_compare.format_index(actual_array.shape, first)}]; "
+                       f"expected: {array_compare.format_window(expected_array, first)}; "
+                       f"actual: {array_compare.format_window(actual_array, first)}")
+        _report_result(context, first is None, message)
+    else:
+        return ("TEST_ASSERT_ARRAY_WITHIN", actual, expected, atol, rtol)
+
+
+def TEST_ASSERT_ARRAY_IN_BAND(values, low, high, context=None):
+    """
+    Asercja sprawdzająca, czy wszystkie elementy mieszczą się w paśmie [low, high]
+    (granice mogą być liczbami lub tablicami - maska przebiegu).
+    :param values: Sprawdzane wartości.
+    :param low: Dolna granica.
+    :param high: Górna granica.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        count, first = array_compare.outside_band(values, low, high)
+        message = None
+        if first is not None:
+            array = array_compare.as_array(values)
+            message = (f"Assertion failed: {count} of {array.size} elements outside band, first at "
+                       f"[{array_compare.format_index(array.shape, first)}]: {array_compare.format_window(array, first)}")
+        _report_result(context, first is None, message)
+    else:
+        return ("TEST_ASSERT_ARRAY_IN_BAND", values, low, high)
+
+
+def TEST_ASSERT_MONOTONIC(values, increasing=True, strict=False, context=None):
+    """
+    Asercja sprawdzająca monotoniczność przebiegu (np. licznika lub rampy napięcia).
+    :param values: Kolejne próbki.
+    :param increasing: True - niemalejący (rosnący), False - nierosnący (malejący).
+    :param strict: Czy wymagana jest ścisła monotoniczność.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        count, first = array_compare.monotonic_violations(values, increasing, strict)
+        message = None
+        if first is not None:
+            kind = f"{'strictly ' if strict else ''}{'increasing' if increasing else 'decreasing'}"
+            message = (f"Assertion failed: sequence is not {kind} ({count} violations, first at [{first}]): "
+                       f"{array_compare.format_window(array_compare.as_array(values).reshape(-1), first)}")
+        _report_result(context, first is None, message)
+    else:
+        return ("TEST_ASSERT_MONOTONIC", values, increasing, strict)
+
+
+def TEST_ASSERT_SETTLES_WITHIN(values, target, tolerance, max_time, sample_rate, context=None):
+    """
+    Asercja sprawdzająca, czy przebieg ustala się w target ± tolerance nie później niż max_time
+    od pierwszej próbki i pozostaje w tym paśmie do końca.
+    :param values: Kolejne próbki (np. kanał ADC).
+    :param target: Wartość ustalona.
+    :param tolerance: Dopuszczalna odchyłka od wartości ustalonej.
+    :param max_time: Maksymalny czas ustalania w sekundach.
+    :param sample_rate: Częstotliwość próbkowania w Hz.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        index = array_compare.settle_index(values, target, tolerance)
+        if index is None:
+            passed = False
+            message = f"Assertion failed: signal did not settle within {target:g} ± {tolerance:g}"
+        else:
+            settle_time = index / sample_rate
+            passed = settle_time <= max_time
+            message = (f"Assertion failed: signal settled within {target:g} ± {tolerance:g} after "
+                       f"{settle_time:.6g} s (sample {index}), limit {max_time:g} s")
+        _report_result(context, passed, message)
+    else:
+        return ("TEST_ASSERT_SETTLES_WITHIN", values, target, tolerance, max_time, sample_rate)
+
+
+def TEST_ASSERT_DIGEST_EQUAL(actual, expected, algorithm="blake2b", context=None):
+    """
+    Szybkie porównanie dużego bufora przez skrót: wzorzec może być skrótem (hex) zapisanym w teście
+    lub buforem. Komunikat zawiera tylko rozmiar i skróty.
+    :param actual: Odczytany bufor (bytes, bytearray, memoryview lub tablica numpy).
+    :param expected: Oczekiwany skrót (str, hex) lub bufor wzorcowy.
+    :param algorithm: Nazwa algorytmu hashlib.
+    :param context: (Opcjonalny) Słownik zawierający framework, grupę i nazwę testu.
+    """
+    if context or _current_context:
+        actual_digest = array_compare.digest(actual, algorithm)
+        expected_digest = expected.lower() if isinstance(expected, str) else array_compare.digest(expected, algorithm)
+        _report_result(context, actual_digest == expected_digest,
+                       f"Assertion failed: {algorithm} digest of {array_compare.as_array(actual).nbytes} bytes is "
+                       f"{actual_digest[:16]}..., expected {expected_digest[:16]}...")
+    else:
+        return ("TEST_ASSERT_DIGEST_EQUAL", actual, expected, algorithm)
@@ -0,0 +1,493 @@
+import collections
+import socket
+import struct
+import threading
+import time
+from array import array
+import numpy as np
+
+CAN_EFF_FLAG = 0x80000000
+CAN_RTR_FLAG = 0x40000000
+CAN_ERR_FLAG = 0x20000000
+CAN_INV_FILTER = 0x20000000
+CAN_SFF_MASK = 0x000007FF
+CAN_EFF_MASK = 0x1FFFFFFF
+
+# struct can_frame z linux/can.h: can_id, len, __pad, __res0, len8_dlc, data[8]
+_CAN_FRAME = struct.Struct("=IB3x8s")
+CAN_FRAME_SIZE = _CAN_FRAME.size
+_CAN_FILTER = struct.Struct("=II")
+CAN_FRAME_DTYPE = np.dtype([("can_id", "<u4"), ("dlc", "u1"), ("pad", "u1", 3), ("data", "u1", 8)])
+
+# Stałe gniazd (nie wszystkie są eksportowane przez moduł socket)
+_SO_TIMESTAMPNS = getattr(socket, "SO_TIMESTAMPNS", 35)
+_SO_RXQ_OVFL = getattr(socket, "SO_RXQ_OVFL", 40)
+_TIMESPEC = struct.Struct("@qq")
+_ANCILLARY_SIZE = socket.CMSG_SPACE(_TIMESPEC.size) + socket.CMSG_SPACE(4)
+
+# Broadcast Manager (CAN_BCM) - cykliczne nadawanie realizowane przez jądro
+_BCM_HEAD = struct.Struct("@3I4l2I0q")
+_BCM_TX_SETUP = 1
+_BCM_TX_DELETE = 2
+_BCM_SETTIMER = 0x0001
+_BCM_STARTTIMER = 0x0002
+
+
+def encode_frame(arbitration_id, data=b"", extended=None, rtr=False):
+    """
+    Koduje ramkę CAN do 16-bajtowej struktury can_frame.
+    :param arbitration_id: Identyfikator ramki.
+    :param data: Dane (0-8 bajtów).
+    :param extended: Czy identyfikator 29-bitowy; domyślnie gdy identyfikator nie mieści się w 11 bitach.
+    :param rtr: Czy ramka zdalna (Remote Transmission Request).
+    """
+    if len(data) > 8:
+        raise ValueError(f"CAN frame data too long: {len(data)} bytes (max 8).")
+    if extended is None:
+        extended = arbitration_id > CAN_SFF_MASK
+    if arbitration_id > (CAN_EFF_MASK if extended else CAN_SFF_MASK):
+        raise ValueError(f"Invalid CAN identifier: {arbitration_id:#x}.")
+    can_id = arbitration_id | (CAN_EFF_FLAG if extended else 0) | (CAN_RTR_FLAG if rtr else 0)
+    return _CAN_FRAME.pack(can_id, len(data), bytes(data))
+
+
+class CANMessage:
+    def __init__(self, arbitration_id, data=b"", extended=False, rtr=False, timestamp=None):
+        """
+        Pojedyncza ramka CAN.
+        :param timestamp: Czas odebrania w ns (CLOCK_REALTIME).
+        """
+        self.arbitration_id = arbitration_id
+        self.data = bytes(data)
+        self.extended = extended
+        self.rtr = rtr
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_raw(cls, raw, timestamp=None):
+        can_id, length, data = _CAN_FRAME.unpack(raw)
+        extended = bool(can_id & CAN_EFF_FLAG)
+        return cls(can_id & (CAN_EFF_MASK if extended else CAN_SFF_MASK), data[:length], extended,
+                   bool(can_id & CAN_RTR_FLAG), timestamp)
+
+    def __repr__(self):
+        identifier = f"{self.arbitration_id:08X}" if self.extended else f"{self.arbitration_id:03X}"
+        return f"CANMessage({identifier} [{len(self.data)}] {self.data.hex(' ')})"
+
+
+class CANFilter:
+    def __init__(self, can_id, can_mask=None, extended=False, invert=False):
+        """
+        Filtr akceptacji w semantyce jądra: ramka przechodzi, gdy (id_ramki & maska) == (can_id & maska).
+        :param can_id: Identyfikator wzorcowy.
+        :param can_mask: Maska; domyślnie dokładne dopasowanie identyfikatora.
+        :param extended: Czy filtr dotyczy identyfikatorów 29-bitowych (format identyfikatora jest zawsze porównywany).
+        :param invert: Czy odwrócić warunek (ramki niepasujące).
+        """
+        if can_mask is None:
+            can_mask = CAN_EFF_MASK if extended else CAN_SFF_MASK
+        self.can_id = can_id | (CAN_EFF_FLAG if extended else 0) | (CAN_INV_FILTER if invert else 0)
+        self.can_mask = can_mask | CAN_EFF_FLAG | CAN_RTR_FLAG
+        self.invert = invert
+
+    def pack(self):
+        return _CAN_FILTER.pack(self.can_id, self.can_mask)
+
+    def matches(self, can_id):
+        matched = (can_id & self.can_mask) == (self.can_id & ~CAN_INV_FILTER & self.can_mask)
+        return matched != self.invert
+
+
+def _matches_any(filters, can_id):
+    if filters is None:
+        return True
+    for can_filter in filters:
+        if can_filter.matches(can_id):
+            return True
+    return False
+
+
+class SocketCANBackend:
+    def __init__(self, channel, filters=None, receive_buffer=4 * 1024 * 1024):
+        """
+        Gniazdo SocketCAN (CAN_RAW). Filtry akceptacji są ustawiane w jądrze (CAN_RAW_FILTER),
+        więc odrzucone ramki nie docierają do Pythona. Znaczniki czasu pochodzą z jądra (SO_TIMESTAMPNS),
+        a liczba ramek utraconych przy przepełnieniu kolejki gniazda z SO_RXQ_OVFL.
+        :param channel: Nazwa interfejsu (np. 'can0', 'vcan0').
+        :param filters: (Opcjonalna) lista CANFilter; pusta lista blokuje odbiór.
+        :param receive_buffer: Rozmiar bufora odbiorczego gniazda w bajtach.
+        """
+        self.channel = channel
+        self.dropped = 0
+        self.socket = socket.socket(socket.PF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+            self.socket.setsockopt(socket.SOL_SOCKET, _SO_TIMESTAMPNS, 1)
+            self.socket.setsockopt(socket.SOL_SOCKET, _SO_RXQ_OVFL, 1)
+            self.set_filters(filters)
+            self.socket.bind((channel,))
+        except OSError:
+            self.socket.close()
+            raise
+        self._bcm = None
+
+    def set_filters(self, filters):
+        if filters is not None:
+            self.socket.setsockopt(socket.SOL_CAN_RAW, socket.CAN_RAW_FILTER,
+                                   b"".join(can_filter.pack() for can_filter in filters))
+
+    def send(self, raw):
+        self.socket.send(raw)
+
+    def _receive_one(self, view, flags):
+        size, ancillary, _, _ = self.socket.recvmsg_into([view], _ANCILLARY_SIZE, flags)
+        timestamp = 0
+        for level, kind, data in ancillary:
+            if level == socket.SOL_SOCKET and kind == _SO_TIMESTAMPNS:
+                seconds, nanoseconds = _TIMESPEC.unpack(data[:_TIMESPEC.size])
+                timestamp = seconds * 1000000000 + nanoseconds
+            elif level == socket.SOL_SOCKET and kind == _SO_RXQ_OVFL:
+                self.dropped = struct.unpack("=I", data[:4])[0]
+        return size, timestamp or time.time_ns()
+
+    def receive_into(self, frames, times, index, count, timeout=None):
+        """
+        Odbiera do count ramek do bufora frames (po CAN_FRAME_SIZE bajtów) i tablicy times od pozycji index.
+        Czeka najwyżej timeout na pierwszą ramkę, kolejne odbiera bez blokowania.
+        :return: Liczba odebranych ramek.
+        """
+        self.socket.settimeout(timeout)
+        received = 0
+        offset = index * CAN_FRAME_SIZE
+        flags = 0
+        try:
+            while received < count:
+                size, times[index + received] = self._receive_one(frames[offset:offset + CAN_FRAME_SIZE], flags)
+                if size == CAN_FRAME_SIZE:
+                    received += 1
+                    offset += CAN_FRAME_SIZE
+                flags = socket.MSG_DONTWAIT
+        except (socket.timeout, BlockingIOError):
+            pass
+        return received
+
+    def start_periodic(self, raw, period):
+        """
+        Zleca jądru (CAN_BCM) cykliczne nadawanie ramki; zmiana danych to ponowne wywołanie z tym samym identyfikatorem.
+        """
+        if self._bcm is None:
+            self._bcm = socket.socket(socket.PF_CAN, socket.SOCK_DGRAM, socket.CAN_BCM)
+            self._bcm.connect((self.channel,))
+        can_id = _CAN_FRAME.unpack(raw)[0]
+        seconds, microseconds = int(period), round((period - int(period)) * 1e6)
+        self._bcm.send(_BCM_HEAD.pack(_BCM_TX_SETUP, _BCM_SETTIMER | _BCM_STARTTIMER, 0, 0, 0,
+                                      seconds, microseconds, can_id, 1) + raw)
+        return can_id
+
+    def stop_periodic(self, handle):
+        self._bcm.send(_BCM_HEAD.pack(_BCM_TX_DELETE, 0, 0, 0, 0, 0, 0, handle, 0))
+
+    def close(self):
+        if self._bcm is not None:
+            self._bcm.close()
+            self._bcm = None
+        self.socket.close()
+
+
+class VirtualCANBus:
+    _buses = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name="virtual"):
+        """
+        Magistrala CAN w obrębie procesu (bez sprzętu i modułów jądra). Ramka wysłana przez jeden punkt
+        końcowy trafia do kolejek wszystkich pozostałych, których filtry ją akceptują.
+        :param name: Nazwa magistrali.
+        """
+        self.name = name
+        self._endpoints = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, name="virtual"):
+        """
+        Zwraca współdzieloną magistralę o podanej nazwie (tworzy ją przy pierwszym użyciu).
+        """
+        with cls._registry_lock:
+            if name not in cls._buses:
+                cls._buses[name] = cls(name)
+            return cls._buses[name]
+
+    def connect(self, filters=None, queue_size=65536):
+        endpoint = VirtualCANBackend(self, filters, queue_size)
+        with self._lock:
+            self._endpoints = self._endpoints + [endpoint]
+        return endpoint
+
+    def _disconnect(self, endpoint):
+        with self._lock:
+            self._endpoints = [item for item in self._endpoints if item is not endpoint]
+
+    def _deliver(self, sender, raw):
+        can_id = _CAN_FRAME.unpack_from(raw)[0]
+        timestamp = time.time_ns()
+        for endpoint in self._endpoints:
+            if endpoint is not sender and _matches_any(endpoint.filters, can_id):
+                endpoint._enqueue(raw, timestamp)
+
+
+class VirtualCANBackend:
+    def __init__(self, bus, filters=None, queue_size=65536):
+        """
+        Punkt końcowy magistrali wirtualnej o interfejsie zgodnym z SocketCANBackend.
+        Filtry są sprawdzane przy dostarczaniu, przed umieszczeniem ramki w kolejce.
+        :param queue_size: Pojemność kolejki odbiorczej; nadmiarowe ramki są liczone w dropped.
+        """
+        self.bus = bus
+        self.channel = bus.name
+        self.filters = filters
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._periodic = {}
+
+    def set_filters(self, filters):
+        self.filters = filters
+
+    def _enqueue(self, raw, timestamp):
+        with self._condition:
+            if len(self._queue) >= self.queue_size:
+                self.dropped += 1
+                return
+            self._queue.append((raw, timestamp))
+            self._condition.notify()
+
+    def send(self, raw):
+        self.bus._deliver(self, bytes(raw))
+
+    def receive_into(self, frames, times, index, count, timeout=None):
+        with self._condition:
+            if not self._queue and not self._condition.wait_for(lambda: self._queue, timeout):
+                return 0
+            received = min(count, len(self._queue))
+            offset = index * CAN_FRAME_SIZE
+            popleft = self._queue.popleft
+            for position in range(index, index + received):
+                raw, times[position] = popleft()
+                frames[offset:offset + CAN_FRAME_SIZE] = raw
+                offset += CAN_FRAME_SIZE
+        return received
+
+    def start_periodic(self, raw, period):
+        can_id = _CAN_FRAME.unpack(raw)[0]
+        if can_id in self._periodic:
+            self._periodic[can_id].raw = raw
+        else:
+            self._periodic[can_id] = PeriodicTransmitter(self, raw, period).start()
+        return can_id
+
+    def stop_periodic(self, handle):
+        transmitter = self._periodic.pop(handle, None)
+        if transmitter is not None:
+            transmitter.stop()
+
+    def close(self):
+        for handle in list(self._periodic):
+            self.stop_periodic(handle)
+        self.bus._disconnect(self)
+        with self._condition:
+            self._condition.notify_all()
+
+
+class PeriodicTransmitter:
+    def __init__(self, backend, raw, period):
+        """
+        Cykliczne nadawanie ramki w wątku według harmonogramu bezwzględnego (bez kumulacji opóźnień).
+        Używane przez magistralę wirtualną; SocketCAN korzysta z CAN_BCM w jądrze.
+        """
+        self.backend = backend
+        self.raw = raw
+        self.period = period
+        self.sent = 0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="CANPeriodic", daemon=True)
+
+    def _run(self):
+        period = int(self.period * 1e9)
+        next_time = time.perf_counter_ns()
+        while True:
+            self.backend.send(self.raw)
+            self.sent += 1
+            next_time += period
+            if self._stop_event.wait(max(next_time - time.perf_counter_ns(), 0) / 1e9):
+                return
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+
+class CANCapture:
+    def __init__(self, backend, capacity=1000000, batch=256):
+        """
+        Rejestracja ramek w wątku tła do prealokowanego bufora (16 bajtów struktury can_frame + znacznik czasu).
+        Odczyt po zakończeniu daje tablicę strukturalną NumPy bez przetwarzania ramek pojedynczo.
+        :param backend: Własny punkt końcowy (z filtrami) - SocketCANBackend lub VirtualCANBackend.
+        :param capacity: Maksymalna liczba ramek.
+        :param batch: Maksymalna liczba ramek odbieranych w jednym przebiegu pętli.
+        """
+        self.backend = backend
+        self.capacity = capacity
+        self.batch = batch
+        self._frames = bytearray(capacity * CAN_FRAME_SIZE)
+        self._times = array("q", bytes(8 * capacity))
+        self.count = 0
+        self.overflowed = False
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        frames = memoryview(self._frames)
+        times = self._times
+        receive_into = self.backend.receive_into
+        while not self._stop_event.is_set():
+            if self.count == self.capacity:
+                self.overflowed = True
+                break
+            self.count += receive_into(frames, times, self.count, min(self.batch, self.capacity - self.count), 0.05)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="CANCapture", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Zatrzymuje rejestrację i zamyka punkt końcowy.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.backend.close()
+
+    @property
+    def dropped(self):
+        """
+        Liczba ramek utraconych przed dotarciem do bufora (przepełnienie kolejki gniazda/punktu końcowego).
+        """
+        return self.backend.dropped
+
+    def frames(self):
+        """
+        Zwraca zarejestrowane ramki.
+        :return: Tablica strukturalna z polami timestamp [ns], arbitration_id, extended, rtr, dlc, data (8 bajtów).
+        """
+        raw = np.frombuffer(self._frames, dtype=CAN_FRAME_DTYPE, count=self.count)
+        result = np.empty(self.count, dtype=[("timestamp", "<i8"), ("arbitration_id", "<u4"), ("extended", "?"),
+                                             ("rtr", "?"), ("dlc", "u1"), ("data", "u1", 8)])
+        result["timestamp"] = np.frombuffer(self._times, dtype=np.int64, count=self.count)
+        result["extended"] = (raw["can_id"] & CAN_EFF_FLAG) != 0
+        result["rtr"] = (raw["can_id"] & CAN_RTR_FLAG) != 0
+        result["arbitration_id"] = np.where(result["extended"], raw["can_id"] & CAN_EFF_MASK,
+                                            raw["can_id"] & CAN_SFF_MASK)
+        result["dlc"] = raw["dlc"]
+        result["data"] = raw["data"]
+        return result
+
+    def messages(self):
+        """
+        Zwraca zarejestrowane ramki jako listę CANMessage (wygodne przy małej liczbie ramek).
+        """
+        view = memoryview(self._frames)
+        return [CANMessage.from_raw(view[index * CAN_FRAME_SIZE:(index + 1) * CAN_FRAME_SIZE], self._times[index])
+                for index in range(self.count)]
+
+
+class CANBus:
+    def __init__(self, open_backend):
+        """
+        Interfejs magistrali CAN niezależny od backendu.
+        :param open_backend: Funkcja open_backend(filters) tworząca nowy punkt końcowy (gniazdo / endpoint wirtualny).
+        """
+        self._open_backend = open_backend
+        self.backend = open_backend(None)
+        self._frame = bytearray(CAN_FRAME_SIZE)
+        self._time = array("q", [0])
+        self._periodic = {}
+
+    @classmethod
+    def socketcan(cls, channel):
+        return cls(lambda filters: SocketCANBackend(channel, filters))
+
+    @classmethod
+    def virtual(cls, name="virtual"):
+        bus = VirtualCANBus.get(name)
+        return cls(lambda filters: bus.connect(filters))
+
+    def send(self, arbitration_id, data=b"", extended=None, rtr=False):
+        self.backend.send(encode_frame(arbitration_id, data, extended, rtr))
+
+    def recv(self, timeout=None, backend=None):
+        """
+        Odbiera jedną ramkę.
+        :return: CANMessage lub None po upływie czasu.
+        """
+        backend = backend or self.backend
+        if not backend.receive_into(memoryview(self._frame), self._time, 0, 1, timeout):
+            return None
+        return CANMessage.from_raw(self._frame, self._time[0])
+
+    def set_filters(self, filters):
+        """
+        Ustawia filtry akceptacji głównego punktu końcowego (None - wszystkie ramki).
+        """
+        self.backend.set_filters(filters)
+
+    def capture(self, filters=None, capacity=1000000):
+        """
+        Uruchamia rejestrację ramek na osobnym punkcie końcowym z własnymi filtrami.
+        :return: Uruchomiony obiekt CANCapture.
+        """
+        return CANCapture(self._open_backend(filters), capacity=capacity).start()
+
+    def request(self, arbitration_id, data, response_id, timeout=1.0, extended=None, response_extended=False):
+        """
+        Wysyła zapytanie i czeka na odpowiedź o podanym identyfikatorze.
+        Punkt końcowy z filtrem odpowiedzi jest otwierany przed wysłaniem, aby nie przegapić szybkiej odpowiedzi.
+        :return: CANMessage lub None, jeśli odpowiedź nie nadeszła w czasie timeout.
+        """
+        listener = self._open_backend([CANFilter(response_id, extended=response_extended)])
+        try:
+            self.send(arbitration_id, data, extended)
+            return self.recv(timeout, backend=listener)
+        finally:
+            listener.close()
+
+    def send_periodic(self, arbitration_id, data, period, extended=None):
+        """
+        Rozpoczyna (lub aktualizuje dane) cykliczne nadawanie ramki.
+        :param period: Okres w sekundach.
+        """
+        handle = self.backend.start_periodic(encode_frame(arbitration_id, data, extended), period)
+        self._periodic[arbitration_id] = handle
+        return handle
+
+    def stop_periodic(self, arbitration_id=None):
+        """
+        Zatrzymuje cykliczne nadawanie ramki (lub wszystkich ramek, gdy arbitration_id=None).
+        """
+        identifiers = list(self._periodic) if arbitration_id is None else [arbitration_id]
+        for identifier in identifiers:
+            handle = self._periodic.pop(identifier, None)
+            if handle is not None:
+                self.backend.stop_periodic(handle)
+
+    def close(self):
+        self.stop_periodic()
+        self.backend.close()
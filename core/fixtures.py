@@ -0,0 +1,158 @@
+import inspect
+
+# Zakresy fikstur od najszerszego do najwęższego
+SCOPES = ("session", "group", "test")
+# Nazwy przekazywane fiksturom bez rejestracji
+BUILTIN_NAMES = ("framework", "group_name", "test_name")
+
+_FIXTURES = {}  # Zarejestrowane fikstury {nazwa: FixtureDefinition}
+_parameter_cache = {}  # {funkcja testu: nazwy parametrów po (framework, group_name, test_name)}
+
+
+class FixtureDefinition:
+    def __init__(self, name, func, scope):
+        """
+        Definicja fikstury: funkcja zwracająca wartość lub generator (yield wartość, po yield - sprzątanie).
+        Parametry funkcji to nazwy innych fikstur lub framework / group_name / test_name.
+        """
+        self.name = name
+        self.func = func
+        self.scope = scope
+        self.parameters = list(inspect.signature(func).parameters)
+
+
+def fixture(function=None, scope="test", name=None):
+    """
+    Dekorator rejestrujący fiksturę pod nazwą funkcji (lub name):
+        @fixture(scope="session")
+        def flashed_dut(framework):
+            flash_config(...)
+            yield dut
+            erase_config(...)
+    Wartość jest pamiętana w zakresie 'test', 'group' lub 'session' i wstrzykiwana do funkcji testów,
+    które mają parametr o tej nazwie (po framework, group_name, test_name).
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"Invalid fixture scope '{scope}', expected one of {', '.join(SCOPES)}.")
+
+    def register(func):
+        fixture_name = name or func.__name__
+        if fixture_name in BUILTIN_NAMES:
+            raise ValueError(f"Fixture name '{fixture_name}' is reserved.")
+        existing = _FIXTURES.get(fixture_name)
+        if existing is not None and (existing.func.__module__, existing.func.__qualname__) != \
+                (func.__module__, func.__qualname__):
+            raise ValueError(f"Fixture '{fixture_name}' is already defined in {existing.func.__module__}.")
+        _FIXTURES[fixture_name] = FixtureDefinition(fixture_name, func, scope)
+        return func
+
+    return register(function) if function is not None else register
+
+
+def _test_parameters(func):
+    """
+    Parametry funkcji testu po (framework, group_name, test_name): krotki (nazwa, czy ma wartość domyślną).
+    """
+    parameters = _parameter_cache.get(func)
+    if parameters is None:
+        parameters = [(parameter.name, parameter.default is not inspect.Parameter.empty)
+                      for parameter in list(inspect.signature(func).parameters.values())[3:]
+                      if parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)]
+        _parameter_cache[func] = parameters
+    return parameters
+
+
+class FixtureManager:
+    def __init__(self):
+        """
+        Pamięć podręczna wartości fikstur i kolejka sprzątania dla każdego zakresu (jedna instancja na TestFramework).
+        """
+        self._values = {scope: {} for scope in SCOPES}
+        self._errors = {scope: {} for scope in SCOPES}
+        self._finalizers = {scope: [] for scope in SCOPES}
+        self._active = []
+
+    def get(self, name, framework, group_name, test_name, requester_scope="test"):
+        """
+        Zwraca wartość fikstury, tworząc ją (wraz z zależnościami) przy pierwszym użyciu w jej zakresie.
+        """
+        definition = _FIXTURES.get(name)
+        if definition is None:
+            raise ValueError(f"Unknown fixture '{name}'.")
+        if SCOPES.index(definition.scope) > SCOPES.index(requester_scope):
+            raise ValueError(f"Fixture '{self._active[-1]}' ({requester_scope} scope) cannot use "
+                             f"'{name}' ({definition.scope} scope).")
+        values = self._values[definition.scope]
+        if name in values:
+            return values[name]
+        error = self._errors[definition.scope].get(name)
+        if error is not None:
+            raise RuntimeError(f"Fixture '{name}' failed: {error}")
+        if name in self._active:
+            raise ValueError(f"Circular fixture dependency: {' -> '.join(self._active + [name])}.")
+        self._active.append(name)
+        try:
+            builtins = {"framework": framework, "group_name": group_name, "test_name": test_name}
+            arguments = {parameter: builtins[parameter] if parameter in builtins else
+                         self.get(parameter, framework, group_name, test_name, definition.scope)
+                         for parameter in definition.parameters}
+            result = definition.func(**arguments)
+            if inspect.isgenerator(result):
+                try:
+                    value = next(result)
+                except StopIteration:
+                    raise RuntimeError(f"Fixture '{name}' did not yield a value.")
+                self._finalizers[definition.scope].append((name, result))
+            else:
+                value = result
+        except Exception as e:
+            self._errors[definition.scope][name] = e
+            raise
+        finally:
+            self._active.pop()
+        values[name] = value
+        return value
+
+    def finish(self, scope, framework, group_name):
+        """
+        Sprząta fikstury zakresu (i węższych) w odwrotnej kolejności utworzenia; błędy sprzątania są raportowane
+        jako nieudane testy "Fixture <nazwa> teardown".
+        """
+        for current in reversed(SCOPES[SCOPES.index(scope):]):
+            finalizers = self._finalizers[current]
+            while finalizers:
+                name, generator = finalizers.pop()
+                try:
+                    next(generator)
+                except StopIteration:
+                    continue
+                except Exception as e:
+                    framework.report_test_result(group_name, f"Fixture {name} teardown", False, str(e))
+                    continue
+                generator.close()
+                framework.report_test_result(group_name, f"Fixture {name} teardown", False,
+                                             "Fixture generator yielded more than once.")
+            self._values[current].clear()
+            self._errors[current].clear()
+
+
+def call_with_fixtures(framework, func, group_name, test_name, params=None):
+    """
+    Wywołuje funkcję testu z wstrzykniętymi fiksturami (parametry spoza params bez wartości domyślnej
+    lub o nazwie zarejestrowanej fikstury) i sprząta fikstury zakresu 'test'.
+    """
+    params = params or {}
+    parameters = _test_parameters(func)
+    if not parameters:
+        func(framework, group_name, test_name, **params)
+        return
+    manager = framework.fixtures
+    try:
+        arguments = dict(params)
+        for name, has_default in parameters:
+            if name in arguments or (has_default and name not in _FIXTURES):
+                continue
+            arguments[name] = manager.get(name, framework, group_name, test_name)
+        func(framework, group_name, test_name, **arguments)
+    finally:
+        manager.finish("test", framework, group_name)
@@ -0,0 +1,296 @@
+import time
+import zlib
+
+# Producenci pamięci SPI NOR rozpoznawani po pierwszym bajcie JEDEC ID
+JEDEC_MANUFACTURERS = {
+    0x01: "Spansion/Cypress",
+    0x1F: "Adesto",
+    0x20: "Micron/ST",
+    0x9D: "ISSI",
+    0xBF: "SST/Microchip",
+    0xC2: "Macronix",
+    0xC8: "GigaDevice",
+    0xEF: "Winbond",
+}
+
+# Rozkazy dla adresowania 3- i 4-bajtowego: (odczyt, zapis strony, kasowanie sektora 4 KB)
+_OPCODES = {
+    3: (0x03, 0x02, 0x20),
+    4: (0x13, 0x12, 0x21),
+}
+CMD_WRITE_ENABLE = 0x06
+CMD_READ_STATUS = 0x05
+CMD_READ_JEDEC_ID = 0x9F
+STATUS_BUSY = 0x01
+
+
+def capacity_from_code(code):
+    """
+    Rozmiar pamięci [B] z kodu pojemności JEDEC ID. Kody 0x10-0x1F to 2^kod (np. Macronix 1 Gbit: C2201B);
+    Winbond i Micron kodują 64/128/256 MB jako 0x20-0x22 (np. W25Q512: EF4020, N25Q512: 20BA20).
+    :return: Rozmiar w bajtach lub None dla nieznanego kodu.
+    """
+    if 0x10 <= code <= 0x1F:
+        return 1 << code
+    if 0x20 <= code <= 0x22:
+        return 1 << (code - 6)
+    return None
+
+
+class ProgramResult:
+    def __init__(self):
+        """
+        Podsumowanie programowania pamięci.
+        """
+        self.blocks_total = 0
+        self.blocks_skipped = 0
+        self.blocks_erased = 0
+        self.pages_written = 0
+        self.mismatched_blocks = []  # Adresy bloków, których CRC po weryfikacji się nie zgadza
+        self.duration = 0.0
+
+    @property
+    def verified(self):
+        return not self.mismatched_blocks
+
+    def __repr__(self):
+        return (f"ProgramResult(blocks={self.blocks_total}, skipped={self.blocks_skipped}, erased={self.blocks_erased}, "
+                f"pages={self.pages_written}, mismatched={len(self.mismatched_blocks)}, duration={self.duration:.3f}s)")
+
+
+def _only_clears_bits(current, target):
+    """
+    Sprawdza, czy zapis target na current wymaga jedynie zmian 1 -> 0 (czyli nie wymaga kasowania).
+    Operacja na liczbach całkowitych wykonuje się dla całego bloku naraz.
+    """
+    target_bits = int.from_bytes(target, "little")
+    return int.from_bytes(current, "little") & target_bits == target_bits
+
+
+class SPIFlash:
+    def __init__(self, spi, page_size=256, sector_size=4096, address_size=3, timeout=5.0):
+        """
+        Programator pamięci SPI NOR (rodziny 25xx) działający na RPiSPI.
+        :param spi: Zainicjalizowana instancja RPiSPI.
+        :param page_size: Rozmiar strony programowania w bajtach.
+        :param sector_size: Rozmiar kasowanego sektora w bajtach.
+        :param address_size: Liczba bajtów adresu (3 lub 4).
+        :param timeout: Maksymalny czas oczekiwania na zakończenie operacji w sekundach.
+        """
+        if address_size not in _OPCODES:
+            raise ValueError(f"Invalid flash address size: {address_size}. Only 3 and 4 are supported.")
+        self.spi = spi
+        self.page_size = page_size
+        self.sector_size = sector_size
+        self.address_size = address_size
+        self.timeout = timeout
+        self.read_opcode, self.program_opcode, self.erase_opcode = _OPCODES[address_size]
+        self.size = None
+
+    def _command(self, opcode, address):
+        return bytes([opcode]) + address.to_bytes(self.address_size, "big")
+
+    def read_jedec_id(self):
+        """
+        Odczytuje identyfikator JEDEC (rozkaz 0x9F).
+        :return: Krotka (producent, typ pamięci, kod pojemności).
+        """
+        manufacturer, memory_type, capacity = self.spi.write_then_read(bytes([CMD_READ_JEDEC_ID]), 3)
+        return manufacturer, memory_type, capacity
+
+    def probe(self):
+        """
+        Wykrywa pamięć na podstawie JEDEC ID i ustala jej rozmiar.
+        :return: Słownik z informacjami o pamięci.
+        :raises RuntimeError: Jeśli pamięć nie odpowiada.
+        """
+        manufacturer, memory_type, capacity = self.read_jedec_id()
+        if manufacturer in (0x00, 0xFF):
+            raise RuntimeError(f"No SPI flash detected (JEDEC ID {manufacturer:02X}{memory_type:02X}{capacity:02X}).")
+        self.size = capacity_from_code(capacity)
+        return {
+            "jedec_id": f"{manufacturer:02X}{memory_type:02X}{capacity:02X}",
+            "manufacturer": JEDEC_MANUFACTURERS.get(manufacturer, "Unknown"),
+            "size": self.size,
+        }
+
+    def read_status(self):
+        return self.spi.write_then_read(bytes([CMD_READ_STATUS]), 1)[0]
+
+    def wait_ready(self):
+        """
+        Odpytuje rejestr statusu do momentu zakończenia operacji zapisu/kasowania.
+        :raises TimeoutError: Jeśli pamięć nie zakończy operacji w czasie timeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        while self.read_status() & STATUS_BUSY:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"SPI flash busy for more than {self.timeout} s.")
+
+    def write_enable(self):
+        self.spi.write(bytes([CMD_WRITE_ENABLE]))
+
+    def read(self, address, length, out=None):
+        """
+        Odczytuje dane z pamięci. Przy sprzętowym CS odczyt dzielony jest na rozkazy mieszczące się w buforze spidev.
+        :param address: Adres początkowy.
+        :param length: Liczba bajtów.
+        :param out: (Opcjonalny) bufor bytearray na dane.
+        :return: Bufor z danymi.
+        """
+        if out is None:
+            out = bytearray(length)
+        view = memoryview(out)
+        header = 1 + self.address_size
+        chunk = max(length, 1) if self.spi.cs_pin is not None else self.spi.chunk_size - header
+        for position in range(0, length, chunk):
+            count = min(chunk, length - position)
+            self.spi.write_then_read(self._command(self.read_opcode, address + position), count,
+                                     out=view[position:position + count])
+        return out
+
+    def erase_sector(self, address):
+        """
+        Kasuje sektor zawierający podany adres.
+        """
+        self.write_enable()
+        self.spi.write(self._command(self.erase_opcode, address - address % self.sector_size))
+        self.wait_ready()
+
+    def _program_pages(self, pages):
+        """
+        Programuje listę stron [(adres, dane)]. Bufor kolejnej strony jest przygotowywany,
+        gdy pamięć wykonuje jeszcze zapis bieżącej; dopiero potem odpytywany jest status.
+        """
+        if not pages:
+            return
+        address, data = pages[0]
+        buffer = self._command(self.program_opcode, address) + data
+        for index in range(len(pages)):
+            self.write_enable()
+            self.spi.write(buffer)
+            if index + 1 < len(pages):
+                address, data = pages[index + 1]
+                buffer = self._command(self.program_opcode, address) + data
+            self.wait_ready()
+
+    def program(self, address, data, verify=True):
+        """
+        Programuje dane od podanego adresu. Sektory o identycznej zawartości są pomijane,
+        a kasowanie wykonywane jest tylko wtedy, gdy zapis wymaga zmiany któregoś bitu z 0 na 1.
+        Zapisywane są wyłącznie strony różniące się od bieżącej zawartości.
+        :param address: Adres początkowy.
+        :param data: Dane do zapisania.
+        :param verify: Czy po zapisie porównać CRC32 odczytanych sektorów z oczekiwanymi.
+        :return: Obiekt ProgramResult.
+        """
+        start_time = time.monotonic()
+        result = ProgramResult()
+        data = memoryview(bytes(data))
+        end = address + len(data)
+        expected_crcs = []
+        first_sector = address - address % self.sector_size
+        for sector in range(first_sector, end, self.sector_size):
+            result.blocks_total += 1
+            current = self.read(sector, self.sector_size)
+            target = bytearray(current)
+            low = max(address, sector)
+            high = min(end, sector + self.sector_size)
+            target[low - sector:high - sector] = data[low - address:high - address]
+            expected_crcs.append((sector, zlib.crc32(target)))
+            if target == current:
+                result.blocks_skipped += 1
+                continue
+            if not _only_clears_bits(current, target):
+                self.erase_sector(sector)
+                result.blocks_erased += 1
+                current = b"\xff" * self.sector_size
+            pages = []
+            for offset in range(0, self.sector_size, self.page_size):
+                page = target[offset:offset + self.page_size]
+                if page != current[offset:offset + self.page_size]:
+                    pages.append((sector + offset, bytes(page)))
+            self._program_pages(pages)
+            result.pages_written += len(pages)
+        if verify:
+            buffer = bytearray(self.sector_size)
+            for sector, expected in expected_crcs:
+                if zlib.crc32(self.read(sector, self.sector_size, out=buffer)) != expected:
+                    result.mismatched_blocks.append(sector)
+        result.duration = time.monotonic() - start_time
+        return result
+
+    def verify(self, address, data, block_size=None):
+        """
+        Porównuje zawartość pamięci z danymi za pomocą CRC32 liczonego blokami.
+        :return: Lista adresów bloków, których CRC się nie zgadza.
+        """
+        block_size = block_size or self.sector_size
+        data = memoryview(bytes(data))
+        buffer = bytearray(block_size)
+        mismatched = []
+        for offset in range(0, len(data), block_size):
+            block = data[offset:offset + block_size]
+            readback = self.read(address + offset, len(block), out=memoryview(buffer)[:len(block)])
+            if zlib.crc32(readback) != zlib.crc32(block):
+                mismatched.append(address + offset)
+        return mismatched
+
+
+class I2CEeprom:
+    def __init__(self, i2c, address=0x50, size=32768, page_size=64, address_size=2, write_timeout=0.05):
+        """
+        Programator pamięci EEPROM I2C (rodzina 24xx) działający na RPiI2C.
+        :param i2c: Zainicjalizowana instancja RPiI2C.
+        :param address: Adres urządzenia slave.
+        :param size: Rozmiar pamięci w bajtach.
+        :param page_size: Rozmiar strony zapisu w bajtach.
+        :param address_size: Rozmiar adresu pamięci w bajtach (1 lub 2).
+        :param write_timeout: Maksymalny czas cyklu zapisu strony w sekundach.
+        """
+        self.i2c = i2c
+        self.address = address
+        self.size = size
+        self.page_size = page_size
+        self.address_size = address_size
+        self.write_timeout = write_timeout
+
+    def read(self, memory_address, length):
+        return self.i2c.eeprom_read(self.address, memory_address, length, address_size=self.address_size)
+
+    def program(self, memory_address, data, verify=True):
+        """
+        Zapisuje dane, pomijając strony, których zawartość jest już zgodna z docelową.
+        :param memory_address: Adres początkowy w pamięci.
+        :param data: Dane do zapisania.
+        :param verify: Czy po zapisie porównać CRC32 odczytanych stron z oczekiwanymi.
+        :return: Obiekt ProgramResult (bloki odpowiadają stronom pamięci).
+        """
+        start_time = time.monotonic()
+        if memory_address + len(data) > self.size:
+            raise ValueError(f"Data of {len(data)} bytes at {memory_address:#x} exceeds EEPROM size {self.size}.")
+        result = ProgramResult()
+        data = memoryview(bytes(data))
+        current = self.read(memory_address, len(data))
+        pages = []
+        position = 0
+        while position < len(data):
+            address = memory_address + position
+            count = min(self.page_size - address % self.page_size, len(data) - position)
+            result.blocks_total += 1
+            if data[position:position + count] == current[position:position + count]:
+                result.blocks_skipped += 1
+            else:
+                pages.append((address, position, count))
+            position += count
+        for address, position, count in pages:
+            self.i2c.eeprom_write(self.address, address, data[position:position + count], page_size=self.page_size,
+                                  address_size=self.address_size, write_timeout=self.write_timeout)
+        result.pages_written = len(pages)
+        if verify and pages:
+            readback = memoryview(self.read(memory_address, len(data)))
+            for address, position, count in pages:
+                if zlib.crc32(readback[position:position + count]) != zlib.crc32(data[position:position + count]):
+                    result.mismatched_blocks.append(address)
+        result.duration = time.monotonic() - start_time
+        return result
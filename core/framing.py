@@ -0,0 +1,322 @@
+import binascii
+import zlib
+
+
+class CRC16:
+    def __init__(self, poly, init, reflected, xorout=0x0000, byteorder="big"):
+        """
+        Tablicowa implementacja CRC-16.
+        :param poly: Wielomian (w postaci odwróconej dla wariantów reflected, np. 0xA001).
+        :param init: Wartość początkowa rejestru.
+        :param reflected: Czy bity są przetwarzane od najmniej znaczącego.
+        :param xorout: Wartość XOR-owana z wynikiem.
+        :param byteorder: Kolejność bajtów sumy kontrolnej w ramce ('big' lub 'little').
+        """
+        self.poly = poly
+        self.init = init
+        self.reflected = reflected
+        self.xorout = xorout
+        self.byteorder = byteorder
+        self.size = 2
+        # Wielomian 0x1021 bez odbicia liczy binascii.crc_hqx w C
+        self._use_hqx = poly == 0x1021 and not reflected
+        self._table = None if self._use_hqx else self._build_table()
+
+    def _build_table(self):
+        table = []
+        for byte in range(256):
+            if self.reflected:
+                crc = byte
+                for _ in range(8):
+                    crc = (crc >> 1) ^ self.poly if crc & 1 else crc >> 1
+            else:
+                crc = byte << 8
+                for _ in range(8):
+                    crc = ((crc << 1) ^ self.poly if crc & 0x8000 else crc << 1) & 0xFFFF
+            table.append(crc)
+        return tuple(table)
+
+    def compute(self, data):
+        """
+        Oblicza sumę kontrolną.
+        :param data: bytes, bytearray lub memoryview.
+        :return: Wartość CRC (int).
+        """
+        if self._use_hqx:
+            return binascii.crc_hqx(data, self.init) ^ self.xorout
+        table = self._table
+        crc = self.init
+        if self.reflected:
+            for byte in data:
+                crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+        else:
+            for byte in data:
+                crc = ((crc << 8) & 0xFFFF) ^ table[((crc >> 8) ^ byte) & 0xFF]
+        return crc ^ self.xorout
+
+    def to_bytes(self, data):
+        """
+        Zwraca sumę kontrolną w postaci bajtów do dołączenia do ramki.
+        """
+        return self.compute(data).to_bytes(self.size, self.byteorder)
+
+
+class CRC32:
+    def __init__(self, byteorder="little"):
+        """
+        CRC-32 (IEEE 802.3), liczone tablicowo przez zlib.
+        :param byteorder: Kolejność bajtów sumy kontrolnej w ramce.
+        """
+        self.byteorder = byteorder
+        self.size = 4
+
+    def compute(self, data):
+        return zlib.crc32(data)
+
+    def to_bytes(self, data):
+        return self.compute(data).to_bytes(self.size, self.byteorder)
+
+
+CRC16_CCITT_FALSE = CRC16(0x1021, 0xFFFF, reflected=False)
+CRC16_XMODEM = CRC16(0x1021, 0x0000, reflected=False)
+CRC16_MODBUS = CRC16(0xA001, 0xFFFF, reflected=True, byteorder="little")
+CRC32_IEEE = CRC32()
+
+
+class FrameCodec:
+    def __init__(self, crc=None, max_frame_size=65536):
+        """
+        Bazowa klasa przyrostowych koderów/dekoderów ramek.
+        :param crc: (Opcjonalny) obiekt CRC16/CRC32 - suma kontrolna dołączana na końcu ramki.
+        :param max_frame_size: Maksymalny rozmiar ramki; dłuższe dane są odrzucane.
+        """
+        self.crc = crc
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+        self.frames_decoded = 0
+        self.errors = 0
+
+    def reset(self):
+        """
+        Czyści bufor niepełnej ramki.
+        """
+        self._buffer.clear()
+
+    def feed(self, data):
+        """
+        Przetwarza kolejny fragment strumienia.
+        :param data: bytes, bytearray lub memoryview.
+        :return: Lista kompletnych ramek (bytes), które pojawiły się w tym fragmencie.
+        """
+        raise NotImplementedError
+
+    def decode(self, chunks):
+        """
+        Generator ramek z iterowalnego źródła fragmentów strumienia.
+        """
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+    def encode(self, payload):
+        """
+        Koduje pojedynczą ramkę do wysłania.
+        """
+        raise NotImplementedError
+
+    def _append_crc(self, payload):
+        if self.crc is None:
+            return payload
+        return bytes(payload) + self.crc.to_bytes(payload)
+
+    def _accept(self, frame, frames):
+        """
+        Sprawdza sumę kontrolną i dodaje poprawną ramkę do listy wynikowej.
+        """
+        if self.crc is not None:
+            size = self.crc.size
+            if len(frame) < size:
+                self.errors += 1
+                return
+            payload = frame[:-size]
+            if self.crc.to_bytes(payload) != frame[-size:]:
+                self.errors += 1
+                return
+            frame = payload
+        self.frames_decoded += 1
+        frames.append(bytes(frame))
+
+    def _check_overflow(self):
+        if len(self._buffer) > self.max_frame_size:
+            self._buffer.clear()
+            self.errors += 1
+
+
+class SLIPCodec(FrameCodec):
+    END = b"\xc0"
+    ESC = b"\xdb"
+    ESC_END = b"\xdb\xdc"
+    ESC_ESC = b"\xdb\xdd"
+
+    def feed(self, data):
+        buffer = self._buffer
+        # Pozostałość z poprzedniego wywołania nie zawiera znacznika END
+        scan = len(buffer)
+        buffer += data
+        frames = []
+        start = 0
+        end = buffer.find(self.END, scan)
+        while end >= 0:
+            if end > start:
+                if buffer.find(self.ESC, start, end) < 0:
+                    self._accept(buffer[start:end], frames)
+                else:
+                    self._unescape(bytes(buffer[start:end]), frames)
+            start = end + 1
+            end = buffer.find(self.END, start)
+        if start:
+            del buffer[:start]
+        self._check_overflow()
+        return frames
+
+    def _unescape(self, frame, frames):
+        escapes = frame.count(self.ESC)
+        if escapes != frame.count(self.ESC_END) + frame.count(self.ESC_ESC):
+            self.errors += 1
+            return
+        self._accept(frame.replace(self.ESC_END, self.END).replace(self.ESC_ESC, self.ESC), frames)
+
+    def encode(self, payload):
+        payload = self._append_crc(payload)
+        escaped = bytes(payload).replace(self.ESC, self.ESC_ESC).replace(self.END, self.ESC_END)
+        return self.END + escaped + self.END
+
+
+class COBSCodec(FrameCodec):
+    DELIMITER = b"\x00"
+
+    def feed(self, data):
+        buffer = self._buffer
+        scan = len(buffer)
+        buffer += data
+        frames = []
+        start = 0
+        end = buffer.find(self.DELIMITER, scan)
+        while end >= 0:
+            if end > start:
+                decoded = self._decode_block(buffer, start, end)
+                if decoded is None:
+                    self.errors += 1
+                else:
+                    self._accept(decoded, frames)
+            start = end + 1
+            end = buffer.find(self.DELIMITER, start)
+        if start:
+            del buffer[:start]
+        self._check_overflow()
+        return frames
+
+    @staticmethod
+    def _decode_block(buffer, start, end):
+        """
+        Dekoduje pojedynczą ramkę COBS (bez ogranicznika); pętla przebiega po blokach, nie po bajtach.
+        """
+        out = bytearray()
+        position = start
+        while position < end:
+            code = buffer[position]
+            block_end = position + code
+            if block_end > end:
+                return None
+            out += buffer[position + 1:block_end]
+            position = block_end
+            if code < 0xFF and position < end:
+                out.append(0)
+        return out
+
+    def encode(self, payload):
+        payload = self._append_crc(payload)
+        out = bytearray()
+        for part in bytes(payload).split(self.DELIMITER):
+            while len(part) >= 254:
+                out.append(0xFF)
+                out += part[:254]
+                part = part[254:]
+            out.append(len(part) + 1)
+            out += part
+        out += self.DELIMITER
+        return bytes(out)
+
+
+class LengthPrefixedCodec(FrameCodec):
+    def __init__(self, length_size=2, byteorder="little", sync=b"", crc=None, max_frame_size=65536):
+        """
+        Ramki w formacie: [sync] | długość | dane | [CRC z długości i danych].
+        :param length_size: Rozmiar pola długości w bajtach (1, 2 lub 4).
+        :param byteorder: Kolejność bajtów pola długości.
+        :param sync: (Opcjonalny) znacznik początku ramki używany do resynchronizacji.
+        :param crc: (Opcjonalny) obiekt CRC16/CRC32.
+        :param max_frame_size: Maksymalna długość danych w ramce.
+        """
+        super().__init__(crc=crc, max_frame_size=max_frame_size)
+        self.length_size = length_size
+        self.byteorder = byteorder
+        self.sync = bytes(sync)
+        self._pending = 0
+
+    def feed(self, data):
+        buffer = self._buffer
+        buffer += data
+        # Niepełna ramka z poprzedniego wywołania - nie ma czego jeszcze dekodować
+        if len(buffer) < self._pending:
+            return []
+        frames = []
+        header = len(self.sync) + self.length_size
+        crc_size = self.crc.size if self.crc else 0
+        position = 0
+        available = len(buffer)
+        self._pending = 0
+        with memoryview(buffer) as view:
+            while True:
+                if self.sync:
+                    position = buffer.find(self.sync, position)
+                    if position < 0:
+                        # Zachowaj ewentualny początek znacznika na końcu bufora
+                        position = max(available - len(self.sync) + 1, 0)
+                        break
+                if available - position < header:
+                    break
+                length_start = position + len(self.sync)
+                length = int.from_bytes(view[length_start:length_start + self.length_size], self.byteorder)
+                if length > self.max_frame_size:
+                    self.errors += 1
+                    position += 1
+                    continue
+                frame_end = position + header + length + crc_size
+                if frame_end > available:
+                    self._pending = frame_end - position
+                    break
+                if crc_size:
+                    checksum = self.crc.to_bytes(view[length_start:frame_end - crc_size])
+                    if checksum != view[frame_end - crc_size:frame_end]:
+                        self.errors += 1
+                        position += 1
+                        continue
+                self.frames_decoded += 1
+                frames.append(bytes(view[position + header:frame_end - crc_size]))
+                position = frame_end
+        if position:
+            del buffer[:position]
+        return frames
+
+    def reset(self):
+        super().reset()
+        self._pending = 0
+
+    def encode(self, payload):
+        if len(payload) > self.max_frame_size or len(payload) >> (8 * self.length_size):
+            raise ValueError(f"Payload of {len(payload)} bytes does not fit in a {self.length_size}-byte length frame "
+                             f"(max_frame_size={self.max_frame_size}).")
+        body = len(payload).to_bytes(self.length_size, self.byteorder) + bytes(payload)
+        if self.crc:
+            body += self.crc.to_bytes(body)
+        return self.sync + body
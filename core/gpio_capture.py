@@ -0,0 +1,90 @@
+import time
+from array import array
+import numpy as np
+import RPi.GPIO as GPIO
+
+_EDGES = {
+    "rising": GPIO.RISING,
+    "falling": GPIO.FALLING,
+    "both": GPIO.BOTH,
+}
+
+
+class EdgeCapture:
+    def __init__(self, pin, edge="both", capacity=4096, bouncetime=None):
+        """
+        Rejestruje zbocza na pinie GPIO ze znacznikami czasu perf_counter_ns.
+        Znaczniki trafiają do prealokowanego bufora pierścieniowego array('q'); przy przepełnieniu
+        nadpisywane są najstarsze zbocza.
+        :param pin: Numer pinu GPIO (BCM), skonfigurowanego jako wejście.
+        :param edge: Rejestrowane zbocza: 'rising', 'falling' lub 'both'.
+        :param capacity: Pojemność bufora (liczba zboczy).
+        :param bouncetime: (Opcjonalny) czas eliminacji drgań styków w ms.
+        """
+        if edge not in _EDGES:
+            raise ValueError(f"Invalid edge: {edge}. Use 'rising', 'falling' or 'both'.")
+        self.pin = pin
+        self.edge = edge
+        self.capacity = capacity
+        self.bouncetime = bouncetime
+        self.timestamps = array("q", bytes(8 * capacity))
+        self.levels = array("b", bytes(capacity))
+        self.count = 0  # Liczba wszystkich zarejestrowanych zboczy (także nadpisanych)
+        self._index = 0
+        self.running = False
+
+    def start(self):
+        """
+        Włącza detekcję zboczy.
+        """
+        kwargs = {"callback": self._on_edge}
+        if self.bouncetime:
+            kwargs["bouncetime"] = self.bouncetime
+        GPIO.add_event_detect(self.pin, _EDGES[self.edge], **kwargs)
+        self.running = True
+        return self
+
+    def stop(self):
+        """
+        Wyłącza detekcję zboczy (zarejestrowane dane pozostają dostępne).
+        """
+        if self.running:
+            GPIO.remove_event_detect(self.pin)
+            self.running = False
+
+    def clear(self):
+        """
+        Usuwa zarejestrowane zbocza.
+        """
+        self.count = 0
+        self._index = 0
+
+    def _on_edge(self, channel):
+        timestamp = time.perf_counter_ns()
+        index = self._index
+        self.timestamps[index] = timestamp
+        if self.edge == "both":
+            self.levels[index] = GPIO.input(channel)
+        else:
+            self.levels[index] = self.edge == "rising"
+        self._index = index + 1 if index + 1 < self.capacity else 0
+        self.count += 1
+
+    @property
+    def overflowed(self):
+        """
+        Czy część zboczy została nadpisana z powodu zbyt małej pojemności bufora.
+        """
+        return self.count > self.capacity
+
+    def edges(self):
+        """
+        Zwraca zarejestrowane zbocza w kolejności chronologicznej.
+        :return: Krotka (znaczniki czasu [ns] jako np.int64, poziomy po zboczu jako np.int8).
+        """
+        timestamps = np.frombuffer(self.timestamps, dtype=np.int64)
+        levels = np.frombuffer(self.levels, dtype=np.int8)
+        count, index = self.count, self._index
+        if count <= self.capacity:
+            return timestamps[:count].copy(), levels[:count].copy()
+        return np.concatenate((timestamps[index:], timestamps[:index])), np.concatenate((levels[index:], levels[:index]))
@@ -0,0 +1,263 @@
+import fcntl
+import mmap
+import os
+import struct
+import time
+from array import array
+
+GPIOMEM_PATH = "/dev/gpiomem"
+GPIOCHIP_PATH = "/dev/gpiochip0"
+
+# Rejestry GPIO BCM283x/BCM2711 (indeksy słów 32-bitowych od początku /dev/gpiomem)
+_GPIOMEM_SIZE = 4096
+_GPFSEL0 = 0
+_GPSET0 = 7
+_GPCLR0 = 10
+_GPLEV0 = 13
+
+# Interfejs znakowy GPIO (linux/gpio.h, ABI v1): struct gpiohandle_request i gpiohandle_data
+_GPIOHANDLES_MAX = 64
+_HANDLE_REQUEST = struct.Struct(f"{_GPIOHANDLES_MAX}II{_GPIOHANDLES_MAX}B32sIi")
+_GPIOHANDLE_REQUEST_INPUT = 1 << 0
+_GPIOHANDLE_REQUEST_OUTPUT = 1 << 1
+
+
+def _iowr(number, size):
+    return (3 << 30) | (size << 16) | (0xB4 << 8) | number
+
+
+_GPIO_GET_LINEHANDLE_IOCTL = _iowr(0x03, _HANDLE_REQUEST.size)
+_GPIOHANDLE_GET_LINE_VALUES_IOCTL = _iowr(0x08, _GPIOHANDLES_MAX)
+_GPIOHANDLE_SET_LINE_VALUES_IOCTL = _iowr(0x09, _GPIOHANDLES_MAX)
+
+
+def _check_bank0(pins):
+    for pin in pins:
+        if not 0 <= pin < 32:
+            raise ValueError(f"Invalid port pin: {pin}. Only GPIO 0-31 (bank 0) are supported.")
+
+
+class GpioMemBackend:
+    def __init__(self, path=GPIOMEM_PATH):
+        """
+        Bezpośredni dostęp do rejestrów GPIO przez mmap /dev/gpiomem.
+        Zapis maski do GPSET0/GPCLR0 zmienia wszystkie wskazane piny jednym zapisem słowa.
+        Ścieżka może wskazywać zwykły plik (min. 4 KB) - pozwala to testować port bez Raspberry Pi.
+        :param path: Ścieżka do urządzenia (lub pliku udającego rejestry).
+        """
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_SYNC)
+        try:
+            self._map = mmap.mmap(fd, _GPIOMEM_SIZE, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+        self._registers = memoryview(self._map).cast("I")
+
+    def configure(self, outputs, inputs, initial=0):
+        """
+        Ustawia kierunek pinów w rejestrach GPFSEL (001 - wyjście, 000 - wejście).
+        """
+        self.write(initial & self._mask(outputs), ~initial & self._mask(outputs))
+        for pin, function in [(pin, 0b001) for pin in outputs] + [(pin, 0b000) for pin in inputs]:
+            index, shift = _GPFSEL0 + pin // 10, (pin % 10) * 3
+            self._registers[index] = (self._registers[index] & ~(0b111 << shift)) | (function << shift)
+
+    @staticmethod
+    def _mask(pins):
+        mask = 0
+        for pin in pins:
+            mask |= 1 << pin
+        return mask
+
+    def write(self, set_mask, clear_mask):
+        if set_mask:
+            self._registers[_GPSET0] = set_mask
+        if clear_mask:
+            self._registers[_GPCLR0] = clear_mask & 0xFFFFFFFF
+
+    def read(self):
+        return self._registers[_GPLEV0]
+
+    def close(self):
+        self._registers.release()
+        self._map.close()
+
+
+class GpioChardevBackend:
+    def __init__(self, path=GPIOCHIP_PATH, consumer="PY_MICRO_HIL"):
+        """
+        Dostęp do linii GPIO przez interfejs znakowy jądra (/dev/gpiochipN, żądania uchwytów linii).
+        Wszystkie linie jednego uchwytu są ustawiane/odczytywane jednym wywołaniem ioctl.
+        :param path: Ścieżka do urządzenia gpiochip.
+        :param consumer: Etykieta widoczna w gpioinfo.
+        """
+        self.path = path
+        self.consumer = consumer
+        self._outputs = []
+        self._inputs = []
+        self._output_fd = None
+        self._input_fd = None
+        self._state = 0  # Ostatnio zapisane poziomy wyjść (maska BCM)
+        self._values = bytearray(_GPIOHANDLES_MAX)
+
+    def _request(self, pins, flags, initial):
+        defaults = [(initial >> pin) & 1 for pin in pins] + [0] * (_GPIOHANDLES_MAX - len(pins))
+        request = bytearray(_HANDLE_REQUEST.pack(
+            *(list(pins) + [0] * (_GPIOHANDLES_MAX - len(pins))), flags, *defaults,
+            self.consumer.encode()[:31], len(pins), -1))
+        chip = os.open(self.path, os.O_RDWR)
+        try:
+            fcntl.ioctl(chip, _GPIO_GET_LINEHANDLE_IOCTL, request)
+        finally:
+            os.close(chip)
+        return _HANDLE_REQUEST.unpack(request)[-1]
+
+    def configure(self, outputs, inputs, initial=0):
+        """
+        Zgłasza żądania linii wyjściowych i wejściowych.
+        """
+        self._outputs = list(outputs)
+        self._inputs = list(inputs)
+        self._state = initial
+        if self._outputs:
+            self._output_fd = self._request(self._outputs, _GPIOHANDLE_REQUEST_OUTPUT, initial)
+        if self._inputs:
+            self._input_fd = self._request(self._inputs, _GPIOHANDLE_REQUEST_INPUT, 0)
+
+    def write(self, set_mask, clear_mask):
+        self._state = (self._state | set_mask) & ~clear_mask
+        values = self._values
+        for index, pin in enumerate(self._outputs):
+            values[index] = (self._state >> pin) & 1
+        fcntl.ioctl(self._output_fd, _GPIOHANDLE_SET_LINE_VALUES_IOCTL, values)
+
+    def read(self):
+        levels = self._state
+        if self._input_fd is not None:
+            values = bytearray(_GPIOHANDLES_MAX)
+            fcntl.ioctl(self._input_fd, _GPIOHANDLE_GET_LINE_VALUES_IOCTL, values)
+            for index, pin in enumerate(self._inputs):
+                levels = levels | (1 << pin) if values[index] else levels & ~(1 << pin)
+        return levels
+
+    def close(self):
+        for fd in (self._output_fd, self._input_fd):
+            if fd is not None:
+                os.close(fd)
+        self._output_fd = self._input_fd = None
+
+
+class GPIOPort:
+    def __init__(self, pins, backend):
+        """
+        Port złożony z wielu pinów: bit i wartości logicznej odpowiada pins[i].
+        Translacja wartości logicznych na maski rejestrów odbywa się przez tablice bajtowe,
+        a każda operacja to pojedynczy zapis/odczyt w backendzie.
+        :param pins: Lista pinów GPIO (BCM 0-31).
+        :param backend: Obiekt GpioMemBackend lub GpioChardevBackend.
+        """
+        _check_bank0(pins)
+        self.pins = list(pins)
+        self.backend = backend
+        self.width = len(self.pins)
+        self.all_mask = 0
+        for pin in self.pins:
+            self.all_mask |= 1 << pin
+        # Tablice: bajt wartości logicznej -> maska fizyczna, bajt poziomów fizycznych -> bity logiczne
+        self._to_physical_tables = [
+            [self._physical_of_byte(byte_index, value) for value in range(256)]
+            for byte_index in range((self.width + 7) // 8)
+        ]
+        self._to_logical_tables = [
+            [self._logical_of_byte(byte_index, value) for value in range(256)]
+            for byte_index in range(4)
+        ]
+
+    def _physical_of_byte(self, byte_index, value):
+        mask = 0
+        for bit in range(8):
+            logical = byte_index * 8 + bit
+            if value >> bit & 1 and logical < self.width:
+                mask |= 1 << self.pins[logical]
+        return mask
+
+    def _logical_of_byte(self, byte_index, value):
+        logical = 0
+        for index, pin in enumerate(self.pins):
+            if pin // 8 == byte_index and value >> (pin % 8) & 1:
+                logical |= 1 << index
+        return logical
+
+    def to_physical(self, value):
+        mask = 0
+        for byte_index, table in enumerate(self._to_physical_tables):
+            mask |= table[(value >> (8 * byte_index)) & 0xFF]
+        return mask
+
+    def to_logical(self, levels):
+        tables = self._to_logical_tables
+        return (tables[0][levels & 0xFF] | tables[1][(levels >> 8) & 0xFF]
+                | tables[2][(levels >> 16) & 0xFF] | tables[3][(levels >> 24) & 0xFF])
+
+    def write(self, value):
+        """
+        Ustawia wszystkie piny portu zgodnie z bitami wartości.
+        """
+        physical = self.to_physical(value)
+        self.backend.write(physical, self.all_mask & ~physical)
+
+    def set(self, mask):
+        """
+        Ustawia w stan wysoki piny wskazane maską logiczną (pozostałe bez zmian).
+        """
+        self.backend.write(self.to_physical(mask), 0)
+
+    def clear(self, mask):
+        """
+        Ustawia w stan niski piny wskazane maską logiczną (pozostałe bez zmian).
+        """
+        self.backend.write(0, self.to_physical(mask))
+
+    def read(self):
+        """
+        Odczytuje poziomy wszystkich pinów portu jedną operacją.
+        :return: Wartość logiczna (bit i - pins[i]).
+        """
+        return self.to_logical(self.backend.read())
+
+    def compile(self, pattern):
+        """
+        Przelicza sekwencję wartości logicznych na pary masek (set, clear) do odtwarzania.
+        """
+        steps = []
+        for value in pattern:
+            physical = self.to_physical(value)
+            steps.append((physical, self.all_mask & ~physical))
+        return steps
+
+    def play(self, pattern, interval, repeat=1):
+        """
+        Odtwarza sekwencję wartości na porcie ze stałym odstępem czasu (aktywne oczekiwanie na perf_counter_ns).
+        :param pattern: Sekwencja wartości logicznych lub wynik compile().
+        :param interval: Odstęp między krokami w sekundach.
+        :param repeat: Liczba powtórzeń sekwencji.
+        :return: array('q') z rzeczywistymi czasami wykonania kroków [ns] względem startu.
+        """
+        steps = pattern if pattern and isinstance(pattern[0], tuple) else self.compile(pattern)
+        write = self.backend.write
+        period = int(interval * 1e9)
+        timestamps = array("q", bytes(8 * len(steps) * repeat))
+        index = 0
+        start = next_time = time.perf_counter_ns()
+        for _ in range(repeat):
+            for set_mask, clear_mask in steps:
+                while time.perf_counter_ns() < next_time:
+                    pass
+                write(set_mask, clear_mask)
+                timestamps[index] = time.perf_counter_ns() - start
+                index += 1
+                next_time += period
+        return timestamps
+
+    def close(self):
+        self.backend.close()
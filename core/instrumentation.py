@@ -0,0 +1,71 @@
+import functools
+
+# Metody urządzeń obejmowane instrumentacją (nagrywanie, odtwarzanie, profilowanie), według nazwy klasy.
+# Dla podklas (np. RPiADC -> RPiSPI) używana jest pierwsza klasa z MRO obecna w słowniku.
+INSTRUMENTED_METHODS = {
+    "ModbusTRU": ["read_holding_registers", "write_single_register", "write_multiple_registers"],
+    "RPiUART": ["write", "read", "write_frame"],
+    "RPiI2C": ["read", "write", "write_read", "read_bulk", "write_bulk", "eeprom_read", "eeprom_write", "scan",
+               "write_byte", "read_byte", "read_word", "write_word"],
+    "RPiSPI": ["transfer", "write", "read", "write_then_read"],
+    "RPiADC": ["read_channel", "read_voltage"],
+    "RPiGPIO": ["read", "write"],
+    "RPiGPIOPort": ["read", "write", "set", "clear"],
+    "RPiPWM": ["set_duty_cycle", "set_frequency"],
+}
+
+
+def instrumented_methods(device):
+    """
+    Zwraca listę nazw metod urządzenia objętych instrumentacją.
+    """
+    for cls in type(device).__mro__:
+        if cls.__name__ in INSTRUMENTED_METHODS:
+            return [name for name in INSTRUMENTED_METHODS[cls.__name__] if callable(getattr(device, name, None))]
+    return []
+
+
+def device_keys(devices):
+    """
+    Nadaje urządzeniom stabilne klucze: nazwa klasy i numer kolejny wśród urządzeń tej klasy.
+    :param devices: Słownik {"protocols": [...], "peripherals": [...]}.
+    :return: Lista krotek (grupa, klucz, urządzenie).
+    """
+    counters = {}
+    keys = []
+    for group, group_devices in devices.items():
+        for device in group_devices:
+            name = type(device).__name__
+            index = counters.get(name, 0)
+            counters[name] = index + 1
+            keys.append((group, f"{name}#{index}", device))
+    return keys
+
+
+def wrap_methods(device, wrapper_factory, methods=None):
+    """
+    Podmienia metody instancji na opakowania (klasa urządzenia pozostaje bez zmian).
+    :param device: Instancja urządzenia.
+    :param wrapper_factory: Funkcja wrapper_factory(nazwa, oryginalna_metoda) zwracająca opakowanie.
+    :param methods: (Opcjonalna) lista nazw metod; domyślnie instrumented_methods(device).
+    :return: Słownik {nazwa: oryginalna metoda} do przywrócenia przez unwrap_methods().
+    """
+    originals = {}
+    for name in methods if methods is not None else instrumented_methods(device):
+        original = getattr(device, name)
+        wrapper = functools.wraps(original)(wrapper_factory(name, original))
+        originals[name] = original
+        setattr(device, name, wrapper)
+    return originals
+
+
+def unwrap_methods(device, originals):
+    """
+    Przywraca metody podmienione przez wrap_methods() (przy zagnieżdżeniu - w odwrotnej kolejności opakowania).
+    """
+    for name, original in originals.items():
+        if getattr(original, "__func__", None) is getattr(type(device), name, None):
+            # Oryginał był zwykłą metodą klasy - wystarczy usunąć atrybut instancji
+            vars(device).pop(name, None)
+        else:
+            setattr(device, name, original)
@@ -0,0 +1,321 @@
+import marshal
+import multiprocessing
+import signal
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from core.fixtures import FixtureManager
+from core.peripheral_manager import PeripheralManager
+
+# Nagłówek bufora: pozycja zapisu i odczytu (liczniki bajtów rosnące monotonicznie)
+_RING_HEADER = struct.Struct("<QQ")
+_LENGTH = struct.Struct("<I")
+_MARSHAL_VERSION = 4
+# Maksymalna długość szczegółów wyniku przesyłanych przez bufor (dłuższe są obcinane)
+MAX_DETAILS = 4096
+
+
+class SharedRing:
+    def __init__(self, size=1 << 20, context=None):
+        """
+        Bufor pierścieniowy w pamięci współdzielonej dla jednego producenta (proces roboczy)
+        i jednego konsumenta (proces nadrzędny). Rekordy: długość (4 bajty) + dane marshal.
+        Semafor liczy gotowe rekordy - jego operacje zapewniają też kolejność zapisu i odczytu pamięci.
+        :param size: Rozmiar obszaru danych [B].
+        :param context: Kontekst multiprocessing (dla semafora).
+        """
+        context = context or multiprocessing.get_context("fork")
+        self.size = size
+        self._memory = shared_memory.SharedMemory(create=True, size=_RING_HEADER.size + size)
+        self._buffer = self._memory.buf
+        self._data = self._buffer[_RING_HEADER.size:]
+        _RING_HEADER.pack_into(self._buffer, 0, 0, 0)
+        self._records = context.Semaphore(0)
+
+    def _positions(self):
+        return _RING_HEADER.unpack_from(self._buffer, 0)
+
+    def _copy_in(self, position, data):
+        offset = position % self.size
+        first = min(len(data), self.size - offset)
+        self._data[offset:offset + first] = data[:first]
+        self._data[:len(data) - first] = data[first:]
+
+    def _copy_out(self, position, length):
+        offset = position % self.size
+        first = min(length, self.size - offset)
+        return bytes(self._data[offset:offset + first]) + bytes(self._data[:length - first])
+
+    def write(self, record):
+        """
+        Zapisuje rekord (producent); czeka, jeśli w buforze brakuje miejsca.
+        """
+        payload = marshal.dumps(record, _MARSHAL_VERSION)
+        data = _LENGTH.pack(len(payload)) + payload
+        if len(data) > self.size:
+            raise ValueError(f"Record of {len(data)} bytes does not fit in a {self.size} byte ring.")
+        write_position, read_position = self._positions()
+        while self.size - (write_position - read_position) < len(data):
+            time.sleep(0.001)
+            read_position = self._positions()[1]
+        self._copy_in(write_position, data)
+        struct.pack_into("<Q", self._buffer, 0, write_position + len(data))
+        self._records.release()
+
+    def read(self, timeout=None):
+        """
+        Odczytuje kolejny rekord (konsument).
+        :return: Rekord lub None po upływie timeout.
+        """
+        if not self._records.acquire(timeout=timeout):
+            return None
+        read_position = self._positions()[1]
+        length = _LENGTH.unpack(self._copy_out(read_position, _LENGTH.size))[0]
+        record = marshal.loads(self._copy_out(read_position + _LENGTH.size, length))
+        struct.pack_into("<Q", self._buffer, 8, read_position + _LENGTH.size + length)
+        return record
+
+    def close(self, unlink=False):
+        self._data.release()
+        self._buffer = None
+        self._memory.close()
+        if unlink:
+            self._memory.unlink()
+
+
+def _text(value):
+    return None if value is None else str(value)[:MAX_DETAILS]
+
+
+class _RingLogger:
+    def __init__(self, ring):
+        """
+        Logger procesu roboczego - komunikaty trafiają do bufora i są logowane przez proces nadrzędny.
+        """
+        self._ring = ring
+        self.log_file = None
+
+    def log(self, message, to_console=True, to_log_file=False):
+        self._ring.write(("log", str(message), to_console, to_log_file))
+
+    def flush_log(self):
+        pass
+
+
+class _WorkerFramework:
+    def __init__(self, peripheral_manager, logger, ring, slot=None, aggregate_results=True):
+        """
+        Zastępca TestFramework w procesie roboczym: wyniki i komunikaty testów są przekazywane przez bufor,
+        a zliczane i logowane przez TestFramework procesu nadrzędnego.
+        """
+        self.peripheral_manager = peripheral_manager
+        self.logger = logger
+        self.slot = slot
+        self.aggregate_results = aggregate_results
+        self.fixtures = FixtureManager()  # Fikstury sesji żyją tak długo jak proces roboczy
+        self._ring = ring
+
+    def report_test_result(self, group_name, test_name, passed, details=None, assertions=None, failed_assertions=None):
+        self._ring.write(("result", group_name, test_name, bool(passed), _text(details), assertions,
+                          failed_assertions))
+
+    def report_test_info(self, group_name, test_name, message):
+        self._ring.write(("info", group_name, test_name, _text(message)))
+
+
+def _worker_main(ring, commands, groups, devices, slot, aggregate_results):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C obsługuje proces nadrzędny
+    logger = _RingLogger(ring)
+    manager = PeripheralManager(devices, logger)
+    framework = _WorkerFramework(manager, logger, ring, slot, aggregate_results)
+    manager.initialize_all()
+    while True:
+        command = commands.recv_bytes()
+        if command == b"stop":
+            break
+        index = int(command)
+        start = time.perf_counter()
+        try:
+            groups[index].run_tests(framework)
+        except Exception as e:
+            framework.report_test_result(groups[index].name, "Isolation", False, f"Unhandled exception: {str(e)}")
+        ring.write(("done", index, time.perf_counter() - start))
+    framework.fixtures.finish("session", framework, "Session")
+    manager.release_all()
+    ring.write(("stopped",))
+
+
+def group_devices(group, devices):
+    """
+    Urządzenia potrzebne grupie: klasy urządzeń wymienione w group.requires. Pozostałe wpisy requires
+    (znaczniki możliwości stanowiska, np. "can") są pomijane; jeśli żaden wpis nie jest nazwą klasy
+    urządzenia (lub requires jest puste) - wszystkie urządzenia.
+    :return: Słownik {"protocols": [...], "peripherals": [...]}.
+    """
+    selected = {name: [device for device in group_devices if type(device).__name__ in group.requires]
+                for name, group_devices in devices.items()}
+    if not any(selected.values()):
+        return devices
+    return selected
+
+
+class _WorkerProcess:
+    def __init__(self, context, groups, devices, device_ids, ring_size, slot, aggregate_results):
+        self.device_ids = device_ids
+        self.ring = SharedRing(ring_size, context)
+        child_commands, self._commands = context.Pipe(duplex=False)
+        self.process = context.Process(target=_worker_main, name="IsolatedGroupWorker", daemon=True,
+                                       args=(self.ring, child_commands, groups, devices, slot, aggregate_results))
+        self.process.start()
+        child_commands.close()
+        self.last_used = time.monotonic()
+
+    def send(self, command):
+        self._commands.send_bytes(command)
+
+
+class IsolatedRunner:
+    def __init__(self, framework, max_workers=2, group_timeout=None, ring_size=1 << 20):
+        """
+        Uruchamia każdą grupę testów w procesie roboczym (fork - bez nowego interpretera) z pulą procesów
+        utrzymujących zainicjalizowane urządzenia. Proces dostaje tylko urządzenia wymagane przez grupę
+        (group.requires); wyniki wracają przez bufor w pamięci współdzielonej. Awaria procesu (np. segfault
+        w rozszerzeniu C) oznacza grupę jako nieudaną, a wykonanie jest kontynuowane.
+        :param framework: Instancja TestFramework procesu nadrzędnego (zliczanie, logi, słuchacze wyników).
+        :param max_workers: Maksymalna liczba utrzymywanych procesów roboczych.
+        :param group_timeout: (Opcjonalny) limit czasu grupy [s]; po przekroczeniu proces jest zabijany.
+        :param ring_size: Rozmiar bufora wyników każdego procesu [B].
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self.framework = framework
+        self.max_workers = max_workers
+        self.group_timeout = group_timeout
+        self.ring_size = ring_size
+        self.workers = []
+        self._context = multiprocessing.get_context("fork")
+        self._devices = [(name, device) for name, devices in framework.peripheral_manager.devices.items()
+                         for device in devices]
+
+    def _device_ids(self, devices):
+        selected = {id(device) for group_devices in devices.values() for device in group_devices}
+        return frozenset(index for index, (_, device) in enumerate(self._devices) if id(device) in selected)
+
+    def _worker_for(self, group):
+        """
+        Zwraca proces z zestawem urządzeń grupy; procesy korzystające z tych samych urządzeń są wcześniej zatrzymywane.
+        """
+        devices = group_devices(group, self.framework.peripheral_manager.devices)
+        device_ids = self._device_ids(devices)
+        for worker in self.workers:
+            if worker.device_ids == device_ids and worker.process.is_alive():
+                return worker
+        for worker in [worker for worker in self.workers if worker.device_ids & device_ids]:
+            self._stop(worker)
+        while len(self.workers) >= self.max_workers:
+            self._stop(min(self.workers, key=lambda worker: worker.last_used))
+        worker = _WorkerProcess(self._context, self.framework.test_groups, devices, device_ids, self.ring_size,
+                                self.framework.slot, self.framework.aggregate_results)
+        self.workers.append(worker)
+        return worker
+
+    def _handle(self, record):
+        """
+        Przekazuje rekord procesu roboczego do TestFramework/loggera; zwraca rekord 'done'/'stopped'.
+        """
+        kind = record[0]
+        if kind == "result":
+            self.framework.report_test_result(*record[1:])
+        elif kind == "info":
+            self.framework.report_test_info(*record[1:])
+        elif kind == "log":
+            _, message, to_console, to_log_file = record
+            self.framework.logger.log(message, to_console=to_console, to_log_file=to_log_file)
+        else:
+            return record
+        return None
+
+    def _drain(self, worker):
+        while True:
+            record = worker.ring.read(timeout=0)
+            if record is None:
+                return
+            self._handle(record)
+
+    def _exit_description(self, process):
+        code = process.exitcode
+        if code is not None and code < 0:
+            return f"killed by signal {signal.Signals(-code).name}"
+        return f"exit code {code}"
+
+    def _remove(self, worker):
+        self.workers.remove(worker)
+        worker.ring.close(unlink=True)
+
+    def _stop(self, worker):
+        if worker.process.is_alive():
+            worker.send(b"stop")
+            while worker.process.is_alive():
+                record = worker.ring.read(timeout=0.1)
+                if record is not None and self._handle(record) == ("stopped",):
+                    break
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+        self._drain(worker)
+        self._remove(worker)
+
+    def run_group(self, index):
+        """
+        Wykonuje grupę o podanym indeksie w procesie roboczym i czeka na jej zakończenie.
+        :return: Czas wykonania [s] lub None, jeśli proces uległ awarii lub przekroczył limit czasu.
+        """
+        group = self.framework.test_groups[index]
+        worker = self._worker_for(group)
+        worker.last_used = time.monotonic()
+        worker.send(str(index).encode())
+        deadline = None if self.group_timeout is None else time.monotonic() + self.group_timeout
+        while True:
+            record = worker.ring.read(timeout=0.1)
+            if record is not None:
+                record = self._handle(record)
+                if record is not None and record[0] == "done":
+                    return record[2]
+                continue
+            if not worker.process.is_alive():
+                worker.process.join()
+                self._drain(worker)
+                reason = f"Worker process crashed ({self._exit_description(worker.process)})"
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                worker.process.kill()
+                worker.process.join()
+                self._drain(worker)
+                reason = f"Group timed out after {self.group_timeout} s, worker process killed"
+                break
+        self._remove(worker)
+        self.framework.report_test_result(group.name, "Isolation", False, reason)
+        return None
+
+    def run(self):
+        """
+        Wykonuje wszystkie grupy frameworka w izolacji, zatrzymuje procesy i drukuje podsumowanie.
+        Kończy program sys.exit(1), jeśli któryś test nie przeszedł.
+        """
+        framework = self.framework
+        framework.logger.log("\n=================== ISOLATED TEST EXECUTION ===================\n", to_console=True)
+        if framework.logger.log_file:
+            framework.logger.log("\n=================== ISOLATED TEST EXECUTION ===================\n",
+                                 to_console=False, to_log_file=True)
+        try:
+            for index in range(len(framework.test_groups)):
+                self.run_group(index)
+        finally:
+            framework.logger.log("\n==================== RESOURCE CLEANUP ====================", to_console=True)
+            for worker in list(self.workers):
+                self._stop(worker)
+        framework.print_summary()
+        if framework.fail_count != 0:
+            sys.exit(1)
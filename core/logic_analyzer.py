@@ -0,0 +1,244 @@
+import multiprocessing
+import threading
+import time
+from array import array
+import numpy as np
+import RPi.GPIO as GPIO
+
+# Przy dłuższym czasie do następnej próbki wątek zasypia zamiast aktywnie czekać
+_SLEEP_THRESHOLD_NS = 200000
+
+
+class Trigger:
+    def __init__(self, levels):
+        """
+        Warunek wyzwolenia: zestaw pinów i oczekiwanych poziomów, np. {17: 1, 18: 0}.
+        :param levels: Słownik {pin: poziom}.
+        """
+        self.levels = dict(levels)
+
+    def compile(self, pins):
+        """
+        Zamienia warunek na parę (maska, wartość) w układzie bitów próbki.
+        """
+        mask = value = 0
+        for pin, level in self.levels.items():
+            if pin not in pins:
+                raise ValueError(f"Trigger pin {pin} is not sampled by the logic analyzer.")
+            bit = 1 << pins.index(pin)
+            mask |= bit
+            if level:
+                value |= bit
+        return mask, value
+
+
+class LogicAnalyzer:
+    def __init__(self, pins, sample_rate=100000, max_changes=1000000, start_trigger=None, stop_trigger=None,
+                 duration=None, use_process=False, names=None, port=None):
+        """
+        Próbkuje zestaw pinów wejściowych ze stałą częstotliwością w osobnym wątku lub procesie.
+        Próbki są pakowane bitowo (bit i odpowiada pins[i]) i zapisywane tylko przy zmianie stanu
+        (kodowanie długości serii), więc bezczynne linie nie zajmują pamięci.
+        :param pins: Lista pinów GPIO (BCM), maksymalnie 32.
+        :param sample_rate: Częstotliwość próbkowania w Hz.
+        :param max_changes: Pojemność bufora zmian stanu (prealokowana).
+        :param start_trigger: (Opcjonalny) Trigger - zapis zaczyna się, gdy piny przyjmą podane poziomy.
+        :param stop_trigger: (Opcjonalny) Trigger - zapis kończy się, gdy piny przejdą w podane poziomy.
+        :param duration: (Opcjonalny) maksymalny czas zapisu od wyzwolenia w sekundach.
+        :param use_process: Czy próbkować w osobnym procesie (bez współdzielenia GIL z testami).
+        :param names: (Opcjonalny) słownik {pin: nazwa sygnału} używany w eksporcie VCD.
+        :param port: (Opcjonalny) GPIOPort z tymi samymi pinami - próbka odczytywana jest wtedy jedną operacją.
+        """
+        if len(pins) > 32:
+            raise ValueError("Logic analyzer supports at most 32 pins.")
+        self.pins = list(pins)
+        self.sample_rate = sample_rate
+        self.max_changes = max_changes
+        self.start_trigger = start_trigger.compile(self.pins) if start_trigger else None
+        self.stop_trigger = stop_trigger.compile(self.pins) if stop_trigger else None
+        self.duration = duration
+        self.use_process = use_process
+        self.names = names or {}
+        self.times = array("q", bytes(8 * max_changes))
+        self.values = array("I", bytes(4 * max_changes))
+        self.count = 0
+        self.samples = 0
+        self.overflowed = False
+        self.trigger_time = None
+        if port is not None and list(port.pins) != self.pins:
+            raise ValueError("GPIO port pins must match logic analyzer pins.")
+        self._read_sample = port.read if port is not None else self._read_gpio
+        self._worker = None
+        self._stop_event = None
+        self._pipe = None
+
+    def _read_gpio(self):
+        """
+        Odczytuje wszystkie piny i składa je w jedną próbkę bitową.
+        """
+        value = 0
+        for bit, pin in enumerate(self.pins):
+            if GPIO.input(pin):
+                value |= 1 << bit
+        return value
+
+    def _sample_loop(self, stop_event):
+        """
+        Pętla próbkowania; zapisuje (czas, stan) przy każdej zmianie stanu po wyzwoleniu.
+        """
+        read = self._read_sample
+        times, values = self.times, self.values
+        capacity = self.max_changes
+        period = int(1e9 / self.sample_rate)
+        start_mask, start_value = self.start_trigger or (0, 0)
+        stop_mask, stop_value = self.stop_trigger or (0, 0)
+        end_time = None
+        triggered = False
+        last = None
+        count = samples = 0
+        next_time = time.perf_counter_ns()
+        while not stop_event.is_set():
+            value = read()
+            now = time.perf_counter_ns()
+            samples += 1
+            if not triggered:
+                if value & start_mask == start_value:
+                    triggered = True
+                    self.trigger_time = now
+                    if self.duration is not None:
+                        end_time = now + int(self.duration * 1e9)
+                    last = None
+            if triggered:
+                if value != last:
+                    if count == capacity:
+                        self.overflowed = True
+                        break
+                    times[count] = now
+                    values[count] = value
+                    count += 1
+                    if stop_mask and value & stop_mask == stop_value and last is not None \
+                            and last & stop_mask != stop_value:
+                        break
+                    last = value
+                if end_time is not None and now >= end_time:
+                    break
+            next_time += period
+            remaining = next_time - time.perf_counter_ns()
+            if remaining > _SLEEP_THRESHOLD_NS:
+                time.sleep((remaining - _SLEEP_THRESHOLD_NS) / 1e9)
+            while time.perf_counter_ns() < next_time:
+                pass
+        self.count = count
+        self.samples = samples
+
+    def _process_main(self, stop_event, connection):
+        """
+        Punkt wejścia procesu próbkującego; wyniki odsyłane są jednorazowo po zakończeniu zapisu.
+        """
+        self._sample_loop(stop_event)
+        connection.send((self.times[:self.count].tobytes(), self.values[:self.count].tobytes(), self.count,
+                         self.samples, self.overflowed, self.trigger_time))
+        connection.close()
+
+    def start(self):
+        """
+        Uruchamia próbkowanie w tle.
+        """
+        if self.running:
+            raise RuntimeError("Logic analyzer is already running.")
+        self.count = self.samples = 0
+        self.overflowed = False
+        self.trigger_time = None
+        if self.use_process:
+            context = multiprocessing.get_context("fork")
+            self._stop_event = context.Event()
+            self._pipe, child = context.Pipe(duplex=False)
+            self._worker = context.Process(target=self._process_main, args=(self._stop_event, child), daemon=True)
+        else:
+            self._stop_event = threading.Event()
+            self._worker = threading.Thread(target=self._sample_loop, args=(self._stop_event,),
+                                            name="LogicAnalyzer", daemon=True)
+        self._worker.start()
+        return self
+
+    @property
+    def running(self):
+        return self._worker is not None and self._worker.is_alive()
+
+    def wait(self, timeout=None):
+        """
+        Czeka na zakończenie zapisu (wyzwalacz stopu, czas trwania lub przepełnienie bufora).
+        :return: True, jeśli zapis się zakończył.
+        """
+        if self.use_process:
+            # Proces kończy się dopiero po odebraniu wyników z potoku
+            finished = self._pipe.poll(timeout)
+        else:
+            self._worker.join(timeout)
+            finished = not self._worker.is_alive()
+        if finished:
+            self.stop()
+        return finished
+
+    def stop(self):
+        """
+        Zatrzymuje próbkowanie i (w trybie procesu) odbiera wyniki.
+        """
+        if self._worker is None:
+            return
+        self._stop_event.set()
+        if self.use_process:
+            if self._pipe.poll(5):
+                times, values, self.count, self.samples, self.overflowed, self.trigger_time = self._pipe.recv()
+                self.times[:self.count] = array("q", times)
+                self.values[:self.count] = array("I", values)
+            self._pipe.close()
+        self._worker.join()
+        self._worker = None
+
+    def changes(self):
+        """
+        Zwraca zarejestrowane zmiany stanu.
+        :return: Krotka (czasy względem wyzwolenia [ns] jako np.int64, próbki bitowe jako np.uint32).
+        """
+        times = np.frombuffer(self.times, dtype=np.int64)[:self.count]
+        values = np.frombuffer(self.values, dtype=np.uint32)[:self.count]
+        origin = self.trigger_time if self.trigger_time is not None else (times[0] if self.count else 0)
+        return times - origin, values.copy()
+
+    def channel(self, pin):
+        """
+        Zwraca zmiany stanu pojedynczego pinu.
+        :return: Krotka (czasy [ns], poziomy) ograniczona do chwil, w których pin zmienił stan.
+        """
+        times, values = self.changes()
+        levels = ((values >> self.pins.index(pin)) & 1).astype(np.int8)
+        keep = np.ones(levels.size, dtype=bool)
+        keep[1:] = levels[1:] != levels[:-1]
+        return times[keep], levels[keep]
+
+    def export_vcd(self, path, timescale_ns=1):
+        """
+        Zapisuje przebiegi w formacie VCD (Value Change Dump), np. do podglądu w GTKWave/PulseView.
+        :param path: Ścieżka do pliku wynikowego.
+        :param timescale_ns: Jednostka czasu pliku w nanosekundach.
+        """
+        identifiers = [chr(33 + index) for index in range(len(self.pins))]
+        times, values = self.changes()
+        with open(path, "w") as f:
+            f.write(f"$date {time.strftime('%Y-%m-%d %H:%M:%S')} $end\n")
+            f.write("$version PY_MICRO_HIL LogicAnalyzer $end\n")
+            f.write(f"$timescale {timescale_ns}ns $end\n")
+            f.write("$scope module logic $end\n")
+            for pin, identifier in zip(self.pins, identifiers):
+                f.write(f"$var wire 1 {identifier} {self.names.get(pin, f'GPIO{pin}')} $end\n")
+            f.write("$upscope $end\n$enddefinitions $end\n")
+            previous = None
+            for timestamp, value in zip(times.tolist(), values.tolist()):
+                changed = (1 << len(self.pins)) - 1 if previous is None else value ^ previous
+                lines = [f"{(value >> bit) & 1}{identifiers[bit]}" for bit in range(len(self.pins)) if (changed >> bit) & 1]
+                if previous is None:
+                    f.write(f"#{max(timestamp, 0) // timescale_ns}\n$dumpvars\n" + "\n".join(lines) + "\n$end\n")
+                else:
+                    f.write(f"#{timestamp // timescale_ns}\n" + "\n".join(lines) + "\n")
+                previous = value
@@ -0,0 +1,142 @@
+import time
+from array import array
+import numpy as np
+
+# Percentyle drukowane w opisie rozkładu
+DISTRIBUTION_PERCENTILES = (50, 90, 99, 99.9)
+# Liczba przedziałów histogramu w opisie rozkładu
+HISTOGRAM_BINS = 10
+_BAR_WIDTH = 40
+
+
+def _format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+class Measurement:
+    def __init__(self, durations_ns, wall_time, units_per_call=1, unit="calls"):
+        """
+        Wynik pomiaru: czasy kolejnych wywołań i czas całego pomiaru.
+        :param durations_ns: Tablica numpy czasów wywołań [ns].
+        :param wall_time: Czas trwania pętli pomiarowej [s] (podstawa przepustowości).
+        :param units_per_call: Liczba jednostek przetwarzanych w jednym wywołaniu (np. bajtów ramki).
+        :param unit: Nazwa jednostki przepustowości.
+        """
+        self.samples = durations_ns / 1e9  # Czasy wywołań [s]
+        self.count = int(durations_ns.size)
+        self.wall_time = wall_time
+        self.units_per_call = units_per_call
+        self.unit = unit
+
+    @property
+    def mean(self):
+        return float(self.samples.mean()) if self.count else 0.0
+
+    @property
+    def std(self):
+        return float(self.samples.std()) if self.count else 0.0
+
+    @property
+    def min(self):
+        return float(self.samples.min()) if self.count else 0.0
+
+    @property
+    def max(self):
+        return float(self.samples.max()) if self.count else 0.0
+
+    def percentile(self, percentile):
+        """
+        Percentyl czasu wywołania [s], np. percentile(99).
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100.")
+        return float(np.percentile(self.samples, percentile)) if self.count else 0.0
+
+    @property
+    def throughput(self):
+        """
+        Przepustowość [jednostki/s] liczona z czasu całej pętli pomiarowej.
+        """
+        return self.count * self.units_per_call / self.wall_time if self.wall_time > 0 else 0.0
+
+    def summary(self):
+        """
+        Jednowierszowe podsumowanie: liczba próbek, percentyle, średnia, odchylenie i przepustowość.
+        """
+        if not self.count:
+            return "no samples"
+        percentiles = ", ".join(f"p{p:g}={_format_seconds(self.percentile(p))}" for p in DISTRIBUTION_PERCENTILES)
+        return (f"n={self.count}, {percentiles}, max={_format_seconds(self.max)}, "
+                f"mean={_format_seconds(self.mean)}, std={_format_seconds(self.std)}, "
+                f"throughput={self.throughput:.6g} {self.unit}/s")
+
+    def distribution(self):
+        """
+        Opis rozkładu: podsumowanie i histogram tekstowy (wiele wierszy).
+        """
+        lines = [self.summary()]
+        if self.count:
+            counts, edges = np.histogram(self.samples, bins=HISTOGRAM_BINS)
+            peak = int(counts.max())
+            for count, low, high in zip(counts, edges[:-1], edges[1:]):
+                bar = "#" * int(round(_BAR_WIDTH * count / peak)) if peak else ""
+                lines.append(f"  {_format_seconds(low):>11} - {_format_seconds(high):>11} | {bar} {count}")
+        return "\n".join(lines)
+
+
+def measure(function, *args, iterations=None, duration=None, warmup=10, warmup_duration=None,
+            max_samples=1_000_000, units_per_call=1, unit="calls", **kwargs):
+    """
+    Mierzy czas wywołań function(*args, **kwargs) powtarzanych iterations razy lub przez duration sekund,
+    po rozgrzewce (wywołania nieliczone). Czasy perf_counter_ns trafiają do tablicy zaalokowanej przed pomiarem,
+    więc pętla pomiarowa nie alokuje pamięci dla wyników.
+    :param function: Mierzona funkcja (np. lambda: modbus.read_holding_registers(1, 0, 1)).
+    :param iterations: (Opcjonalna) liczba mierzonych wywołań.
+    :param duration: (Opcjonalny) czas pomiaru [s]; z iterations - pomiar kończy pierwszy osiągnięty limit.
+    :param warmup: Liczba wywołań rozgrzewających.
+    :param warmup_duration: (Opcjonalny) czas rozgrzewki [s] zamiast liczby wywołań.
+    :param max_samples: Rozmiar tablicy próbek w pomiarze czasowym (pomiar kończy się po jej zapełnieniu).
+    :param units_per_call: Liczba jednostek przetwarzanych w jednym wywołaniu (przepustowość w jednostkach/s).
+    :param unit: Nazwa jednostki przepustowości, np. "bytes".
+    :return: Obiekt Measurement.
+    """
+    if iterations is None and duration is None:
+        raise ValueError("Specify iterations and/or duration.")
+    if iterations is not None and iterations < 1:
+        raise ValueError("iterations must be at least 1.")
+    if duration is not None and duration <= 0:
+        raise ValueError("duration must be positive.")
+    timer = time.perf_counter_ns
+    if warmup_duration is not None:
+        warmup_end = timer() + int(warmup_duration * 1e9)
+        while timer() < warmup_end:
+            function(*args, **kwargs)
+    else:
+        for _ in range(warmup):
+            function(*args, **kwargs)
+
+    size = iterations if iterations is not None else max_samples
+    durations = array("q", bytes(8 * size))
+    count = 0
+    started = timer()
+    if duration is None:
+        for count in range(size):
+            start = timer()
+            function(*args, **kwargs)
+            durations[count] = timer() - start
+        count = size
+    else:
+        end = started + int(duration * 1e9)
+        start = started
+        while count < size and start < end:
+            function(*args, **kwargs)
+            stop = timer()
+            durations[count] = stop - start
+            count += 1
+            start = timer()
+    wall_time = (timer() - started) / 1e9
+    return Measurement(np.frombuffer(durations, dtype=np.int64)[:count], wall_time, units_per_call, unit)
@@ -0,0 +1,307 @@
+import bisect
+import functools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core.instrumentation import device_keys, instrumented_methods, unwrap_methods, wrap_methods
+
+# Domyślne przedziały histogramów [s]: od 100 us (transakcje magistrali) do 60 s (długie testy)
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+
+def _format_value(value):
+    value = float(value)
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, label_names=()):
+        """
+        Bazowa klasa metryki z etykietami. Serie (kombinacje wartości etykiet) tworzone są pod blokadą
+        tylko przy pierwszym użyciu; aktualizacja istniejącej serii nie wymaga blokady.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """
+        Zwraca serię dla podanych wartości etykiet (obiekt do zapamiętania w kodzie często wywoływanym).
+        """
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"Metric {self.name} expects labels {self.label_names}, got {values}.")
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def collect(self):
+        """
+        Zwraca linie w formacie tekstowym Prometheus (odczyt bez blokowania zapisujących).
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, series in list(self._series.items()):
+            lines.extend(self._collect_series(values, series))
+        return lines
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def set(self, value):
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_series(self):
+        return _Value()
+
+    def inc(self, *values, amount=1):
+        self.labels(*values).inc(amount)
+
+    def _collect_series(self, values, series):
+        return [f"{self.name}{_format_labels(self.label_names, values)} {_format_value(series.value)}"]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_series(self):
+        return _Value()
+
+    def set(self, value, *values):
+        self.labels(*values).set(value)
+
+    def _collect_series(self, values, series):
+        return [f"{self.name}{_format_labels(self.label_names, values)} {_format_value(series.value)}"]
+
+
+class _HistogramSeries:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self):
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value, *values):
+        self.labels(*values).observe(value)
+
+    def _collect_series(self, values, series):
+        counts = list(series.counts)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = _format_value(bound)
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, values, ('le', le))} {cumulative}")
+        labels = _format_labels(self.label_names, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(series.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Zbiór metryk stanowiska HIL oraz funkcje podpinające je pod framework, urządzenia i serwer HTTP.
+        """
+        self.metrics = []
+        # Metryki testów mają etykietę slot: każdy wątek slotu DUT aktualizuje własne serie (bez utraty inkrementacji)
+        self.tests = self.add(Counter("hil_tests_total", "Tests run, by slot, group and result.",
+                                      ("slot", "group", "result")))
+        self.assertions = self.add(Counter("hil_assertions_total", "Reported assertion results.",
+                                           ("slot", "group", "result")))
+        self.test_duration = self.add(Histogram("hil_test_duration_seconds", "Test duration.", ("slot", "group")))
+        self.initialize_time = self.add(Gauge("hil_device_initialize_seconds", "Device initialization time.",
+                                              ("device",)))
+        self.call_duration = self.add(Histogram("hil_device_call_seconds", "Device/bus call latency.",
+                                                ("device", "method")))
+        self.call_errors = self.add(Counter("hil_device_call_errors_total", "Device/bus calls that raised.",
+                                            ("device", "method")))
+        self.runs = self.add(Counter("hil_runs_total", "Completed test runs, by status.", ("status",)))
+        self.last_run = self.add(Gauge("hil_last_run_timestamp_seconds", "Unix time of the last completed run."))
+        self._wrapped = []
+        self._local = threading.local()  # Flaga nieudanej asercji w bieżącym teście (osobna dla każdego wątku/slotu)
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """
+        Zwraca wszystkie metryki w formacie tekstowym Prometheus.
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+    def attach_devices(self, devices, prefix=""):
+        """
+        Mierzy czas inicjalizacji urządzeń oraz opóźnienia i błędy wywołań metod magistral.
+        :param prefix: Prefiks etykiety urządzenia (np. nazwa slotu DUT).
+        """
+        for _, key, device in device_keys(devices):
+            key = prefix + key
+            initialize_series = self.initialize_time.labels(key)
+
+            def initialize_factory(name, original, series=initialize_series):
+                def wrapper(*args, **kwargs):
+                    start = time.perf_counter()
+                    try:
+                        return original(*args, **kwargs)
+                    finally:
+                        series.set(time.perf_counter() - start)
+                return wrapper
+            self._wrapped.append((device, wrap_methods(device, initialize_factory, ["initialize"])))
+            self._wrapped.append((device, wrap_methods(device, self._call_factory(key), instrumented_methods(device))))
+
+    def _call_factory(self, key):
+        def factory(name, original):
+            duration = self.call_duration.labels(key, name)
+            errors = self.call_errors.labels(key, name)
+
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                except Exception:
+                    errors.inc()
+                    raise
+                finally:
+                    duration.observe(time.perf_counter() - start)
+            return wrapper
+        return factory
+
+    def attach_framework(self, framework, slot=""):
+        """
+        Liczy wyniki asercji (słuchacz wyników) oraz wyniki i czasy testów (opakowanie Test.run).
+        :param slot: Nazwa slotu DUT (etykieta slot; pusta dla pojedynczego DUT).
+        """
+        framework.add_result_listener(functools.partial(self.record_result, slot=slot))
+        for group in framework.test_groups:
+            for test in group.tests:
+                self._wrapped.append((test, wrap_methods(test, self._test_factory(slot, group.name, test.name),
+                                                         ["run"])))
+
+    def record_result(self, group_name, test_name, passed, details=None, assertions=1, failed_assertions=None,
+                      slot=""):
+        if failed_assertions is None:
+            failed_assertions = 0 if passed else 1
+        if assertions - failed_assertions:
+            self.assertions.inc(slot, group_name, "passed", amount=assertions - failed_assertions)
+        if failed_assertions:
+            self.assertions.inc(slot, group_name, "failed", amount=failed_assertions)
+        if not passed:
+            self._local.failed = True
+
+    def _test_factory(self, slot, group_name, test_name):
+        def factory(name, original):
+            def wrapper(*args, **kwargs):
+                self._local.failed = False
+                start = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.test_duration.observe(time.perf_counter() - start, slot, group_name)
+                    self.tests.inc(slot, group_name, "failed" if self._local.failed else "passed")
+            return wrapper
+        return factory
+
+    def record_run(self, passed):
+        self.runs.inc("passed" if passed else "failed")
+        self.last_run.set(time.time())
+
+    def detach(self):
+        for target, originals in reversed(self._wrapped):
+            unwrap_methods(target, originals)
+        self._wrapped.clear()
+
+
+class MetricsServer:
+    def __init__(self, registry, host="0.0.0.0", port=9108):
+        """
+        Serwer HTTP (biblioteka standardowa) udostępniający metryki pod /metrics w wątku tła.
+        Obsługa zapytania tylko odczytuje liczniki, więc nie wstrzymuje wątku testów.
+        :param registry: Obiekt MetricsRegistry.
+        :param host: Adres nasłuchu.
+        :param port: Port TCP (0 - dowolny wolny port).
+        """
+        self.registry = registry
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry_ref.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
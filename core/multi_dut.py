@@ -0,0 +1,128 @@
+import copy
+import sys
+import threading
+import time
+from core.peripheral_manager import PeripheralManager
+from core.test_framework import TestFramework, TestGroup
+
+# Wspólna blokada loggerów slotów - wielowierszowe komunikaty z różnych wątków nie przeplatają się
+_log_lock = threading.Lock()
+
+
+class DUTSlot:
+    def __init__(self, name, devices, params=None):
+        """
+        Slot testowanego urządzenia (DUT) z własnym zestawem urządzeń.
+        :param name: Nazwa slotu (prefiks logów i wiersz podsumowania).
+        :param devices: Słownik {"protocols": [...], "peripherals": [...]}.
+        :param params: (Opcjonalny) słownik parametrów slotu dla testów, np. adres I2C DUT.
+        """
+        self.name = name
+        self.devices = devices
+        self.params = params or {}
+
+
+class SlotLogger:
+    def __init__(self, logger, name):
+        """
+        Logger slotu: dodaje prefiks [nazwa slotu] do każdego wiersza i przekazuje komunikat do wspólnego loggera.
+        """
+        self.logger = logger
+        self.prefix = f"[{name}] "
+
+    @property
+    def log_file(self):
+        return self.logger.log_file
+
+    def log(self, message, to_console=True, to_log_file=False):
+        message = "\n".join(self.prefix + line if line.strip() else line for line in str(message).split("\n"))
+        with _log_lock:
+            self.logger.log(message, to_console=to_console, to_log_file=to_log_file)
+
+    def flush_log(self):
+        self.logger.flush_log()
+
+
+def _copy_group(group):
+    """
+    Kopia grupy z własnymi obiektami Test (opakowania metod, np. profilera, są osobne dla każdego slotu).
+    """
+    copied = TestGroup(group.name)
+    copied.setup = group.setup
+    copied.teardown = group.teardown
+    copied.requires = group.requires
+    copied.tests = [copy.copy(test) for test in group.tests]
+    return copied
+
+
+class MultiDUTRunner:
+    def __init__(self, slots, test_groups, logger):
+        """
+        Uruchamia te same grupy testów równolegle dla wielu slotów DUT - każdy slot ma własny
+        PeripheralManager i TestFramework oraz własny wątek.
+        :param slots: Lista obiektów DUTSlot.
+        :param test_groups: Lista obiektów TestGroup.
+        :param logger: Wspólna instancja klasy Logger.
+        """
+        if not slots:
+            raise ValueError("Multi-DUT mode requires at least one slot.")
+        self.slots = slots
+        self.logger = logger
+        self.frameworks = []
+        for slot in slots:
+            slot_logger = SlotLogger(logger, slot.name)
+            framework = TestFramework(PeripheralManager(slot.devices, slot_logger), slot_logger)
+            framework.slot = slot
+            for group in test_groups:
+                framework.add_test_group(_copy_group(group))
+            self.frameworks.append(framework)
+        self.results = [None] * len(slots)  # (status, czas trwania [s]) dla każdego slotu
+
+    def _run_slot(self, index):
+        framework = self.frameworks[index]
+        start = time.perf_counter()
+        try:
+            framework.run_all_tests()
+            status = "PASSED"
+        except SystemExit:
+            # run_all_tests kończy się sys.exit(1) przy nieudanych testach lub błędzie inicjalizacji
+            status = "FAILED" if framework.fail_count else "ERROR"
+        except Exception as e:
+            framework.logger.log(f"[ERROR] Unexpected error: {str(e)}", to_console=True)
+            framework.peripheral_manager.release_all()
+            status = "ERROR"
+        self.results[index] = (status, time.perf_counter() - start)
+
+    def run(self):
+        """
+        Uruchamia sloty w osobnych wątkach, czeka na ich zakończenie i drukuje łączne podsumowanie.
+        Kończy program sys.exit(1), jeśli którykolwiek slot nie przeszedł testów.
+        :return: Lista krotek (nazwa slotu, status, czas trwania [s]).
+        """
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._run_slot, args=(index,), name=f"DUT-{slot.name}")
+                   for index, slot in enumerate(self.slots)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results = [(slot.name, status, duration) for slot, (status, duration) in zip(self.slots, self.results)]
+        self.print_summary(results, time.perf_counter() - start)
+        if any(status != "PASSED" for _, status, _ in results):
+            sys.exit(1)
+        return results
+
+    def print_summary(self, results, wall_time):
+        lines = ["\n================= MULTI-DUT SUMMARY =================="]
+        for (name, status, duration), framework in zip(results, self.frameworks):
+            mark = "✅" if status == "PASSED" else "❌"
+            lines.append(f"> {name}: {mark} {status:<7} {framework.pass_count} passed, {framework.fail_count} failed "
+                         f"({duration:.2f} s)")
+        passed = sum(1 for _, status, _ in results if status == "PASSED")
+        lines.append(f"> Slots: {len(results)}, passed: {passed}, failed: {len(results) - passed}, "
+                     f"wall time: {wall_time:.2f} s")
+        lines.append(f"\nOVERALL STATUS: {'✅ PASSED' if passed == len(results) else '❌ FAILED'}\n")
+        summary = "\n".join(lines)
+        self.logger.log(summary, to_console=True)
+        if self.logger.log_file:
+            self.logger.log(summary, to_console=False, to_log_file=True)
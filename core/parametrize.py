@@ -0,0 +1,240 @@
+import csv
+import json
+import random
+from core.assertions import run_in_test_context
+from core.fixtures import call_with_fixtures
+from core.test_framework import Test
+
+
+class ParameterSource:
+    def __init__(self, factory, length=None, description="parameters"):
+        """
+        Źródło parametrów: funkcja factory() zwraca nowy iterator słowników {nazwa: wartość}.
+        Przypadki są generowane leniwie przy każdym przejściu, więc źródło nie przechowuje wartości w pamięci.
+        :param factory: Funkcja tworząca iterator słowników parametrów.
+        :param length: (Opcjonalna) liczba przypadków, jeśli jest znana bez iterowania.
+        :param description: Opis źródła w komunikatach błędów.
+        """
+        self._factory = factory
+        self.length = length
+        self.description = description
+
+    def __iter__(self):
+        return iter(self._factory())
+
+
+def values(name, source):
+    """
+    Źródło jednego parametru z listy, krotki, range, funkcji zwracającej iterator (np. funkcji generatora)
+    lub jednorazowego iteratora (można go przejść tylko raz).
+    :param name: Nazwa parametru (argument nazwany funkcji testu).
+    :param source: Wartości parametru.
+    """
+    if callable(source):
+        return ParameterSource(lambda: ({name: value} for value in source()), description=name)
+    if isinstance(source, (list, tuple, range)):
+        return ParameterSource(lambda: ({name: value} for value in source), len(source), name)
+    iterator = iter(source)
+    used = []
+
+    def single_use():
+        if used:
+            raise RuntimeError(f"Parameter source '{name}' is a one-shot iterator; pass a generator function "
+                               f"to iterate it more than once.")
+        used.append(True)
+        return ({name: value} for value in iterator)
+    return ParameterSource(single_use, description=name)
+
+
+def table(names, rows):
+    """
+    Źródło kilku parametrów podawanych razem, np. table(("address", "value"), [(0x10, 1), (0x11, 2)]).
+    :param names: Nazwy parametrów.
+    :param rows: Lista krotek wartości (lub funkcja zwracająca iterator krotek).
+    """
+    names = tuple(names)
+    if callable(rows):
+        return ParameterSource(lambda: (dict(zip(names, row)) for row in rows()), description=", ".join(names))
+    return ParameterSource(lambda: (dict(zip(names, row)) for row in rows), len(rows), ", ".join(names))
+
+
+def _converted(row, converters):
+    if converters:
+        for name, converter in converters.items():
+            if name in row:
+                row[name] = converter(row[name])
+    return row
+
+
+def csv_file(path, columns=None, converters=None, **reader_options):
+    """
+    Źródło parametrów z pliku CSV z nagłówkiem, czytanego wiersz po wierszu przy każdym przejściu.
+    :param path: Ścieżka do pliku.
+    :param columns: (Opcjonalna) lista kolumn używanych jako parametry; domyślnie wszystkie.
+    :param converters: (Opcjonalny) słownik {kolumna: funkcja}, np. {"address": lambda text: int(text, 0)}.
+    :param reader_options: Dodatkowe opcje csv.DictReader (np. delimiter=";").
+    """
+    def rows():
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f, **reader_options):
+                if columns is not None:
+                    row = {name: row[name] for name in columns}
+                yield _converted(row, converters)
+    return ParameterSource(rows, description=path)
+
+
+def jsonl_file(path, converters=None):
+    """
+    Źródło parametrów z pliku JSON Lines (jeden obiekt JSON na wiersz), czytanego wiersz po wierszu.
+    :param path: Ścieżka do pliku.
+    :param converters: (Opcjonalny) słownik {parametr: funkcja}.
+    """
+    def rows():
+        with open(path, "r") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError(f"{path}:{number}: expected a JSON object, got {type(row).__name__}.")
+                yield _converted(row, converters)
+    return ParameterSource(rows, description=path)
+
+
+def _format_value(value):
+    if isinstance(value, int) and not isinstance(value, bool) and abs(value) >= 256:
+        return hex(value)
+    return repr(value)
+
+
+class Parametrized:
+    def __init__(self, func, sources, combine="product", sample=None, seed=0, shard=None, ids=None):
+        """
+        Opis testu sparametryzowanego (tworzony przez parametrize()).
+        """
+        if combine not in ("product", "zip"):
+            raise ValueError("combine must be 'product' or 'zip'.")
+        if not sources:
+            raise ValueError("At least one parameter source is required.")
+        if shard is not None and not 0 <= shard[0] < shard[1]:
+            raise ValueError("shard must be (index, count) with 0 <= index < count.")
+        if sample is not None and not ((isinstance(sample, float) and 0 < sample <= 1) or
+                                       (isinstance(sample, int) and sample > 0)):
+            raise ValueError("sample must be a positive case count or a fraction in (0, 1].")
+        self.func = func
+        self.sources = [source if isinstance(source, ParameterSource) else values(*source) for source in sources]
+        self.combine = combine
+        self.sample = sample
+        self.seed = seed
+        self.shard = shard
+        self.ids = ids
+
+    def _product(self, level=0):
+        if level == len(self.sources):
+            yield {}
+            return
+        for params in self.sources[level]:
+            for rest in self._product(level + 1):
+                yield {**params, **rest}
+
+    def _zip(self):
+        for rows in zip(*self.sources):
+            params = {}
+            for row in rows:
+                params.update(row)
+            yield params
+
+    def all_cases(self):
+        """
+        Generator wszystkich przypadków (bez próbkowania i podziału).
+        """
+        return self._product() if self.combine == "product" else self._zip()
+
+    def count(self):
+        """
+        Liczba wszystkich przypadków (bez iterowania, jeśli długości źródeł są znane).
+        """
+        lengths = [source.length for source in self.sources]
+        if None not in lengths:
+            if self.combine == "zip":
+                return min(lengths)
+            total = 1
+            for length in lengths:
+                total *= length
+            return total
+        return sum(1 for _ in self.all_cases())
+
+    def cases(self):
+        """
+        Generator krotek (indeks, parametry) po próbkowaniu i podziale; indeks jest stały dla danego przypadku.
+        Próbka o zadanej liczności jest wybierana w jednym przejściu (reservoir sampling) i przechowuje
+        tylko wybrane przypadki, więc działa także dla jednorazowych iteratorów i źródeł o nieznanej długości.
+        """
+        if isinstance(self.sample, int):
+            cases = self._reservoir()
+        else:
+            fraction_rng = random.Random(self.seed) if isinstance(self.sample, float) else None
+            cases = ((index, params) for index, params in enumerate(self.all_cases())
+                     if fraction_rng is None or fraction_rng.random() < self.sample)
+        for index, params in cases:
+            if self.shard is not None and index % self.shard[1] != self.shard[0]:
+                continue
+            yield index, params
+
+    def _reservoir(self):
+        rng = random.Random(self.seed)
+        selected = []
+        for index, params in enumerate(self.all_cases()):
+            if index < self.sample:
+                selected.append((index, params))
+            else:
+                slot = rng.randint(0, index)
+                if slot < self.sample:
+                    selected[slot] = (index, params)
+        selected.sort(key=lambda case: case[0])
+        return iter(selected)
+
+    def case_name(self, base_name, index, params):
+        if self.ids is not None:
+            return f"{base_name}[{self.ids(params)}]"
+        return f"{base_name}[{', '.join(f'{name}={_format_value(value)}' for name, value in params.items())}]"
+
+
+def parametrize(func, *sources, combine="product", sample=None, seed=0, shard=None, ids=None):
+    """
+    Tworzy test sparametryzowany do listy testów create_test_group: ("Nazwa", parametrize(func, ...)).
+    Funkcja testu otrzymuje parametry jako argumenty nazwane: func(framework, group_name, test_name, **params).
+    Każdy przypadek jest raportowany jako osobny test o nazwie "Nazwa[param=wartość, ...]".
+    :param func: Funkcja testu.
+    :param sources: Źródła parametrów: ParameterSource (values, table, csv_file, jsonl_file)
+                    lub krotki (nazwa, wartości) - skrót dla values().
+    :param combine: 'product' (iloczyn kartezjański źródeł) lub 'zip' (kolejne elementy źródeł razem).
+    :param sample: (Opcjonalna) liczba losowanych przypadków (int) lub ich ułamek (float).
+    :param seed: Ziarno losowania (ta sama próbka przy każdym uruchomieniu).
+    :param shard: (Opcjonalna) krotka (indeks, liczba) - wykonywane są przypadki o indeksie % liczba == indeks.
+    :param ids: (Opcjonalna) funkcja ids(params) zwracająca nazwę przypadku (w nawiasach kwadratowych).
+    """
+    return Parametrized(func, sources, combine, sample, seed, shard, ids)
+
+
+class ParametrizedTest(Test):
+    def __init__(self, name, parametrized):
+        """
+        Test rozwijany w przypadki dopiero podczas wykonania (pamięć nie zależy od liczby przypadków).
+        """
+        super().__init__(name, parametrized.func)
+        self.parametrized = parametrized
+
+    def run(self, framework, group_name):
+        parametrized = self.parametrized
+        try:
+            for index, params in parametrized.cases():
+                case_name = parametrized.case_name(self.name, index, params)
+                try:
+                    run_in_test_context(framework, group_name, case_name, call_with_fixtures, framework,
+                                        parametrized.func, group_name, case_name, params)
+                except Exception as e:
+                    framework.report_test_result(group_name, case_name, False, str(e))
+        except Exception as e:
+            # Błąd generowania przypadków (np. brak pliku CSV, wyczerpany jednorazowy iterator)
+            framework.report_test_result(group_name, self.name, False, f"Parameter generation failed: {str(e)}")
@@ -1,6 +1,7 @@
 import yaml
-from core.RPiPeripherals import RPiGPIO, RPiPWM, RPiUART, RPiI2C, RPiSPI#, RPi1Wire, RPiADC, RPiCAN, RPiHardwarePWM
+from core.RPiPeripherals import RPiGPIO, RPiGPIOPort, RPiPWM, RPiUART, RPiI2C, RPiSPI, RPiADC, RPiCAN#, RPi1Wire, RPiHardwarePWM
 from core.protocols import ModbusTRU
+from core.multi_dut import DUTSlot
 import RPi.GPIO as GPIO
 
 def load_peripheral_configuration(yaml_file='peripherals_config.yaml'):
@@ -11,7 +12,50 @@ def load_peripheral_configuration(yaml_file='peripherals_config.yaml'):
     """
     with open(yaml_file, 'r') as f:
         config = yaml.safe_load(f)  # Załadowanie pliku YAML
-    
+    return build_devices(config)
+
+
+def load_slot_configuration(yaml_file='peripherals_config.yaml'):
+    """
+    Ładuje sloty DUT (sekcja 'slots') z pliku YAML. Każdy slot ma własne sekcje 'protocols'/'peripherals'
+    (wspólne fragmenty można współdzielić kotwicami YAML) oraz opcjonalne parametry 'params' dla testów.
+    :param yaml_file: Ścieżka do pliku YAML.
+    :return: Lista obiektów DUTSlot (pusta, jeśli plik nie definiuje slotów).
+    """
+    with open(yaml_file, 'r') as f:
+        config = yaml.safe_load(f)
+
+    slots = []
+    for index, slot_config in enumerate(config.get('slots') or []):
+        if not isinstance(slot_config, dict):
+            raise ValueError("Invalid configuration for DUT slot, expected dictionary with keys 'name', 'peripherals'.")
+        name = str(slot_config.get('name', f"DUT{index + 1}"))
+        if any(slot.name == name for slot in slots):
+            raise ValueError(f"Duplicate DUT slot name: {name}.")
+        slots.append(DUTSlot(name, build_devices(slot_config), slot_config.get('params', {})))
+    return slots
+
+
+def load_capabilities(yaml_file='peripherals_config.yaml'):
+    """
+    Ładuje dodatkowe znaczniki możliwości stanowiska (lista 'capabilities') używane przy podziale testów na stanowiska.
+    :param yaml_file: Ścieżka do pliku YAML.
+    :return: Lista znaczników (pusta, jeśli plik ich nie definiuje).
+    """
+    with open(yaml_file, 'r') as f:
+        config = yaml.safe_load(f)
+    capabilities = config.get('capabilities') or []
+    if not isinstance(capabilities, list):
+        raise ValueError("Invalid configuration for capabilities, expected a list of tags.")
+    return [str(capability) for capability in capabilities]
+
+
+def build_devices(config):
+    """
+    Tworzy urządzenia na podstawie słownika konfiguracji (sekcje 'protocols' i 'peripherals').
+    :param config: Słownik konfiguracji.
+    :return: Zwraca słownik z peryferiami i protokołami do załadowania.
+    """
     peripherals = []
     protocols = []
 
@@ -84,12 +128,34 @@ def load_peripheral_configuration(yaml_file='peripherals_config.yaml'):
                 raise ValueError("Invalid configuration for GPIO, expected dictionary.")
 
 
+    # GPIO port (grupa pinów obsługiwana jedną operacją)
+    if 'gpio_port' in config.get('peripherals', {}):
+        for port_config in config['peripherals']['gpio_port']:
+            if isinstance(port_config, dict) and 'pins' in port_config:
+                mode_str = str(port_config.get('mode', 'out')).upper()
+                if mode_str in ("IN", "GPIO.IN"):
+                    mode = GPIO.IN
+                elif mode_str in ("OUT", "GPIO.OUT"):
+                    mode = GPIO.OUT
+                else:
+                    raise ValueError(f"Invalid GPIO port mode: {mode_str}")
+                port = RPiGPIOPort([int(pin) for pin in port_config['pins']], mode=mode,
+                                   initial=int(port_config.get('initial', 0)),
+                                   backend=port_config.get('backend', 'gpiomem'),
+                                   mem_path=port_config.get('mem_path', '/dev/gpiomem'),
+                                   chip_path=port_config.get('chip_path', '/dev/gpiochip0'))
+                peripherals.append(port)
+            else:
+                raise ValueError("Invalid configuration for GPIO port, expected dictionary with key 'pins'.")
 
     # PWM
     if 'pwm' in config.get('peripherals', {}):
         for pwm_config in config['peripherals']['pwm']:
             if isinstance(pwm_config, dict):
-                pwm = RPiPWM(pwm_config['pin'], pwm_config.get('frequency', 1000))
+                pwm = RPiPWM(pwm_config['pin'], pwm_config.get('frequency', 1000),
+                             backend=pwm_config.get('backend', 'software'),  # 'hardware' - /sys/class/pwm
+                             chip=pwm_config.get('chip', 0), channel=pwm_config.get('channel'),
+                             sysfs_root=pwm_config.get('sysfs_root', '/sys/class/pwm'))
                 peripherals.append(pwm)
             else:
                 raise ValueError("Invalid configuration for PWM, expected dictionary with keys 'pin' and 'frequency'.")
@@ -98,7 +164,8 @@ def load_peripheral_configuration(yaml_file='peripherals_config.yaml'):
     if 'i2c' in config.get('peripherals', {}):
         i2c_config = config['peripherals']['i2c']
         if isinstance(i2c_config, dict):
-            i2c = RPiI2C(i2c_config.get('bus', 1),i2c_config.get('frequency', 100000))
+            i2c = RPiI2C(i2c_config.get('bus', 1),i2c_config.get('frequency', 100000),
+                         i2c_config.get('max_transfer', 8192))
             peripherals.append(i2c)
         else:
             raise ValueError("Invalid configuration for I2C, expected dictionary with key 'bus'.")
@@ -115,31 +182,43 @@ def load_peripheral_configuration(yaml_file='peripherals_config.yaml'):
             cs_high = spi_config.get('cs_high', False)  # Czy linia Chip Select jest aktywna na wysokim poziomie
             lsbfirst = spi_config.get('lsbfirst', False)  # Czy bity są przesyłane od najmniej znaczącego bitu
             timeout = spi_config.get('timeout', 1)  # Czas oczekiwania na odpowiedź
+            cs_pin = spi_config.get('cs_pin')  # Opcjonalny programowy Chip Select (GPIO)
+            chunk_size = spi_config.get('chunk_size')  # Domyślnie bufsiz modułu spidev
 
             # Tworzenie instancji SPI z odpowiednimi parametrami
             spi = RPiSPI(bus=bus, device=device, max_speed_hz=max_speed_hz, mode=mode,
-                        bits_per_word=bits_per_word, cs_high=cs_high, lsbfirst=lsbfirst, timeout=timeout)
+                        bits_per_word=bits_per_word, cs_high=cs_high, lsbfirst=lsbfirst, timeout=timeout,
+                        cs_pin=cs_pin, chunk_size=chunk_size)
             peripherals.append(spi)
         else:
             raise ValueError("Invalid configuration for SPI, expected dictionary with keys 'bus', 'device', and other SPI parameters.")
 
-    # # CAN
-    # if 'can' in config.get('peripherals', {}):
-    #     can_config = config['peripherals']['can']
-    #     if isinstance(can_config, dict):
-    #         can = RPiCAN(can_config['interface'])
-    #         peripherals.append(can)
-    #     else:
-    #         raise ValueError("Invalid configuration for CAN, expected dictionary with key 'interface'.")
-
-    # # ADC
-    # if 'adc' in config.get('peripherals', {}):
-    #     adc_config = config['peripherals']['adc']
-    #     if isinstance(adc_config, dict):
-    #         adc = RPiADC(adc_config['channel'])
-    #         peripherals.append(adc)
-    #     else:
-    #         raise ValueError("Invalid configuration for ADC, expected dictionary with key 'channel'.")
+    # CAN
+    if 'can' in config.get('peripherals', {}):
+        can_config = config['peripherals']['can']
+        if isinstance(can_config, dict):
+            can = RPiCAN(interface=can_config.get('interface', 'can0'), bitrate=can_config.get('bitrate', 500000),
+                         backend=can_config.get('backend', 'socketcan'),  # 'virtual' - magistrala w procesie
+                         configure_link=can_config.get('configure_link', True),
+                         use_sudo=can_config.get('use_sudo', True),
+                         virtual_bus=can_config.get('virtual_bus', 'virtual'))
+            peripherals.append(can)
+        else:
+            raise ValueError("Invalid configuration for CAN, expected dictionary with key 'interface'.")
+
+    # ADC (MCP3xxx na SPI)
+    if 'adc' in config.get('peripherals', {}):
+        adc_config = config['peripherals']['adc']
+        if isinstance(adc_config, dict):
+            adc = RPiADC(bus=adc_config.get('bus', 0), device=adc_config.get('device', 0),
+                         chip=adc_config.get('chip', 'MCP3008'), channels=adc_config.get('channels'),
+                         vref=adc_config.get('vref', 3.3), max_speed_hz=adc_config.get('max_speed_hz', 1000000),
+                         frames_per_transfer=adc_config.get('frames_per_transfer', 64),
+                         block_frames=adc_config.get('block_frames', 4096),
+                         sample_rate=adc_config.get('sample_rate'), chunk_size=adc_config.get('chunk_size'))
+            peripherals.append(adc)
+        else:
+            raise ValueError("Invalid configuration for ADC, expected dictionary with keys 'chip' and 'channels'.")
 
     # # EEPROM
     # if 'eeprom' in config.get('peripherals', {}):
@@ -0,0 +1,205 @@
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+from array import array
+from core.instrumentation import device_keys, instrumented_methods, unwrap_methods, wrap_methods
+
+# Kategorie zdarzeń (indeks w tablicy kategorii zapisanej przy każdym zdarzeniu)
+CATEGORIES = ("test", "setup", "teardown", "protocol", "peripheral", "logger", "user")
+_CATEGORY_IDS = {name: index for index, name in enumerate(CATEGORIES)}
+
+
+class _Span:
+    def __init__(self, profiler, name_id, category_id):
+        self._profiler = profiler
+        self._name_id = name_id
+        self._category_id = category_id
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profiler.add(self._name_id, self._category_id, self._start, time.perf_counter_ns())
+        return False
+
+
+class TraceProfiler:
+    def __init__(self, path, capacity=1000000, use_cprofile=False):
+        """
+        Profiler zapisujący przedziały czasu (testy, setup/teardown grup, wywołania urządzeń, logowanie)
+        w formacie Chrome trace-event JSON (chrome://tracing, ui.perfetto.dev).
+        Zdarzenia trafiają do prealokowanych tablic; JSON jest budowany dopiero w write().
+        :param path: Ścieżka do pliku wynikowego .json.
+        :param capacity: Maksymalna liczba zdarzeń (nadmiarowe są liczone w dropped).
+        :param use_cprofile: Czy dodatkowo zbierać statystyki cProfile dla każdego testu
+                             (zapisywane do katalogu <path>.pstats; zwiększa narzut testów).
+        """
+        self.path = path
+        self.capacity = capacity
+        self.use_cprofile = use_cprofile
+        self.dropped = 0
+        self._starts = array("q", bytes(8 * capacity))
+        self._durations = array("q", bytes(8 * capacity))
+        self._names = array("I", bytes(4 * capacity))
+        self._categories = array("B", bytes(capacity))
+        self._threads = array("q", bytes(8 * capacity))
+        self._used = 0
+        self._index_lock = threading.Lock()
+        self._name_ids = {}
+        self._name_list = []
+        self._name_lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._wrapped = []
+        self._profiles = []  # [(nazwa testu, cProfile.Profile)]
+
+    @property
+    def count(self):
+        return min(self._used, self.capacity)
+
+    def name_id(self, name):
+        """
+        Zwraca identyfikator nazwy zdarzenia (nazwy są przechowywane raz).
+        """
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            with self._name_lock:
+                name_id = self._name_ids.setdefault(name, len(self._name_list))
+                if name_id == len(self._name_list):
+                    self._name_list.append(name)
+        return name_id
+
+    def add(self, name_id, category_id, start, end):
+        """
+        Zapisuje zdarzenie w kolejnej pozycji tablic (pozycja przydzielana pod blokadą - zdarzenia z wielu wątków).
+        """
+        with self._index_lock:
+            index = self._used
+            self._used = index + 1
+        if index >= self.capacity:
+            self.dropped += 1
+            return
+        self._starts[index] = start
+        self._durations[index] = end - start
+        self._names[index] = name_id
+        self._categories[index] = category_id
+        self._threads[index] = threading.get_native_id()
+
+    def span(self, name, category="user"):
+        """
+        Menedżer kontekstu do oznaczania własnych fragmentów testu:
+            with profiler.span("flash firmware"): ...
+        """
+        return _Span(self, self.name_id(name), _CATEGORY_IDS[category])
+
+    def _timed(self, name, category, function):
+        name_id = self.name_id(name)
+        category_id = _CATEGORY_IDS[category]
+        add = self.add
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                add(name_id, category_id, start, time.perf_counter_ns())
+        return wrapper
+
+    def attach_devices(self, devices):
+        """
+        Obejmuje profilowaniem metody urządzeń (te same, które nagrywa Recorder).
+        """
+        for group, key, device in device_keys(devices):
+            category = "protocol" if group == "protocols" else "peripheral"
+            methods = instrumented_methods(device)
+            factory = lambda name, original, key=key, category=category: \
+                self._timed(f"{key}.{name}", category, original)
+            self._wrapped.append((device, wrap_methods(device, factory, methods)))
+
+    def attach_logger(self, logger):
+        """
+        Obejmuje profilowaniem zapisy loggera do konsoli i pliku.
+        """
+        methods = [name for name in ("_log_to_console", "_log_to_file", "flush_log") if hasattr(logger, name)]
+        factory = lambda name, original: self._timed(f"Logger.{name.lstrip('_')}", "logger", original)
+        self._wrapped.append((logger, wrap_methods(logger, factory, methods)))
+
+    def attach_framework(self, framework):
+        """
+        Obejmuje profilowaniem setup/teardown grup (opakowania z create_test_group) oraz Test.run.
+        """
+        for group in framework.test_groups:
+            if group.setup:
+                group.setup = self._timed(f"{group.name}: setup", "setup", group.setup)
+            if group.teardown:
+                group.teardown = self._timed(f"{group.name}: teardown", "teardown", group.teardown)
+            for test in group.tests:
+                name = f"{group.name}: {test.name}"
+                factory = lambda method_name, original, name=name: self._timed(name, "test", self._with_cprofile(name, original))
+                self._wrapped.append((test, wrap_methods(test, factory, ["run"])))
+
+    def _with_cprofile(self, name, function):
+        if not self.use_cprofile:
+            return function
+
+        def wrapper(*args, **kwargs):
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profile.disable()
+                self._profiles.append((name, profile))
+        return wrapper
+
+    def detach(self):
+        """
+        Przywraca oryginalne metody (setup/teardown grup pozostają opakowane - narzut jest pomijalny).
+        """
+        for target, originals in reversed(self._wrapped):
+            unwrap_methods(target, originals)
+        self._wrapped.clear()
+
+    def totals(self):
+        """
+        Łączny czas zdarzeń według kategorii [s] (zagnieżdżone przedziały liczą się w każdej kategorii osobno).
+        """
+        count = self.count
+        totals = {}
+        for category_id, duration in zip(self._categories[:count], self._durations[:count]):
+            category = CATEGORIES[category_id]
+            totals[category] = totals.get(category, 0) + duration
+        return {category: value / 1e9 for category, value in totals.items()}
+
+    def write(self):
+        """
+        Zapisuje plik trace-event JSON (oraz statystyki cProfile, jeśli były zbierane).
+        :return: Liczba zapisanych zdarzeń.
+        """
+        count = self.count
+        pid = os.getpid()
+        origin = self._origin
+        names = self._name_list
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "PY_MICRO_HIL"}}]
+        for thread in threading.enumerate():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread.native_id,
+                           "args": {"name": thread.name}})
+        for start, duration, name_id, category_id, thread in zip(self._starts[:count], self._durations[:count],
+                                                                self._names[:count], self._categories[:count],
+                                                                self._threads[:count]):
+            events.append({"name": names[name_id], "cat": CATEGORIES[category_id], "ph": "X", "pid": pid,
+                           "tid": thread, "ts": (start - origin) / 1000, "dur": duration / 1000})
+        with open(self.path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"dropped_events": self.dropped}}, f)
+        if self._profiles:
+            directory = f"{self.path}.pstats"
+            os.makedirs(directory, exist_ok=True)
+            for index, (name, profile) in enumerate(self._profiles):
+                file_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+                profile.dump_stats(os.path.join(directory, f"{index:04d}_{file_name}.pstats"))
+        return count
@@ -0,0 +1,202 @@
+import threading
+import time
+import numpy as np
+
+# Przy dłuższym czasie do następnego kroku wątek zasypia zamiast aktywnie czekać
+_SLEEP_THRESHOLD_NS = 200000
+
+
+class SweepProfile:
+    def __init__(self, offsets, duty_cycles, frequencies=None):
+        """
+        Przeliczony z góry przebieg PWM: lista kroków (czas od startu, wypełnienie, częstotliwość).
+        :param offsets: Czasy kroków w sekundach względem początku profilu (niemalejące).
+        :param duty_cycles: Wypełnienia w procentach (0-100).
+        :param frequencies: (Opcjonalne) częstotliwości w Hz; NaN oznacza brak zmiany częstotliwości.
+        """
+        self.offsets = np.round(np.asarray(offsets, dtype=np.float64) * 1e9).astype(np.int64)
+        self.duty_cycles = np.clip(np.asarray(duty_cycles, dtype=np.float64), 0, 100)
+        if frequencies is None:
+            frequencies = np.full(self.offsets.size, np.nan)
+        self.frequencies = np.asarray(frequencies, dtype=np.float64)
+        if not self.offsets.size == self.duty_cycles.size == self.frequencies.size:
+            raise ValueError("Sweep profile offsets, duty cycles and frequencies must have the same length.")
+        if np.any(np.diff(self.offsets) < 0):
+            raise ValueError("Sweep profile offsets must be non-decreasing.")
+
+    def __len__(self):
+        return int(self.offsets.size)
+
+    @property
+    def duration(self):
+        return self.offsets[-1] / 1e9 if self.offsets.size else 0.0
+
+    def __add__(self, other):
+        """
+        Łączy profile - drugi profil zaczyna się krok (odstęp ostatniego kroku) po zakończeniu pierwszego.
+        """
+        gap = int(self.offsets[-1] - self.offsets[-2]) if self.offsets.size > 1 else 0
+        shift = (self.offsets[-1] + gap) if self.offsets.size else 0
+        profile = SweepProfile([], [])
+        profile.offsets = np.concatenate([self.offsets, other.offsets + shift])
+        profile.duty_cycles = np.concatenate([self.duty_cycles, other.duty_cycles])
+        profile.frequencies = np.concatenate([self.frequencies, other.frequencies])
+        return profile
+
+    @classmethod
+    def ramp(cls, start, stop, duration, step_interval, frequency=None):
+        """
+        Liniowa zmiana wypełnienia od start do stop.
+        :param duration: Czas trwania rampy w sekundach.
+        :param step_interval: Odstęp między krokami w sekundach.
+        :param frequency: (Opcjonalna) stała częstotliwość ustawiana w pierwszym kroku.
+        """
+        count = max(int(round(duration / step_interval)), 1) + 1
+        offsets = np.arange(count) * step_interval
+        return cls(offsets, np.linspace(start, stop, count), cls._first_frequency(count, frequency))
+
+    @classmethod
+    def steps(cls, levels, dwell, frequencies=None):
+        """
+        Skoki wypełnienia; każdy poziom utrzymywany jest przez czas dwell.
+        :param levels: Lista wypełnień w procentach.
+        :param dwell: Czas utrzymania poziomu w sekundach.
+        :param frequencies: (Opcjonalna) lista częstotliwości dla poszczególnych poziomów.
+        """
+        offsets = np.arange(len(levels)) * dwell
+        return cls(offsets, levels, frequencies)
+
+    @classmethod
+    def sine(cls, center, amplitude, period, duration, step_interval, frequency=None):
+        """
+        Sinusoidalna zmiana wypełnienia: center + amplitude * sin(2 pi t / period).
+        """
+        count = max(int(round(duration / step_interval)), 1) + 1
+        offsets = np.arange(count) * step_interval
+        duty = center + amplitude * np.sin(2 * np.pi * offsets / period)
+        return cls(offsets, duty, cls._first_frequency(count, frequency))
+
+    @classmethod
+    def frequency_ramp(cls, start, stop, duration, step_interval, duty_cycle=50):
+        """
+        Liniowa zmiana częstotliwości przy stałym wypełnieniu.
+        """
+        count = max(int(round(duration / step_interval)), 1) + 1
+        offsets = np.arange(count) * step_interval
+        return cls(offsets, np.full(count, duty_cycle, dtype=np.float64), np.linspace(start, stop, count))
+
+    @staticmethod
+    def _first_frequency(count, frequency):
+        frequencies = np.full(count, np.nan)
+        if frequency is not None:
+            frequencies[0] = frequency
+        return frequencies
+
+
+class PWMSweep:
+    def __init__(self, pwm, profile, repeat=1):
+        """
+        Odtwarza profil PWM w wątku tła według harmonogramu liczonego od startu (bez kumulacji opóźnień).
+        Rzeczywisty czas wykonania każdego kroku jest zapisywany w prealokowanej tablicy.
+        :param pwm: Instancja RPiPWM (dowolny backend).
+        :param profile: Obiekt SweepProfile.
+        :param repeat: Liczba powtórzeń profilu.
+        """
+        if not len(profile):
+            raise ValueError("Sweep profile is empty.")
+        self.pwm = pwm
+        self.profile = profile
+        self.repeat = repeat
+        self.timestamps = np.zeros(len(profile) * repeat, dtype=np.int64)
+        self.steps_done = 0
+        self.error = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def _run(self):
+        profile = self.profile
+        offsets = profile.offsets.tolist()
+        duty_cycles = profile.duty_cycles.tolist()
+        frequencies = profile.frequencies.tolist()
+        set_duty_cycle = self.pwm.set_duty_cycle
+        set_frequency = self.pwm.set_frequency
+        timestamps = self.timestamps
+        # Odstęp między powtórzeniami równy odstępowi ostatnich kroków profilu
+        gap = offsets[-1] - offsets[-2] if len(offsets) > 1 else 0
+        cycle = offsets[-1] + gap
+        index = 0
+        start = time.perf_counter_ns()
+        try:
+            for iteration in range(self.repeat):
+                base = start + iteration * cycle
+                for offset, duty, frequency in zip(offsets, duty_cycles, frequencies):
+                    target = base + offset
+                    remaining = target - time.perf_counter_ns()
+                    if remaining > _SLEEP_THRESHOLD_NS:
+                        if self._stop_event.wait((remaining - _SLEEP_THRESHOLD_NS) / 1e9):
+                            return
+                    while time.perf_counter_ns() < target:
+                        pass
+                    if self._stop_event.is_set():
+                        return
+                    if frequency == frequency:  # NaN - bez zmiany częstotliwości
+                        set_frequency(frequency)
+                    set_duty_cycle(duty)
+                    timestamps[index] = time.perf_counter_ns() - start
+                    index += 1
+                    self.steps_done = index
+        except Exception as e:
+            self.error = e
+
+    def start(self):
+        """
+        Uruchamia odtwarzanie profilu w tle.
+        """
+        if self.running:
+            raise RuntimeError("PWM sweep is already running.")
+        self._stop_event.clear()
+        self.steps_done = 0
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="PWMSweep", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        """
+        Czeka na zakończenie profilu.
+        :return: True, jeśli profil został odtworzony (lub przerwany).
+        :raises RuntimeError: Jeśli ustawienie PWM zakończyło się błędem.
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            return False
+        if self.error is not None:
+            raise RuntimeError(f"PWM sweep failed at step {self.steps_done}: {self.error}")
+        return True
+
+    def stop(self):
+        """
+        Przerywa odtwarzanie profilu (PWM pozostaje z ostatnio ustawionym wypełnieniem).
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def scheduled(self):
+        """
+        Zwraca zaplanowane czasy kroków [ns] względem startu (dla wszystkich powtórzeń).
+        """
+        offsets = self.profile.offsets
+        gap = offsets[-1] - offsets[-2] if offsets.size > 1 else 0
+        cycle = offsets[-1] + gap
+        return (offsets[None, :] + cycle * np.arange(self.repeat)[:, None]).ravel()
+
+    def lateness(self):
+        """
+        Opóźnienia wykonanych kroków względem harmonogramu [ns].
+        """
+        return self.timestamps[:self.steps_done] - self.scheduled()[:self.steps_done]
@@ -0,0 +1,352 @@
+import builtins
+import collections
+import inspect
+import marshal
+import struct
+import threading
+import time
+from core.instrumentation import device_keys, instrumented_methods, unwrap_methods, wrap_methods
+
+RECORD_MAGIC = b"PMHREC1\n"
+# Nagłówek rekordu: długość danych, czas od rozpoczęcia nagrywania [ns]
+_RECORD_HEADER = struct.Struct("<Iq")
+_MARSHAL_VERSION = 4
+# Parametry wyjściowe (bufory wypełniane przez metodę) nie są zapisywane jako argumenty
+_OUTPUT_PARAMETERS = ("out",)
+# Klucz słownika oznaczający zapisany obiekt odpowiedzi (np. odpowiedź pymodbus z isError())
+_RESPONSE_KEY = "__response__"
+# Atrybuty odpowiedzi zapisywane obok wyniku isError()
+_RESPONSE_ATTRIBUTES = ("function_code", "address", "value", "count", "registers", "bits", "exception_code")
+
+
+def _normalize_response(value):
+    """
+    Zapis obiektu odpowiedzi: nazwa klasy, wynik isError(), repr() i proste atrybuty.
+    """
+    attributes = {}
+    for name in _RESPONSE_ATTRIBUTES:
+        attribute = getattr(value, name, None)
+        if attribute is None or isinstance(attribute, (bool, int, float, str, bytes, list, tuple)):
+            attributes[name] = _normalize(attribute)
+    return {_RESPONSE_KEY: type(value).__name__, "is_error": bool(value.isError()), "repr": repr(value),
+            "attributes": attributes}
+
+
+def _normalize(value):
+    """
+    Sprowadza wartość do typów obsługiwanych przez marshal. Obiekty odpowiedzi z metodą isError()
+    (pymodbus) zapisywane są w postaci strukturalnej i odtwarzane jako ReplayResponse;
+    pozostałe obiekty zapisywane są jako repr() i w trybie replay zwracane jako napis.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return value
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_normalize(item) for item in value)
+    if isinstance(value, dict):
+        return {_normalize(key): _normalize(item) for key, item in value.items()}
+    if callable(getattr(value, "isError", None)):
+        return _normalize_response(value)
+    return repr(value)
+
+
+class ReplayResponse:
+    def __init__(self, is_error, text, attributes):
+        """
+        Odtworzona odpowiedź (np. pymodbus): isError(), nagrane atrybuty i repr() jak w nagraniu.
+        Klasy tworzone są dynamicznie z nazwą oryginalnej klasy odpowiedzi.
+        """
+        self._is_error = is_error
+        self._text = text
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+    def isError(self):
+        return self._is_error
+
+    def __repr__(self):
+        return self._text
+
+
+_response_classes = {}
+
+
+def _restore(value):
+    """
+    Odtwarza obiekty odpowiedzi zapisane przez _normalize_response (również zagnieżdżone w listach i krotkach).
+    """
+    if isinstance(value, dict) and _RESPONSE_KEY in value:
+        class_name = value[_RESPONSE_KEY]
+        if class_name not in _response_classes:
+            _response_classes[class_name] = type(class_name, (ReplayResponse,), {})
+        return _response_classes[class_name](value["is_error"], value["repr"], value["attributes"])
+    if isinstance(value, list):
+        return [_restore(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_restore(item) for item in value)
+    return value
+
+
+def _attributes(device):
+    """
+    Proste atrybuty urządzenia (liczby, napisy, listy) odtwarzane w trybie replay.
+    """
+    attributes = {}
+    for name, value in vars(device).items():
+        if not name.startswith("_") and (value is None or isinstance(value, (bool, int, float, str, list, tuple, dict))):
+            attributes[name] = _normalize(value)
+    return attributes
+
+
+def read_records(path):
+    """
+    Generator rekordów dziennika: krotki (czas [ns], rekord).
+    Niepełny rekord na końcu pliku (przerwane nagrywanie) jest pomijany.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(RECORD_MAGIC)) != RECORD_MAGIC:
+            raise ValueError(f"File {path} is not a PY_MICRO_HIL recording.")
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            length, timestamp = _RECORD_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            yield timestamp, marshal.loads(payload)
+
+
+class Recorder:
+    def __init__(self, path):
+        """
+        Nagrywa wywołania metod urządzeń (argumenty, wynik lub wyjątek, czas trwania) oraz wyniki testów
+        do binarnego dziennika dopisywanego na bieżąco (marshal + nagłówek długości i czasu).
+        :param path: Ścieżka do pliku dziennika.
+        """
+        self.path = path
+        self.records = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._start = time.perf_counter_ns()
+        self._wrapped = []
+
+    def _write(self, record):
+        payload = marshal.dumps(record, _MARSHAL_VERSION)
+        with self._lock:
+            self._file.write(_RECORD_HEADER.pack(len(payload), time.perf_counter_ns() - self._start) + payload)
+            self._file.flush()
+            self.records += 1
+
+    def attach(self, devices):
+        """
+        Otwiera dziennik (istniejący plik jest nadpisywany - jeden dziennik to jeden przebieg)
+        i obejmuje nagrywaniem metody wszystkich urządzeń.
+        :param devices: Słownik {"protocols": [...], "peripherals": [...]}.
+        """
+        self._file = open(self.path, "wb")
+        self._file.write(RECORD_MAGIC)
+        description = []
+        for group, key, device in device_keys(devices):
+            methods = instrumented_methods(device)
+            parameters = {name: list(inspect.signature(getattr(device, name)).parameters) for name in methods}
+            description.append((group, key, type(device).__name__, _attributes(device), parameters))
+            self._wrapped.append((device, wrap_methods(device, self._wrapper_factory(key), methods)))
+        self._write(("devices", description))
+
+    def _wrapper_factory(self, key):
+        def factory(name, original):
+            signature = inspect.signature(original)
+
+            def wrapper(*args, **kwargs):
+                # Nagrywane są tylko wywołania z testów, nie wywołania zagnieżdżone wewnątrz innych metod
+                depth = getattr(self._local, "depth", 0)
+                self._local.depth = depth + 1
+                start = time.perf_counter_ns()
+                try:
+                    result = original(*args, **kwargs)
+                except Exception as e:
+                    if not depth:
+                        self._record_call(key, name, signature, args, kwargs, False,
+                                          (type(e).__name__, str(e)), time.perf_counter_ns() - start)
+                    raise
+                finally:
+                    self._local.depth = depth
+                if not depth:
+                    self._record_call(key, name, signature, args, kwargs, True, result, time.perf_counter_ns() - start)
+                return result
+            return wrapper
+        return factory
+
+    def _record_call(self, key, name, signature, args, kwargs, ok, value, duration):
+        try:
+            arguments = signature.bind(*args, **kwargs).arguments
+        except TypeError:
+            arguments = {"args": args, "kwargs": kwargs}
+        arguments = {parameter: argument for parameter, argument in arguments.items()
+                     if parameter not in _OUTPUT_PARAMETERS}
+        self._write(("call", key, name, _normalize(arguments), ok, _normalize(value), duration))
+
+    def record_result(self, group_name, test_name, passed, details=None, assertions=1, failed_assertions=None):
+        """
+        Słuchacz wyników TestFramework - zapisuje wynik asercji do dziennika.
+        """
+        self._write(("result", group_name, test_name, passed, _normalize(details)))
+
+    def close(self):
+        """
+        Przywraca oryginalne metody urządzeń i zamyka dziennik.
+        """
+        for device, originals in reversed(self._wrapped):
+            unwrap_methods(device, originals)
+        self._wrapped.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReplayDevice:
+    def __init__(self, replay, key, attributes, parameters):
+        """
+        Urządzenie odtwarzające nagrane odpowiedzi zamiast komunikacji ze sprzętem.
+        Klasy tworzone są dynamicznie z nazwą oryginalnej klasy, więc get_device() działa bez zmian w testach.
+        """
+        self._replay = replay
+        self._key = key
+        self._attributes = attributes
+        for name, value in attributes.items():
+            setattr(self, name, value)
+        for name, names in parameters.items():
+            setattr(self, name, self._make_method(name, names))
+
+    def _make_method(self, name, parameter_names):
+        def method(*args, **kwargs):
+            arguments = dict(zip(parameter_names, args))
+            arguments.update(kwargs)
+            return self._replay.call(self._key, name, arguments)
+        method.__name__ = name
+        return method
+
+    def get_required_resources(self):
+        return {"pins": [], "ports": []}
+
+    def get_initialized_params(self):
+        return {"replay": self._key}
+
+    def initialize(self):
+        pass
+
+    def release(self):
+        pass
+
+
+class ReplayLog:
+    def __init__(self, path, strict=False):
+        """
+        Odtwarza dziennik nagrany przez Recorder: kolejne wywołanie danej metody urządzenia otrzymuje
+        kolejną nagraną odpowiedź (bez opóźnień magistrali). Argumenty są porównywane z nagranymi.
+        :param path: Ścieżka do pliku dziennika.
+        :param strict: Czy rozbieżność argumentów ma przerywać test (RuntimeError) zamiast być tylko zgłaszana.
+        """
+        self.path = path
+        self.strict = strict
+        self.devices = []
+        self.results = []
+        self.divergences = []
+        self.replayed = 0
+        self._calls = collections.defaultdict(collections.deque)
+        for _, record in read_records(path):
+            kind = record[0]
+            if kind == "devices":
+                self.devices = record[1]
+            elif kind == "call":
+                _, key, name, arguments, ok, value, duration = record
+                self._calls[(key, name)].append((arguments, ok, value))
+            elif kind == "result":
+                self.results.append(record[1:4])
+
+    def build_devices(self):
+        """
+        Tworzy urządzenia odtwarzające w układzie słownika PeripheralManager.devices.
+        """
+        devices = {}
+        classes = {}
+        for group, key, class_name, attributes, parameters in self.devices:
+            if class_name not in classes:
+                classes[class_name] = type(class_name, (ReplayDevice,), {})
+            devices.setdefault(group, []).append(classes[class_name](self, key, attributes, parameters))
+        return devices
+
+    def call(self, key, name, arguments):
+        queue = self._calls.get((key, name))
+        if not queue:
+            raise RuntimeError(f"Replay: no recorded response left for {key}.{name}().")
+        recorded_arguments, ok, value = queue.popleft()
+        self.replayed += 1
+        output = arguments.pop("out", None)
+        if _normalize(arguments) != recorded_arguments:
+            message = f"{key}.{name}() called with {_normalize(arguments)}, recorded {recorded_arguments}"
+            self.divergences.append(message)
+            if self.strict:
+                raise RuntimeError(f"Replay diverged: {message}")
+        if not ok:
+            exception_name, message = value
+            exception_class = getattr(builtins, exception_name, None)
+            if not (isinstance(exception_class, type) and issubclass(exception_class, Exception)):
+                exception_class = RuntimeError
+            raise exception_class(message)
+        if output is not None and isinstance(value, bytes):
+            output[:len(value)] = value
+            return output
+        return _restore(value)
+
+    def remaining(self):
+        """
+        Liczba nagranych wywołań, które nie zostały odtworzone.
+        """
+        return sum(len(queue) for queue in self._calls.values())
+
+    def compare_results(self, results):
+        """
+        Porównuje wyniki bieżącego przebiegu z nagranymi.
+        :param results: Lista krotek (grupa, test, passed).
+        :return: Lista opisów różnic.
+        """
+        original = collections.defaultdict(list)
+        for group_name, test_name, passed in self.results:
+            original[(group_name, test_name)].append(passed)
+        current = collections.defaultdict(list)
+        for group_name, test_name, passed in results:
+            current[(group_name, test_name)].append(passed)
+        differences = []
+        for test in list(original) + [test for test in current if test not in original]:
+            if original.get(test, []) != current.get(test, []):
+                differences.append(f"{test[0]}, {test[1]}: recorded {self._describe(original.get(test))}, "
+                                   f"replayed {self._describe(current.get(test))}")
+        return differences
+
+    @staticmethod
+    def _describe(results):
+        if not results:
+            return "not run"
+        return "PASS" if all(results) else f"FAIL ({results.count(False)} of {len(results)} assertions)"
+
+    def report(self, results, logger):
+        """
+        Loguje podsumowanie odtwarzania i porównanie z nagranym przebiegiem.
+        """
+        logger.log("\n=================== REPLAY SUMMARY ===================", to_console=True)
+        logger.log(f"[INFO] Replayed {self.replayed} calls from {self.path}, {self.remaining()} recorded calls unused.",
+                   to_console=True)
+        for divergence in self.divergences:
+            logger.log(f"[WARNING] Replay diverged: {divergence}", to_console=True)
+        differences = self.compare_results(results)
+        for difference in differences:
+            logger.log(f"[WARNING] Result differs from recording: {difference}", to_console=True)
+        if not differences:
+            logger.log("[INFO] All test results match the recording.", to_console=True)
+        return differences
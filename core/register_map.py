@@ -0,0 +1,222 @@
+class Field:
+    def __init__(self, name, lsb, width=1):
+        """
+        Pole bitowe rejestru.
+        :param name: Nazwa pola (unikalna w całej mapie rejestrów).
+        :param lsb: Pozycja najmłodszego bitu pola.
+        :param width: Szerokość pola w bitach.
+        """
+        self.name = name
+        self.lsb = lsb
+        self.width = width
+        self.mask = ((1 << width) - 1) << lsb
+
+    def extract(self, register_value):
+        return (register_value & self.mask) >> self.lsb
+
+    def insert(self, register_value, value):
+        if value >> self.width:
+            raise ValueError(f"Value {value} does not fit in {self.width}-bit field '{self.name}'.")
+        return (register_value & ~self.mask) | (value << self.lsb)
+
+
+class Register:
+    def __init__(self, name, address, size=1, byteorder="big", volatile=False, fields=None):
+        """
+        Opis rejestru urządzenia I2C.
+        :param name: Nazwa rejestru.
+        :param address: Adres rejestru w urządzeniu.
+        :param size: Rozmiar rejestru w bajtach (zajmuje adresy address .. address + size - 1).
+        :param byteorder: Kolejność bajtów wartości wielobajtowej ('big' lub 'little').
+        :param volatile: Czy wartość może zmieniać się niezależnie od zapisów (np. status, pomiar).
+                         Rejestry nieulotne są odczytywane z kopii lokalnej (shadow).
+        :param fields: Lista obiektów Field.
+        """
+        self.name = name
+        self.address = address
+        self.size = size
+        self.byteorder = byteorder
+        self.volatile = volatile
+        self.fields = fields or []
+
+    def decode(self, data):
+        return int.from_bytes(data, self.byteorder)
+
+    def encode(self, value):
+        return value.to_bytes(self.size, self.byteorder)
+
+
+class RegisterMap:
+    def __init__(self, i2c, device_address, registers, register_size=1):
+        """
+        Mapa rejestrów urządzenia I2C z kopią lokalną (shadow) i łączeniem zapisów.
+        Zapisy trafiają najpierw do kopii lokalnej; flush() łączy sąsiadujące zmienione rejestry
+        w pojedyncze zapisy blokowe.
+        :param i2c: Instancja RPiI2C.
+        :param device_address: Adres urządzenia slave.
+        :param registers: Lista obiektów Register.
+        :param register_size: Rozmiar adresu rejestru przesyłanego na magistralę (1 lub 2 bajty).
+        """
+        self.i2c = i2c
+        self.device_address = device_address
+        self.register_size = register_size
+        self.registers = {}
+        self.fields = {}
+        for register in sorted(registers, key=lambda r: r.address):
+            if register.name in self.registers:
+                raise ValueError(f"Duplicate register name '{register.name}'.")
+            self.registers[register.name] = register
+            for field in register.fields:
+                if field.name in self.fields:
+                    raise ValueError(f"Duplicate field name '{field.name}'.")
+                self.fields[field.name] = (register, field)
+        self._shadow = {}  # {nazwa rejestru: wartość}
+        self._dirty = set()
+        self.bus_reads = 0
+        self.bus_writes = 0
+
+    @classmethod
+    def from_dict(cls, i2c, device_address, spec, register_size=1):
+        """
+        Tworzy mapę rejestrów z opisu deklaratywnego (np. wczytanego z YAML):
+            {"CTRL1": {"address": 0x20, "size": 1, "volatile": False,
+                       "fields": {"ODR": {"lsb": 4, "width": 4}, "EN": {"lsb": 0}}}}
+        :return: Obiekt RegisterMap.
+        """
+        registers = []
+        for name, register_spec in spec.items():
+            fields = [Field(field_name, field_spec["lsb"], field_spec.get("width", 1))
+                      for field_name, field_spec in register_spec.get("fields", {}).items()]
+            registers.append(Register(
+                name,
+                register_spec["address"],
+                size=register_spec.get("size", 1),
+                byteorder=register_spec.get("byteorder", "big"),
+                volatile=register_spec.get("volatile", False),
+                fields=fields,
+            ))
+        return cls(i2c, device_address, registers, register_size=register_size)
+
+    def _register(self, name):
+        try:
+            return self.registers[name]
+        except KeyError:
+            raise ValueError(f"Register '{name}' not found in register map.")
+
+    def _field(self, name):
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise ValueError(f"Field '{name}' not found in register map.")
+
+    def read(self, name, refresh=False):
+        """
+        Zwraca wartość rejestru. Rejestry nieulotne są czytane z kopii lokalnej, o ile jest aktualna.
+        :param name: Nazwa rejestru.
+        :param refresh: Wymusza odczyt z urządzenia.
+        """
+        register = self._register(name)
+        if register.volatile or refresh or name not in self._shadow:
+            if name in self._dirty:
+                raise RuntimeError(f"Register '{name}' has unflushed changes; call flush() before reading it from the device.")
+            data = self.i2c.read_bulk(self.device_address, register.address, register.size, self.register_size)
+            self.bus_reads += 1
+            self._shadow[name] = register.decode(data)
+        return self._shadow[name]
+
+    def write(self, name, value):
+        """
+        Zapisuje wartość rejestru w kopii lokalnej i oznacza go jako zmieniony (bez transakcji na magistrali).
+        """
+        register = self._register(name)
+        if value < 0 or value >> (8 * register.size):
+            raise ValueError(f"Value {value} does not fit in {register.size}-byte register '{name}'.")
+        self._shadow[name] = value
+        self._dirty.add(name)
+
+    def read_field(self, name, refresh=False):
+        """
+        Zwraca wartość pola bitowego.
+        """
+        register, field = self._field(name)
+        return field.extract(self.read(register.name, refresh=refresh))
+
+    def write_field(self, name, value):
+        """
+        Modyfikuje pole bitowe w kopii lokalnej (read-modify-write bez zapisu na magistralę).
+        Wartość rejestru jest pobierana z urządzenia tylko wtedy, gdy kopia lokalna jest nieznana
+        lub rejestr jest ulotny.
+        """
+        register, field = self._field(name)
+        current = self._shadow[register.name] if register.name in self._dirty else self.read(register.name)
+        self._shadow[register.name] = field.insert(current, value)
+        self._dirty.add(register.name)
+
+    def configure(self, **values):
+        """
+        Ustawia wiele rejestrów i/lub pól naraz, a następnie wykonuje flush().
+        :param values: Pary nazwa=wartość (nazwa rejestru lub pola).
+        :return: Liczba wykonanych transakcji zapisu.
+        """
+        for name, value in values.items():
+            if name in self.registers:
+                self.write(name, value)
+            else:
+                self.write_field(name, value)
+        return self.flush()
+
+    def flush(self):
+        """
+        Zapisuje zmienione rejestry, łącząc sąsiadujące adresy w pojedyncze zapisy blokowe.
+        :return: Liczba wykonanych transakcji zapisu.
+        """
+        if not self._dirty:
+            return 0
+        dirty = sorted((self.registers[name] for name in self._dirty), key=lambda r: r.address)
+        transactions = 0
+        start = dirty[0].address
+        block = bytearray()
+        for register in dirty:
+            if block and register.address != start + len(block):
+                self.i2c.write_bulk(self.device_address, start, block, self.register_size)
+                transactions += 1
+                start = register.address
+                block = bytearray()
+            block += register.encode(self._shadow[register.name])
+        self.i2c.write_bulk(self.device_address, start, block, self.register_size)
+        transactions += 1
+        self.bus_writes += transactions
+        self._dirty.clear()
+        return transactions
+
+    def refresh(self, names=None):
+        """
+        Odczytuje rejestry z urządzenia do kopii lokalnej, łącząc sąsiadujące adresy w odczyty blokowe.
+        :param names: (Opcjonalna) lista nazw rejestrów; domyślnie wszystkie niezmienione rejestry.
+        :return: Liczba wykonanych transakcji odczytu.
+        """
+        names = self.registers.keys() if names is None else names
+        selected = sorted((self._register(name) for name in names if name not in self._dirty), key=lambda r: r.address)
+        transactions = 0
+        group = []
+        for register in selected + [None]:
+            if group and (register is None or register.address != group[-1].address + group[-1].size):
+                start = group[0].address
+                length = group[-1].address + group[-1].size - start
+                data = self.i2c.read_bulk(self.device_address, start, length, self.register_size)
+                for member in group:
+                    offset = member.address - start
+                    self._shadow[member.name] = member.decode(data[offset:offset + member.size])
+                transactions += 1
+                group = []
+            if register is not None:
+                group.append(register)
+        self.bus_reads += transactions
+        return transactions
+
+    def invalidate(self):
+        """
+        Unieważnia kopię lokalną (np. po resecie urządzenia); niezapisane zmiany są odrzucane.
+        """
+        self._shadow.clear()
+        self._dirty.clear()
@@ -0,0 +1,364 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from core.test_framework import TestFramework
+
+DEFAULT_DURATIONS_FILE = ".test_durations.json"
+# Wygładzanie historycznych czasów grup (średnia wykładnicza)
+DURATION_SMOOTHING = 0.5
+# Domyślny szacowany czas grupy bez historii [s], gdy brak jakichkolwiek pomiarów
+DEFAULT_ESTIMATE = 1.0
+
+
+def _send(connection, message):
+    connection.sendall((json.dumps(message) + "\n").encode())
+
+
+def _receive(reader):
+    line = reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed by peer.")
+    return json.loads(line)
+
+
+def device_capabilities(devices, extra=None):
+    """
+    Możliwości stanowiska: nazwy klas urządzeń z konfiguracji oraz dodatkowe znaczniki z pola 'capabilities'.
+    """
+    capabilities = {type(device).__name__ for group_devices in devices.values() for device in group_devices}
+    return sorted(capabilities | set(extra or []))
+
+
+class DurationHistory:
+    def __init__(self, path=DEFAULT_DURATIONS_FILE):
+        """
+        Historyczne czasy wykonania grup testów (plik JSON {grupa: sekundy}) używane do szeregowania LPT.
+        :param path: Ścieżka do pliku (brak pliku - pusta historia).
+        """
+        self.path = path
+        self.durations = {}
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                self.durations = {str(name): float(value) for name, value in json.load(f).items()}
+
+    def estimate(self, group_name):
+        if group_name in self.durations:
+            return self.durations[group_name]
+        if self.durations:
+            return sum(self.durations.values()) / len(self.durations)
+        return DEFAULT_ESTIMATE
+
+    def update(self, group_name, duration):
+        previous = self.durations.get(group_name)
+        self.durations[group_name] = duration if previous is None else \
+            DURATION_SMOOTHING * duration + (1 - DURATION_SMOOTHING) * previous
+
+    def save(self):
+        if not self.path:
+            return
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(self.durations, f, indent=2, sort_keys=True)
+        os.replace(temporary, self.path)
+
+
+class _Worker:
+    def __init__(self, name, capabilities, groups):
+        self.name = name
+        self.capabilities = set(capabilities)
+        self.groups = set(groups)
+
+    def can_run(self, group):
+        return group.name in self.groups and set(group.requires) <= self.capabilities
+
+
+class _GroupState:
+    def __init__(self, group, estimate):
+        self.group = group
+        self.estimate = estimate
+        self.status = "pending"  # pending / running / done / not run
+        self.worker = None
+        self.duration = None
+        self.results = []
+        self.attempts = 0
+        self.reason = None
+
+
+class ShardCoordinator:
+    def __init__(self, test_groups, logger, host="0.0.0.0", port=5555, durations_file=DEFAULT_DURATIONS_FILE,
+                 wait_timeout=60.0, max_attempts=2):
+        """
+        Koordynator podziału grup testów między stanowiska (procesy ShardWorker łączące się przez TCP).
+        Wolne stanowisko dostaje najdłuższą (wg historii czasów) oczekującą grupę, którą może wykonać
+        (szeregowanie LPT z dynamicznym przydziałem). Wyniki są łączone w jedno podsumowanie.
+        :param test_groups: Lista obiektów TestGroup (wykrytych tak samo jak na stanowiskach).
+        :param logger: Instancja klasy Logger.
+        :param host: Adres nasłuchu.
+        :param port: Port TCP (0 - dowolny wolny port, odczyt z self.port).
+        :param durations_file: Plik historii czasów grup (None - bez historii).
+        :param wait_timeout: Czas [s], po którym grupy bez zgodnego podłączonego stanowiska są oznaczane jako niewykonane.
+        :param max_attempts: Liczba prób wykonania grupy (ponowny przydział po utracie połączenia ze stanowiskiem).
+        """
+        names = [group.name for group in test_groups]
+        if len(set(names)) != len(names):
+            raise ValueError("Test group names must be unique for sharding.")
+        self.logger = logger
+        self.history = DurationHistory(durations_file)
+        self.wait_timeout = wait_timeout
+        self.max_attempts = max_attempts
+        self.groups = [_GroupState(group, self.history.estimate(group.name)) for group in test_groups]
+        self.workers = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._threads = []
+        self._server = socket.create_server((host, port))
+        self.port = self._server.getsockname()[1]
+
+    def _resolved(self):
+        return all(state.status in ("done", "not run") for state in self.groups)
+
+    def _next_group(self, worker):
+        """
+        Wybiera grupę dla stanowiska (wywoływane pod blokadą); czeka, jeśli zgodna grupa może wrócić do kolejki.
+        """
+        while not self._closed:
+            pending = [state for state in self.groups if state.status == "pending" and worker.can_run(state.group)]
+            if pending:
+                state = max(pending, key=lambda state: state.estimate)
+                state.status = "running"
+                state.worker = worker.name
+                state.attempts += 1
+                return state
+            if not any(state.status == "running" and worker.can_run(state.group) for state in self.groups):
+                return None
+            self._condition.wait(0.5)
+        return None
+
+    def _serve_worker(self, connection):
+        state = None
+        worker = None
+        try:
+            with connection, connection.makefile("r", encoding="utf-8") as reader:
+                hello = _receive(reader)
+                if hello.get("type") != "hello":
+                    raise ValueError(f"Expected hello message, got {hello.get('type')}.")
+                worker = _Worker(hello["worker"], hello.get("capabilities", []), hello.get("groups", []))
+                with self._condition:
+                    self.workers.append(worker)
+                    self._condition.notify_all()
+                self.logger.log(f"[INFO] Worker {worker.name} connected, capabilities: "
+                                f"{', '.join(sorted(worker.capabilities)) or '-'}.", to_console=True)
+                while True:
+                    with self._condition:
+                        state = self._next_group(worker)
+                    if state is None:
+                        _send(connection, {"type": "done"})
+                        return
+                    _send(connection, {"type": "run", "group": state.group.name})
+                    reply = _receive(reader)
+                    if reply.get("type") != "result" or reply.get("group") != state.group.name:
+                        raise ValueError(f"Unexpected reply from worker {worker.name}: {reply}")
+                    with self._condition:
+                        state.status = "done"
+                        state.duration = float(reply["duration"])
+                        state.results = [tuple(result) for result in reply["results"]]
+                        self.history.update(state.group.name, state.duration)
+                        self._condition.notify_all()
+                    self.logger.log(f"[INFO] {state.group.name} finished on {worker.name} in {state.duration:.2f} s.",
+                                    to_console=True)
+                    state = None
+        except (OSError, ValueError, KeyError, ConnectionError) as e:
+            name = worker.name if worker else "unknown"
+            self.logger.log(f"[WARNING] Worker {name} lost: {str(e)}", to_console=True)
+            with self._condition:
+                if state is not None and state.status == "running":
+                    if state.attempts < self.max_attempts:
+                        state.status = "pending"
+                        self.logger.log(f"[WARNING] Requeued {state.group.name}.", to_console=True)
+                    else:
+                        state.status = "not run"
+                        state.reason = f"worker {name} lost after {state.attempts} attempts"
+                self._condition.notify_all()
+        finally:
+            with self._condition:
+                if worker in self.workers:
+                    self.workers.remove(worker)
+                self._condition.notify_all()
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return  # Gniazdo zamknięte w close()
+            thread = threading.Thread(target=self._serve_worker, args=(connection,), daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _mark_unrunnable(self, waited):
+        """
+        Oznacza jako niewykonane grupy, dla których żadne podłączone stanowisko nie jest zgodne (pod blokadą).
+        """
+        if waited < self.wait_timeout:
+            return
+        for state in self.groups:
+            if state.status == "pending" and not any(worker.can_run(state.group) for worker in self.workers):
+                state.status = "not run"
+                state.reason = f"no compatible worker (requires: {', '.join(state.group.requires) or '-'})"
+                self._condition.notify_all()
+
+    def run(self):
+        """
+        Przyjmuje stanowiska i rozdziela grupy do czasu ich wykonania, następnie drukuje łączne podsumowanie.
+        Kończy program sys.exit(1), jeśli któryś test nie przeszedł lub grupa nie została wykonana.
+        :return: Instancja TestFramework z połączonymi wynikami.
+        """
+        self.logger.log(f"[INFO] Shard coordinator listening on port {self.port}, {len(self.groups)} test groups.",
+                        to_console=True)
+        accept_thread = threading.Thread(target=self._accept, name="ShardAccept", daemon=True)
+        accept_thread.start()
+        start = time.monotonic()
+        last_change = start
+        workers_seen = 0
+        try:
+            with self._condition:
+                while not self._resolved():
+                    self._condition.wait(0.5)
+                    if len(self.workers) != workers_seen:
+                        workers_seen = len(self.workers)
+                        last_change = time.monotonic()
+                    self._mark_unrunnable(time.monotonic() - last_change)
+        finally:
+            self.close()
+        self.history.save()
+        return self.report(time.monotonic() - start)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._server.close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def report(self, wall_time):
+        """
+        Drukuje przydział grup do stanowisk i łączne wyniki (przez TestFramework.report_test_result/print_summary).
+        """
+        framework = TestFramework(None, self.logger)
+        self.logger.log("\n=================== SHARDED RESULTS ===================\n", to_console=True)
+        for state in self.groups:
+            for test_name, passed, details, *counts in state.results:
+                framework.report_test_result(state.group.name, test_name, passed, details, *counts)
+            if state.status == "not run":
+                framework.report_test_result(state.group.name, "Shard", False, f"Not run: {state.reason}")
+        lines = ["\n=================== SHARD SCHEDULE ==================="]
+        busy = {}
+        for state in sorted(self.groups, key=lambda state: (state.worker or "", -(state.duration or 0))):
+            if state.status == "done":
+                busy[state.worker] = busy.get(state.worker, 0) + state.duration
+                lines.append(f"> {state.group.name}: {state.worker}, {state.duration:.2f} s "
+                             f"(estimated {state.estimate:.2f} s)")
+            else:
+                lines.append(f"> {state.group.name}: not run ({state.reason})")
+        for name, seconds in sorted(busy.items()):
+            lines.append(f"> Worker {name}: busy {seconds:.2f} s")
+        lines.append(f"> Wall time: {wall_time:.2f} s")
+        summary = "\n".join(lines)
+        self.logger.log(summary, to_console=True)
+        if self.logger.log_file:
+            self.logger.log(summary, to_console=False, to_log_file=True)
+        framework.print_summary()
+        if framework.fail_count != 0:
+            sys.exit(1)
+        return framework
+
+
+class ShardWorker:
+    def __init__(self, framework, host, port, name=None, capabilities=None, connect_timeout=60.0):
+        """
+        Stanowisko wykonujące grupy testów przydzielane przez ShardCoordinator.
+        Urządzenia są inicjalizowane raz, przed pierwszą grupą.
+        :param framework: Instancja TestFramework z urządzeniami i grupami testów stanowiska.
+        :param host: Adres koordynatora.
+        :param port: Port koordynatora.
+        :param name: (Opcjonalna) nazwa stanowiska; domyślnie nazwa hosta i PID.
+        :param capabilities: (Opcjonalna) lista możliwości; domyślnie device_capabilities() urządzeń frameworka.
+        :param connect_timeout: Czas [s] ponawiania połączenia z koordynatorem.
+        """
+        self.framework = framework
+        self.host = host
+        self.port = port
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        if capabilities is None:
+            capabilities = device_capabilities(framework.peripheral_manager.devices)
+        self.capabilities = sorted(capabilities)
+        self.connect_timeout = connect_timeout
+        self._results = None
+
+    def _connect(self):
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            try:
+                return socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(f"Cannot connect to shard coordinator at {self.host}:{self.port}.")
+                time.sleep(0.2)
+
+    def _collect(self, group_name, test_name, passed, details=None, assertions=1, failed_assertions=None):
+        if self._results is not None:
+            self._results.append((test_name, passed, details, assertions, failed_assertions))
+
+    def run(self):
+        """
+        Wykonuje przydzielone grupy do otrzymania komunikatu 'done', następnie zwalnia urządzenia.
+        Kończy program sys.exit(1), jeśli któryś z wykonanych testów nie przeszedł.
+        """
+        framework = self.framework
+        groups = {group.name: group for group in framework.test_groups}
+        connection = self._connect()
+        connection.settimeout(None)
+        framework.add_result_listener(self._collect)
+        initialized = False
+        try:
+            with connection, connection.makefile("r", encoding="utf-8") as reader:
+                _send(connection, {"type": "hello", "worker": self.name, "capabilities": self.capabilities,
+                                   "groups": list(groups)})
+                while True:
+                    message = _receive(reader)
+                    if message.get("type") == "done":
+                        break
+                    if not initialized:
+                        framework.logger.log("\n=================== INITIALIZATION ===================",
+                                             to_console=True)
+                        framework.peripheral_manager.initialize_all()
+                        framework.logger.log("\n=================== TEST EXECUTION ===================\n",
+                                             to_console=True)
+                        initialized = True
+                    self._results = []
+                    start = time.perf_counter()
+                    group = groups.get(message["group"])
+                    if group is None:
+                        framework.report_test_result(message["group"], "Shard", False, "Unknown test group.")
+                    else:
+                        group.run_tests(framework)
+                    duration = time.perf_counter() - start
+                    _send(connection, {"type": "result", "group": message["group"], "duration": duration,
+                                       "results": [[test, passed, None if details is None else str(details),
+                                                    assertions, failed_assertions]
+                                                   for test, passed, details, assertions, failed_assertions
+                                                   in self._results]})
+                    self._results = None
+        finally:
+            framework.result_listeners.remove(self._collect)
+            if initialized:
+                framework.fixtures.finish("session", framework, "Session")
+                framework.logger.log("\n==================== RESOURCE CLEANUP ====================", to_console=True)
+                framework.peripheral_manager.release_all()
+        framework.print_summary()
+        if framework.fail_count != 0:
+            sys.exit(1)
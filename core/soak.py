@@ -0,0 +1,267 @@
+import math
+import time
+from array import array
+from core.instrumentation import unwrap_methods, wrap_methods
+
+# Znacznik testu bez nieudanych asercji w bieżącej iteracji
+_PASSED = object()
+
+
+def _format_duration(seconds):
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def _format_elapsed(seconds):
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
+
+
+class QuantileSketch:
+    def __init__(self, relative_accuracy=0.01, min_value=1e-6, max_value=1e5):
+        """
+        Szkic kwantyli o stałym rozmiarze (logarytmiczne przedziały, jak DDSketch): każdy kwantyl
+        jest wyznaczany z błędem względnym nie większym niż relative_accuracy, niezależnie od liczby próbek.
+        Wartości spoza zakresu [min_value, max_value] trafiają do skrajnych przedziałów.
+        :param relative_accuracy: Dopuszczalny błąd względny kwantyli (np. 0.01 = 1%).
+        :param min_value: Najmniejsza rozróżniana wartość.
+        :param max_value: Największa rozróżniana wartość.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1.")
+        if not 0 < min_value < max_value:
+            raise ValueError("Expected 0 < min_value < max_value.")
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self._offset = math.floor(math.log(min_value) / self._log_gamma)
+        size = math.ceil(math.log(max_value) / self._log_gamma) - self._offset + 1
+        self._counts = array("Q", bytes(8 * size))
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        if value > 0:
+            index = math.ceil(math.log(value) / self._log_gamma) - self._offset
+            index = min(max(index, 0), len(self._counts) - 1)
+        else:
+            index = 0
+        self._counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """
+        Zwraca przybliżony kwantyl q (0..1) lub None, jeśli szkic jest pusty.
+        """
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        cumulative = 0
+        for index, count in enumerate(self._counts):
+            cumulative += count
+            if cumulative > rank:
+                value = 2 * self.gamma ** (index + self._offset) / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+class TestStatistics:
+    def __init__(self, group_name, test_name):
+        """
+        Zagregowane wyniki jednego testu w trybie soak (pamięć nie rośnie z liczbą iteracji).
+        """
+        self.group_name = group_name
+        self.test_name = test_name
+        self.runs = 0
+        self.failures = 0
+        self.durations = QuantileSketch()
+        self.first_failure = None  # (iteracja, czas od startu [s], szczegóły)
+        self.last_failure = None
+
+    def add_run(self, duration):
+        self.runs += 1
+        self.durations.add(duration)
+
+    def add_failure(self, failure):
+        """
+        :param failure: Krotka (iteracja, czas od startu [s], szczegóły).
+        """
+        self.failures += 1
+        if self.first_failure is None:
+            self.first_failure = failure
+        self.last_failure = failure
+
+    def describe(self):
+        sketch = self.durations
+        line = f"{self.group_name}, {self.test_name}: "
+        if self.runs:
+            line += f"{self.runs} runs, {self.failures} failed ({100.0 * self.failures / self.runs:.2f}%)"
+        else:
+            # Setup/teardown grupy - liczone są tylko błędy
+            line += f"{self.failures} failed"
+        if sketch.count:
+            line += (f", p50 {_format_duration(sketch.quantile(0.5))}, p95 {_format_duration(sketch.quantile(0.95))}"
+                     f", p99 {_format_duration(sketch.quantile(0.99))}, max {_format_duration(sketch.max)}")
+        return line
+
+
+class SoakRunner:
+    def __init__(self, framework, iterations=None, duration=None, progress_interval=60.0, groups=None):
+        """
+        Powtarza grupy testów przez zadaną liczbę iteracji lub czas, bez ponownej inicjalizacji urządzeń.
+        Wyniki są agregowane w stałej pamięci (liczniki, szkice kwantyli czasów, pierwszy/ostatni błąd).
+        :param framework: Instancja TestFramework.
+        :param iterations: (Opcjonalna) liczba iteracji.
+        :param duration: (Opcjonalny) czas trwania [s]; przy obu limitach obowiązuje pierwszy osiągnięty.
+        :param progress_interval: Odstęp między migawkami postępu [s] (0 - bez migawek).
+        :param groups: (Opcjonalna) lista nazw grup do powtarzania; domyślnie wszystkie.
+        """
+        if iterations is None and duration is None:
+            raise ValueError("Soak mode requires iterations or duration.")
+        if iterations is not None and iterations < 1:
+            raise ValueError("iterations must be at least 1.")
+        if duration is not None and duration <= 0:
+            raise ValueError("duration must be positive.")
+        self.framework = framework
+        self.iterations = iterations
+        self.duration = duration
+        self.progress_interval = progress_interval
+        self.groups = [group for group in framework.test_groups if groups is None or group.name in groups]
+        if groups is not None:
+            missing = set(groups) - {group.name for group in self.groups}
+            if missing:
+                raise ValueError(f"Unknown test groups: {', '.join(sorted(missing))}.")
+        self.statistics = {}
+        self.iteration = 0
+        self.start_time = None
+        self._current = None  # TestStatistics wykonywanego testu
+        self._current_failure = _PASSED  # Szczegóły pierwszej nieudanej asercji bieżącego wykonania
+        self._wrapped = []
+
+    def _failure(self, details):
+        return self.iteration, time.monotonic() - self.start_time, details
+
+    def _record_result(self, group_name, test_name, passed, details=None, assertions=1, failed_assertions=None):
+        if passed:
+            return
+        if self._current is not None:
+            # Test w trakcie wykonania (także przypadki testów sparametryzowanych, raportowane pod własnymi
+            # nazwami) - zapamiętywana jest pierwsza nieudana asercja
+            if self._current_failure is _PASSED:
+                self._current_failure = details if test_name == self._current.test_name else \
+                    f"{test_name}: {details}"
+        else:
+            # Błąd poza opakowanym testem (setup/teardown grupy)
+            key = (group_name, test_name)
+            statistics = self.statistics.setdefault(key, TestStatistics(group_name, test_name))
+            statistics.add_failure(self._failure(details))
+
+    def _test_factory(self, statistics):
+        def factory(name, original):
+            def wrapper(*args, **kwargs):
+                self._current = statistics
+                self._current_failure = _PASSED
+                start = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    statistics.add_run(time.perf_counter() - start)
+                    details = self._current_failure
+                    self._current = None
+                    if details is not _PASSED:
+                        statistics.add_failure(self._failure(details))
+            return wrapper
+        return factory
+
+    def _attach(self):
+        self.framework.add_result_listener(self._record_result)
+        for group in self.groups:
+            for test in group.tests:
+                statistics = self.statistics.setdefault((group.name, test.name), TestStatistics(group.name, test.name))
+                self._wrapped.append((test, wrap_methods(test, self._test_factory(statistics), ["run"])))
+
+    def _detach(self):
+        for test, originals in reversed(self._wrapped):
+            unwrap_methods(test, originals)
+        self._wrapped.clear()
+        self.framework.result_listeners.remove(self._record_result)
+
+    def _finished(self):
+        if self.iterations is not None and self.iteration >= self.iterations:
+            return True
+        return self.duration is not None and time.monotonic() - self.start_time >= self.duration
+
+    def run(self):
+        """
+        Inicjalizuje urządzenia raz, powtarza grupy i zwalnia urządzenia. Ctrl+C kończy pętlę z podsumowaniem.
+        :return: Słownik {(grupa, test): TestStatistics}.
+        """
+        framework = self.framework
+        logger = framework.logger
+        logger.log("\n=================== INITIALIZATION ===================", to_console=True)
+        framework.peripheral_manager.initialize_all()
+        limits = []
+        if self.iterations is not None:
+            limits.append(f"{self.iterations} iterations")
+        if self.duration is not None:
+            limits.append(f"{_format_elapsed(self.duration)}")
+        logger.log(f"\n=================== SOAK EXECUTION ({', '.join(limits)}) ===================\n",
+                   to_console=True)
+        self._attach()
+        self.start_time = time.monotonic()
+        next_progress = self.start_time + self.progress_interval
+        try:
+            while not self._finished():
+                self.iteration += 1
+                for group in self.groups:
+                    group.run_tests(framework)
+                if self.progress_interval and time.monotonic() >= next_progress:
+                    self.log_progress()
+                    next_progress = time.monotonic() + self.progress_interval
+        except KeyboardInterrupt:
+            logger.log(f"[WARNING] Soak interrupted during iteration {self.iteration}.", to_console=True)
+        finally:
+            self._detach()
+            framework.fixtures.finish("session", framework, "Session")
+            logger.log("\n==================== RESOURCE CLEANUP ====================", to_console=True)
+            framework.peripheral_manager.release_all()
+        self.log_summary()
+        return self.statistics
+
+    def log_progress(self):
+        elapsed = time.monotonic() - self.start_time
+        failures = sum(statistics.failures for statistics in self.statistics.values())
+        runs = sum(statistics.runs for statistics in self.statistics.values())
+        self.framework.logger.log(f"[INFO] Soak progress: iteration {self.iteration}, elapsed {_format_elapsed(elapsed)}, "
+                                  f"{runs} test runs, {failures} failed.", to_console=True)
+        for statistics in self.statistics.values():
+            if statistics.failures:
+                self.framework.logger.log(f"[WARNING] {statistics.describe()}", to_console=True)
+
+    def log_summary(self):
+        logger = self.framework.logger
+        elapsed = time.monotonic() - self.start_time
+        lines = ["\n=================== SOAK SUMMARY ===================",
+                 f"> Iterations:          {self.iteration}",
+                 f"> Elapsed:             {_format_elapsed(elapsed)}"]
+        for statistics in self.statistics.values():
+            lines.append(f"{'[FAIL]' if statistics.failures else '[PASS]'} {statistics.describe()}")
+            for label, failure in (("first", statistics.first_failure), ("last", statistics.last_failure)):
+                if failure is not None:
+                    iteration, at, details = failure
+                    lines.append(f"    {label} failure: iteration {iteration}, at {_format_elapsed(at)}: {details}")
+        summary = "\n".join(lines)
+        logger.log(summary, to_console=True)
+        if logger.log_file:
+            logger.log(summary, to_console=False, to_log_file=True)
@@ -1,5 +1,8 @@
 # test_framework.py
 from core.logger import Logger
+from core.fixtures import FixtureManager
+from core.isolation import IsolatedRunner
+from core.soak import SoakRunner
 from abc import ABC, abstractmethod
 import sys 
 
@@ -20,11 +23,26 @@ class TestFramework:
         self.total_tests = 0
         self.pass_count = 0
         self.fail_count = 0
+        self.assertion_count = 0
         self.logger = logger
+        # Funkcje wywoływane dla każdego wyniku: (group_name, test_name, passed, details, assertions, failed_assertions)
+        self.result_listeners = []
+        self.log_passes = True  # Czy logować wyniki [PASS] (wyłączane w trybie soak)
+        self.fixtures = FixtureManager()  # Wartości fikstur (zakresy session/group/test)
+        self.aggregate_results = True  # Czy asercje testu są zbierane i raportowane jako jeden wynik testu
+        self.slot = None  # DUTSlot w trybie wielu DUT (testy odczytują z niego np. framework.slot.params)
 
     def add_test_group(self, group):
         self.test_groups.append(group)
 
+    def add_result_listener(self, listener):
+        """
+        Rejestruje funkcję powiadamianą o każdym raportowanym wyniku testu.
+        :param listener: Funkcja listener(group_name, test_name, passed, details, assertions, failed_assertions),
+                         gdzie assertions i failed_assertions to liczby asercji w wyniku (wszystkich i nieudanych).
+        """
+        self.result_listeners.append(listener)
+
     def run_all_tests(self):
         log_line=("\n=================== INITIALIZATION ===================")
         self.logger.log(log_line, to_console=True)
@@ -36,6 +54,7 @@ class TestFramework:
             self.logger.log(log_line, to_console=False, to_log_file = True)
         for group in self.test_groups:
             group.run_tests(self)
+        self.fixtures.finish("session", self, "Session")
 
         log_line="\n==================== RESOURCE CLEANUP ===================="
         self.logger.log(log_line, to_console=True)
@@ -46,6 +65,36 @@ class TestFramework:
         if (self.fail_count !=0):
             sys.exit(1)
 
+    def run_soak(self, iterations=None, duration=None, progress_interval=60.0, groups=None):
+        """
+        Tryb soak: powtarza grupy testów bez ponownej inicjalizacji urządzeń i drukuje zagregowane statystyki.
+        Logowane są tylko nieudane asercje.
+        :param iterations: (Opcjonalna) liczba iteracji.
+        :param duration: (Opcjonalny) czas trwania [s].
+        :param progress_interval: Odstęp między migawkami postępu [s].
+        :param groups: (Opcjonalna) lista nazw grup; domyślnie wszystkie.
+        :return: Słownik {(grupa, test): TestStatistics}.
+        """
+        runner = SoakRunner(self, iterations, duration, progress_interval, groups)
+        self.log_passes = False
+        try:
+            statistics = runner.run()
+        finally:
+            self.log_passes = True
+        self.print_summary()
+        if self.fail_count != 0:
+            sys.exit(1)
+        return statistics
+
+    def run_isolated(self, max_workers=2, group_timeout=None):
+        """
+        Tryb izolacji: każda grupa wykonywana jest w procesie roboczym z puli (tylko z urządzeniami z group.requires).
+        Awaria procesu oznacza grupę jako nieudaną i nie przerywa pozostałych grup.
+        :param max_workers: Maksymalna liczba utrzymywanych procesów roboczych.
+        :param group_timeout: (Opcjonalny) limit czasu grupy [s].
+        """
+        IsolatedRunner(self, max_workers, group_timeout).run()
+
     def print_summary(self):
         total = self.total_tests
         passed = self.pass_count
@@ -57,6 +106,7 @@ class TestFramework:
             f"> Total Tests Run:     {total}\n"
             f"> Passed:              {passed} ✅\n"
             f"> Failed:              {failed} ❌\n"
+            f"> Assertions Checked:  {self.assertion_count}\n"
             "\n======================== STATUS =====================\n"
             f"\nOVERALL STATUS: {'✅ PASSED' if failed == 0 else '❌ FAILED'} : Please check logs for details.\n"
         )
@@ -68,16 +118,29 @@ class TestFramework:
         if hasattr(self.logger, "log_file") and self.logger.log_file:
             self.logger.log(summary, to_console=False, to_log_file = True)
 
-    def report_test_result(self, group_name, test_name, passed, details=None):
+    def report_test_result(self, group_name, test_name, passed, details=None, assertions=None, failed_assertions=None):
+        """
+        Zlicza i loguje wynik testu.
+        :param assertions: (Opcjonalna) liczba asercji zebranych w wyniku (domyślnie wynik jednej asercji).
+        :param failed_assertions: (Opcjonalna) liczba nieudanych asercji (domyślnie 0 lub 1 zależnie od passed).
+        """
+        if failed_assertions is None:
+            failed_assertions = 0 if passed else 1
         self.total_tests += 1
+        self.assertion_count += assertions or 1
+        count = f" ({assertions} assertions)" if assertions and assertions > 1 else ""
         if passed:
-            message = f"[PASS] {group_name}, {test_name}"
+            message = f"[PASS] {group_name}, {test_name}{count}"
             self.pass_count += 1
         else:
-            message = f"[FAIL] {group_name}, {test_name}:"
+            message = f"[FAIL] {group_name}, {test_name}{count}:"
             self.fail_count += 1
             if details:
                 message += f" {details}"
+        for listener in self.result_listeners:
+            listener(group_name, test_name, passed, details, assertions or 1, failed_assertions)
+        if passed and not self.log_passes:
+            return
         self.logger.log(message, to_console=True)
         if self.logger.log_file:
             self.logger.log(message, to_console=False, to_log_file=True)
@@ -94,6 +157,7 @@ class TestGroup:
         self.tests = []
         self.setup = None
         self.teardown = None
+        self.requires = []  # Wymagane możliwości stanowiska (np. nazwy klas urządzeń) przy podziale na stanowiska
 
     def add_test(self, test):
         self.tests.append(test)
@@ -118,6 +182,8 @@ class TestGroup:
         # Uruchom teardown grupy, jeśli istnieje
         if self.teardown:
             self.teardown(framework)
+        # Sprzątanie fikstur o zakresie grupy
+        framework.fixtures.finish("group", framework, self.name)
 
 
 class Test:
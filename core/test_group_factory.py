@@ -1,46 +1,45 @@
 from core.test_framework import TestGroup, Test
-from core.assertions import set_test_context, clear_test_context
+from core.assertions import run_in_test_context
+from core.fixtures import call_with_fixtures
+from core.parametrize import Parametrized, ParametrizedTest
 
-def create_test_group(group_name, setup_func, teardown_func, tests):
+def create_test_group(group_name, setup_func, teardown_func, tests, requires=None):
     """
     Tworzy i zwraca obiekt TestGroup z przypisanymi testami, funkcjami setup i teardown.
 
     :param group_name: Nazwa grupy testowej.
     :param setup_func: Funkcja do uruchomienia przed testami.
     :param teardown_func: Funkcja do uruchomienia po testach.
-    :param tests: Lista testów do przypisania do grupy, w formie [(test_name, test_function), ...]
+    :param tests: Lista testów do przypisania do grupy, w formie [(test_name, test_function), ...];
+                  test_function może być testem sparametryzowanym utworzonym przez parametrize().
+    :param requires: (Opcjonalna) lista wymaganych możliwości stanowiska, np. ["ModbusTRU", "can"];
+                     w trybie podziału na stanowiska grupa trafia tylko do stanowisk, które je mają.
     :return: Obiekt TestGroup z dodanymi testami.
     """
     group = TestGroup(group_name)
+    group.requires = list(requires or [])
 
     # Opakowanie funkcji setup z dodaniem frameworka do kontekstu
     if setup_func:
         def wrapped_setup(framework):
-            set_test_context(framework, group_name, "Global Setup")
-            try:
-                setup_func()
-            finally:
-                clear_test_context()
+            run_in_test_context(framework, group_name, "Global Setup", setup_func, catch_exceptions=False)
         group.set_setup(wrapped_setup)
 
     # Opakowanie funkcji teardown z dodaniem frameworka do kontekstu
     if teardown_func:
         def wrapped_teardown(framework):
-            set_test_context(framework, group_name, "Global Teardown")
-            try:
-                teardown_func()
-            finally:
-                clear_test_context()
+            run_in_test_context(framework, group_name, "Global Teardown", teardown_func, catch_exceptions=False)
         group.set_teardown(wrapped_teardown)
 
     # Dodanie testów do grupy
     for test_name, test_func in tests:
+        if isinstance(test_func, Parametrized):
+            group.add_test(ParametrizedTest(test_name, test_func))
+            continue
+
         def wrapped_test(framework, group_name=group_name, test_name=test_name, test_func=test_func):
-            set_test_context(framework, group_name, test_name)
-            try:
-                test_func(framework, group_name, test_name)
-            finally:
-                clear_test_context()
+            run_in_test_context(framework, group_name, test_name,
+                                call_with_fixtures, framework, test_func, group_name, test_name)
 
         group.add_test(Test(test_name, wrapped_test))
 
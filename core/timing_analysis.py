@@ -0,0 +1,105 @@
+import numpy as np
+
+# Funkcje analizy przyjmują dowolny obiekt z metodą edges() zwracającą
+# (znaczniki czasu [ns], poziomy po zboczu) - np. EdgeCapture. Wyniki zwracane są w sekundach.
+
+
+def _transitions(capture, level):
+    """
+    Zwraca znaczniki czasu [ns] przejść do podanego poziomu (pomija powtórzone poziomy).
+    """
+    timestamps, levels = capture.edges()
+    entering = levels == level
+    entering[1:] &= levels[:-1] != level
+    return timestamps[entering]
+
+
+def pulse_widths(capture, level=1):
+    """
+    Szerokości impulsów o podanym poziomie (1 - impulsy wysokie, 0 - niskie) w sekundach.
+    """
+    timestamps, levels = capture.edges()
+    mask = (levels[:-1] == level) & (levels[1:] != level)
+    return (timestamps[1:][mask] - timestamps[:-1][mask]) * 1e-9
+
+
+def periods(capture, level=1):
+    """
+    Okresy sygnału mierzone między kolejnymi przejściami do podanego poziomu, w sekundach.
+    """
+    return np.diff(_transitions(capture, level)) * 1e-9
+
+
+def frequency(capture, level=1):
+    """
+    Średnia częstotliwość sygnału w Hz (0.0 przy braku pełnego okresu).
+    """
+    measured = periods(capture, level)
+    return 1.0 / measured.mean() if measured.size else 0.0
+
+
+def duty_cycle(capture):
+    """
+    Średnie wypełnienie sygnału w procentach (0.0 przy braku pełnego okresu).
+    """
+    high = pulse_widths(capture, 1)
+    measured = periods(capture, 1)
+    if not high.size or not measured.size:
+        return 0.0
+    return 100.0 * high.mean() / measured.mean()
+
+
+def jitter(capture, level=1):
+    """
+    Jitter okresu: odchylenie standardowe i wartość międzyszczytowa w sekundach.
+    :return: Krotka (std, peak-to-peak).
+    """
+    measured = periods(capture, level)
+    if not measured.size:
+        return 0.0, 0.0
+    return float(measured.std()), float(measured.max() - measured.min())
+
+
+def latencies(stimulus, response, stimulus_level=1, response_level=1):
+    """
+    Opóźnienia między zboczem pobudzenia a pierwszym zboczem odpowiedzi, w sekundach.
+    Zbocza pobudzenia, po których odpowiedź nie nastąpiła przed kolejnym pobudzeniem, są pomijane.
+    :param stimulus: Rejestracja pinu pobudzenia.
+    :param response: Rejestracja pinu odpowiedzi.
+    :param stimulus_level: Poziom, do którego przechodzi pobudzenie (1 - zbocze narastające).
+    :param response_level: Poziom, do którego przechodzi odpowiedź.
+    """
+    stimuli = _transitions(stimulus, stimulus_level)
+    responses = _transitions(response, response_level)
+    if not stimuli.size or not responses.size:
+        return np.empty(0)
+    index = np.searchsorted(responses, stimuli, side="left")
+    valid = index < responses.size
+    matched = responses[np.minimum(index, responses.size - 1)]
+    next_stimulus = np.append(stimuli[1:], np.iinfo(np.int64).max)
+    valid &= matched < next_stimulus
+    return (matched[valid] - stimuli[valid]) * 1e-9
+
+
+def summarize(values):
+    """
+    Statystyki zbioru pomiarów (do komunikatów asercji).
+    """
+    values = np.asarray(values)
+    if not values.size:
+        return {"count": 0}
+    return {
+        "count": int(values.size),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+    }
+
+
+def format_summary(values, unit="s"):
+    stats = summarize(values)
+    if not stats["count"]:
+        return "no samples"
+    return (f"n={stats['count']}, min={stats['min']:.6g}{unit}, mean={stats['mean']:.6g}{unit}, "
+            f"max={stats['max']:.6g}{unit}, std={stats['std']:.3g}{unit}")
@@ -0,0 +1,289 @@
+import mmap
+import os
+import struct
+import threading
+import time
+
+# Układ plików przechwytywania:
+#   <path>      - nagłówek + surowe bajty odebrane z UART
+#   <path>.idx  - nagłówek + rekordy indeksu (czas od startu w ns, offset w danych)
+_DATA_MAGIC = b"HILCAPD1"
+_INDEX_MAGIC = b"HILCAPI1"
+_HEADER = struct.Struct("<8sQq")  # magic, zajęta długość, czas startu (time_ns)
+_HEADER_SIZE = 64
+_INDEX_RECORD = struct.Struct("<qQ")  # znacznik czasu [ns], offset [B]
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+DEFAULT_INDEX_CHUNK_SIZE = 1024 * 1024
+DEFAULT_INDEX_INTERVAL = 0.01
+MAX_READ_SIZE = 64 * 1024
+
+
+class _GrowableMap:
+    def __init__(self, path, magic, chunk_size, start_time_ns):
+        """
+        Plik zmapowany w pamięci, prealokowany i powiększany porcjami.
+        :param path: Ścieżka do pliku.
+        :param magic: Sygnatura zapisywana w nagłówku.
+        :param chunk_size: Rozmiar porcji, o którą powiększany jest plik.
+        :param start_time_ns: Czas rozpoczęcia przechwytywania (time.time_ns()).
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.used = 0
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.ftruncate(self._fd, _HEADER_SIZE + chunk_size)
+        self.map = mmap.mmap(self._fd, _HEADER_SIZE + chunk_size)
+        _HEADER.pack_into(self.map, 0, magic, 0, start_time_ns)
+        self._magic = magic
+        self._start_time_ns = start_time_ns
+
+    def append(self, data):
+        """
+        Dopisuje dane na końcu pliku, powiększając go w razie potrzeby.
+        :param data: Bajty do zapisania.
+        :return: Offset (względem początku danych), pod którym zapisano dane.
+        """
+        offset = self.used
+        end = _HEADER_SIZE + offset + len(data)
+        if end > len(self.map):
+            chunks = -(-(end - _HEADER_SIZE) // self.chunk_size)
+            self.map.resize(_HEADER_SIZE + chunks * self.chunk_size)
+        self.map[_HEADER_SIZE + offset:end] = data
+        self.used = offset + len(data)
+        _HEADER.pack_into(self.map, 0, self._magic, self.used, self._start_time_ns)
+        return offset
+
+    def close(self):
+        """
+        Zamyka mapowanie i obcina plik do faktycznie zajętego rozmiaru.
+        """
+        self.map.flush()
+        self.map.close()
+        os.ftruncate(self._fd, _HEADER_SIZE + self.used)
+        os.close(self._fd)
+
+
+class UARTCapture:
+    def __init__(self, serial_port, path, chunk_size=DEFAULT_CHUNK_SIZE, index_interval=DEFAULT_INDEX_INTERVAL):
+        """
+        Przechwytuje ruch z portu szeregowego do pliku zmapowanego w pamięci.
+        :param serial_port: Otwarty obiekt serial.Serial.
+        :param path: Ścieżka do pliku danych (indeks trafia do <path>.idx).
+        :param chunk_size: Rozmiar porcji prealokacji pliku danych w bajtach.
+        :param index_interval: Minimalny odstęp między wpisami indeksu czasowego w sekundach.
+        """
+        self.serial = serial_port
+        self.path = path
+        self.index_path = path + ".idx"
+        self.chunk_size = chunk_size
+        self.index_interval_ns = int(index_interval * 1e9)
+        self._data = None
+        self._index = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._start_ns = 0
+        self._last_index_ns = None
+        self.error = None
+
+    @property
+    def bytes_captured(self):
+        """
+        Liczba bajtów zapisanych do tej pory.
+        """
+        return self._data.used if self._data else 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Tworzy pliki przechwytywania i uruchamia wątek odczytu.
+        """
+        if self.running:
+            raise RuntimeError(f"Capture to {self.path} is already running.")
+        start_time_ns = time.time_ns()
+        self._start_ns = time.monotonic_ns()
+        self._last_index_ns = None
+        self._data = _GrowableMap(self.path, _DATA_MAGIC, self.chunk_size, start_time_ns)
+        self._index = _GrowableMap(self.index_path, _INDEX_MAGIC, DEFAULT_INDEX_CHUNK_SIZE, start_time_ns)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"UARTCapture({self.path})", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Zatrzymuje wątek odczytu i zamyka pliki.
+        :return: Ścieżka do pliku danych.
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._data:
+            self._data.close()
+            self._index.close()
+            self._data = None
+            self._index = None
+        return self.path
+
+    def _run(self):
+        """
+        Pętla wątku: odczytuje dostępne bajty i dopisuje je razem z indeksem czasowym.
+        """
+        try:
+            while not self._stop_event.is_set():
+                waiting = self.serial.in_waiting
+                data = self.serial.read(min(waiting, MAX_READ_SIZE) if waiting else 1)
+                if data:
+                    self._append(data, time.monotonic_ns() - self._start_ns)
+        except Exception as e:
+            self.error = e
+
+    def _append(self, data, timestamp_ns):
+        offset = self._data.append(data)
+        if self._last_index_ns is None or timestamp_ns - self._last_index_ns >= self.index_interval_ns:
+            self._index.append(_INDEX_RECORD.pack(timestamp_ns, offset))
+            self._last_index_ns = timestamp_ns
+
+
+class CaptureReader:
+    def __init__(self, path):
+        """
+        Odczyt pliku przechwytywania bez kopiowania danych (mmap/memoryview).
+        :param path: Ścieżka do pliku danych utworzonego przez UARTCapture.
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        self._data_file = open(path, "rb")
+        self._index_file = open(self.index_path, "rb")
+        self._data_map = None
+        self._index_map = None
+        self.refresh()
+
+    def refresh(self):
+        """
+        Ponownie mapuje pliki, aby uwzględnić dane dopisane przez trwające przechwytywanie.
+        """
+        self._release_maps()
+        self._data_map = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._length, self.start_time_ns = _HEADER.unpack_from(self._data_map, 0)
+        if magic != _DATA_MAGIC:
+            raise ValueError(f"{self.path} is not a UART capture file.")
+        magic, index_length, _ = _HEADER.unpack_from(self._index_map, 0)
+        if magic != _INDEX_MAGIC:
+            raise ValueError(f"{self.index_path} is not a UART capture index file.")
+        self._index_count = index_length // _INDEX_RECORD.size
+        self.data = memoryview(self._data_map)[_HEADER_SIZE:_HEADER_SIZE + self._length]
+        # Naprzemiennie: znacznik czasu, offset
+        self._index = memoryview(self._index_map)[_HEADER_SIZE:_HEADER_SIZE + self._index_count * _INDEX_RECORD.size].cast("q")
+
+    def __len__(self):
+        return self._length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Zwalnia mapowania i zamyka pliki.
+        """
+        self._release_maps()
+        self._data_file.close()
+        self._index_file.close()
+
+    def _release_maps(self):
+        if self._data_map is None:
+            return
+        self.data.release()
+        self._index.release()
+        self._data_map.close()
+        self._index_map.close()
+        self._data_map = None
+        self._index_map = None
+
+    @property
+    def duration(self):
+        """
+        Czas (w sekundach) ostatniego wpisu indeksu względem startu przechwytywania.
+        """
+        if not self._index_count:
+            return 0.0
+        return self._index[2 * (self._index_count - 1)] / 1e9
+
+    def offset_at(self, seconds):
+        """
+        Zwraca offset pierwszego bloku odebranego nie wcześniej niż podany czas.
+        :param seconds: Czas od startu przechwytywania w sekundach.
+        :return: Offset w danych (len(self) jeśli czas jest za końcem zapisu).
+        """
+        target = int(seconds * 1e9)
+        low, high = 0, self._index_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._index[2 * middle] < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._index_count:
+            return self._length
+        return self._index[2 * low + 1]
+
+    def time_at(self, offset):
+        """
+        Zwraca przybliżony czas odebrania bajtu pod podanym offsetem.
+        :param offset: Offset w danych.
+        :return: Czas od startu przechwytywania w sekundach (dokładność do interwału indeksu).
+        """
+        low, high = 0, self._index_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._index[2 * middle + 1] <= offset:
+                low = middle + 1
+            else:
+                high = middle
+        if low == 0:
+            return 0.0
+        return self._index[2 * (low - 1)] / 1e9
+
+    def slice_time(self, start, end=None):
+        """
+        Zwraca widok (memoryview) danych odebranych w podanym przedziale czasu.
+        :param start: Początek przedziału w sekundach.
+        :param end: Koniec przedziału w sekundach (None - do końca zapisu).
+        """
+        begin = self.offset_at(start)
+        stop = self._length if end is None else self.offset_at(end)
+        return self.data[begin:stop]
+
+    def find(self, pattern, start=0, end=None):
+        """
+        Wyszukuje wzorzec bezpośrednio w zmapowanym pliku.
+        :param pattern: Szukana sekwencja bajtów.
+        :param start: Offset początkowy.
+        :param end: Offset końcowy (None - do końca zapisu).
+        :return: Offset pierwszego wystąpienia lub -1.
+        """
+        end = self._length if end is None else min(end, self._length)
+        position = self._data_map.find(pattern, _HEADER_SIZE + start, _HEADER_SIZE + end)
+        return position - _HEADER_SIZE if position >= 0 else -1
+
+    def find_all(self, pattern, start=0, end=None):
+        """
+        Generator offsetów wszystkich (nienakładających się) wystąpień wzorca.
+        """
+        position = self.find(pattern, start, end)
+        while position >= 0:
+            yield position
+            position = self.find(pattern, position + len(pattern), end)
+
+    def count(self, pattern, start=0, end=None):
+        """
+        Zlicza wystąpienia wzorca bez kopiowania danych.
+        """
+        return sum(1 for _ in self.find_all(pattern, start, end))
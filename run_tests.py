@@ -1,13 +1,18 @@
+import argparse
 import sys
 import os
 import importlib
+import time
 from core.test_framework import TestFramework, TestGroup
 from core.logger import Logger
+from core.metrics import MetricsRegistry, MetricsServer
+from core.multi_dut import MultiDUTRunner
 from core.peripheral_manager import PeripheralManager
-from core.protocols import ModbusTRU
-from core.RPiPeripherals import RPiGPIO, RPiPWM, RPiUART, RPiI2C, RPiSPI
-from core.peripheral_config_loader import load_peripheral_configuration
-import RPi.GPIO as GPIO
+from core.profiler import TraceProfiler
+from core.recorder import Recorder, ReplayLog
+from core.sharding import DEFAULT_DURATIONS_FILE, ShardCoordinator, ShardWorker, device_capabilities
+# Moduły sprzętowe (RPi.GPIO, spidev, pymodbus) są importowane dopiero przy ładowaniu konfiguracji,
+# dzięki czemu tryb --replay działa na komputerze bez Raspberry Pi.
 
 
 def load_test_groups(test_directory):
@@ -43,19 +48,170 @@ def load_test_groups(test_directory):
 #     }
 #     return devices
 
+def stop_metrics_server(metrics_server, linger, logger):
+    """
+    Zatrzymuje serwer metryk po linger sekundach, aby metryki końca przebiegu (hil_runs_total,
+    hil_last_run_timestamp_seconds) zdążyły zostać pobrane; Ctrl+C kończy oczekiwanie wcześniej.
+    """
+    if linger > 0:
+        logger.log(f"[INFO] Keeping the metrics endpoint up for {linger:g} s (Ctrl+C to stop).", to_console=True)
+        try:
+            time.sleep(linger)
+        except KeyboardInterrupt:
+            pass
+    metrics_server.stop()
+
+
+def run_slots(arguments, logger, slots, test_groups):
+    """
+    Tryb wielu DUT: te same grupy testów uruchamiane równolegle dla każdego slotu z peripherals_config.yaml.
+    """
+    if arguments.record or arguments.profile or arguments.isolate or arguments.soak_iterations is not None \
+            or arguments.soak_duration is not None:
+        sys.exit("--record, --profile, --isolate and soak mode are not supported with DUT slots.")
+    runner = MultiDUTRunner(slots, test_groups, logger)
+    for framework in runner.frameworks:
+        framework.aggregate_results = not arguments.per_assertion
+    metrics_server = None
+    if arguments.metrics_port is not None:
+        metrics = MetricsRegistry()
+        for slot, framework in zip(slots, runner.frameworks):
+            metrics.attach_devices(slot.devices, prefix=f"{slot.name}/")
+            metrics.attach_framework(framework, slot=slot.name)
+        metrics_server = MetricsServer(metrics, arguments.metrics_host, arguments.metrics_port).start()
+        logger.log(f"[INFO] Serving metrics on http://{arguments.metrics_host}:{metrics_server.port}/metrics",
+                   to_console=True)
+    try:
+        runner.run()
+    finally:
+        if metrics_server:
+            metrics.record_run(all(result and result[0] == "PASSED" for result in runner.results))
+            metrics.detach()
+            stop_metrics_server(metrics_server, arguments.metrics_linger, logger)
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="PY_MICRO_HIL test runner")
+    parser.add_argument("--log", metavar="FILE", help="Write test results to a log file.")
+    parser.add_argument("--record", metavar="FILE", help="Record all bus transactions to a binary log file.")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="Run tests against responses from a recorded log instead of the hardware.")
+    parser.add_argument("--strict-replay", action="store_true",
+                        help="Fail a test when its bus calls differ from the recording.")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Write a Chrome/Perfetto trace-event JSON of tests, device calls and logging.")
+    parser.add_argument("--profile-cprofile", action="store_true",
+                        help="With --profile, also save cProfile stats for each test to FILE.pstats/.")
+    parser.add_argument("--metrics-port", metavar="PORT", type=int,
+                        help="Serve live Prometheus metrics on http://HOST:PORT/metrics during the run.")
+    parser.add_argument("--metrics-host", metavar="HOST", default="0.0.0.0",
+                        help="Address for the metrics endpoint (default: 0.0.0.0).")
+    parser.add_argument("--metrics-linger", metavar="SECONDS", type=float, default=15.0,
+                        help="Keep the metrics endpoint up this long after the run so the final run metrics "
+                             "can be scraped (default: 15).")
+    parser.add_argument("--soak-iterations", metavar="N", type=int,
+                        help="Soak mode: repeat the test groups N times without re-initializing devices.")
+    parser.add_argument("--soak-duration", metavar="SECONDS", type=float,
+                        help="Soak mode: repeat the test groups for the given time (first limit reached wins).")
+    parser.add_argument("--soak-progress", metavar="SECONDS", type=float, default=60.0,
+                        help="Interval between soak progress snapshots (default: 60).")
+    parser.add_argument("--soak-group", metavar="NAME", action="append",
+                        help="Soak only the named test group (can be repeated).")
+    parser.add_argument("--shard-coordinator", metavar="PORT", type=int,
+                        help="Distribute the test groups to shard workers connecting on PORT and merge their results.")
+    parser.add_argument("--shard-worker", metavar="HOST:PORT",
+                        help="Run test groups assigned by the shard coordinator at HOST:PORT.")
+    parser.add_argument("--shard-name", metavar="NAME", help="Worker name shown in the coordinator summary.")
+    parser.add_argument("--shard-durations", metavar="FILE", default=DEFAULT_DURATIONS_FILE,
+                        help=f"Historical group durations used for scheduling (default: {DEFAULT_DURATIONS_FILE}).")
+    parser.add_argument("--shard-wait", metavar="SECONDS", type=float, default=60.0,
+                        help="Mark groups as not run when no compatible worker connects in time (default: 60).")
+    parser.add_argument("--isolate", action="store_true",
+                        help="Run each test group in a pooled worker process; a crashing group is marked failed.")
+    parser.add_argument("--isolate-workers", metavar="N", type=int, default=2,
+                        help="Maximum number of worker processes kept alive in isolation mode (default: 2).")
+    parser.add_argument("--group-timeout", metavar="SECONDS", type=float,
+                        help="In isolation mode, kill a group's worker process after this time.")
+    parser.add_argument("--per-assertion", action="store_true",
+                        help="Report every assertion as a separate result instead of one result per test.")
+    return parser.parse_args(argv)
+
+
 def main():
+    arguments = parse_arguments()
+    if arguments.record and arguments.replay:
+        sys.exit("--record and --replay cannot be used together.")
+    soak = arguments.soak_iterations is not None or arguments.soak_duration is not None
+    if soak and arguments.replay:
+        sys.exit("Soak mode cannot be used with --replay (the recording holds responses for a single run).")
+
+    if arguments.shard_worker and (arguments.replay or soak):
+        sys.exit("--shard-worker cannot be used with --replay or soak mode.")
+    if arguments.isolate and (arguments.record or arguments.replay or arguments.profile or soak
+                              or arguments.shard_worker or arguments.metrics_port is not None):
+        # Opakowania metod (nagrywanie, profiler, metryki) działają tylko w procesach roboczych - ich wyniki by przepadły
+        sys.exit("--isolate cannot be used with --record, --replay, --profile, --metrics-port, soak mode "
+                 "or --shard-worker.")
+
     # Setup logger
     logger = Logger()
 
-    if len(sys.argv) > 2 and sys.argv[1] == '--log':
-        logger.log_file = sys.argv[2]
+    if arguments.log:
+        logger.log_file = arguments.log
+
+    if arguments.shard_coordinator is not None:
+        # Koordynator nie korzysta ze sprzętu - tylko rozdziela grupy i łączy wyniki
+        coordinator = ShardCoordinator(load_test_groups(os.path.join(os.path.dirname(__file__), 'tests')), logger,
+                                       port=arguments.shard_coordinator, durations_file=arguments.shard_durations,
+                                       wait_timeout=arguments.shard_wait)
+        coordinator.run()
+        return
     
     # Create PeripheralManager instance
     peripheral_manager = PeripheralManager(devices={}, logger=logger)
-    peripheral_manager.devices = load_peripheral_configuration()
+    replay = None
+    if arguments.replay:
+        replay = ReplayLog(arguments.replay, strict=arguments.strict_replay)
+        peripheral_manager.devices = replay.build_devices()
+    else:
+        from core.peripheral_config_loader import load_capabilities, load_peripheral_configuration, \
+            load_slot_configuration
+        slots = load_slot_configuration()
+        if slots and arguments.shard_worker:
+            sys.exit("--shard-worker cannot be used with DUT slots.")
+        if slots:
+            run_slots(arguments, logger, slots, load_test_groups(os.path.join(os.path.dirname(__file__), 'tests')))
+            return
+        peripheral_manager.devices = load_peripheral_configuration()
     print(peripheral_manager.devices)
     # Create TestFramework instance
     test_framework = TestFramework(peripheral_manager, logger)
+    test_framework.aggregate_results = not arguments.per_assertion
+
+    # Profiler opakowuje metody jako pierwszy, aby czasy wywołań nie obejmowały narzutu nagrywania
+    profiler = None
+    if arguments.profile:
+        profiler = TraceProfiler(arguments.profile, use_cprofile=arguments.profile_cprofile)
+        profiler.attach_devices(peripheral_manager.devices)
+        profiler.attach_logger(logger)
+
+    metrics = None
+    metrics_server = None
+    if arguments.metrics_port is not None:
+        metrics = MetricsRegistry()
+        metrics.attach_devices(peripheral_manager.devices)
+        metrics_server = MetricsServer(metrics, arguments.metrics_host, arguments.metrics_port).start()
+        logger.log(f"[INFO] Serving metrics on http://{arguments.metrics_host}:{metrics_server.port}/metrics",
+                   to_console=True)
+
+    recorder = None
+    if arguments.record:
+        recorder = Recorder(arguments.record)
+        recorder.attach(peripheral_manager.devices)
+        test_framework.add_result_listener(recorder.record_result)
+    results = []
+    if replay:
+        test_framework.add_result_listener(lambda group, test, passed, *_: results.append((group, test, passed)))
 
     # Load and add test groups automatically
     test_directory = os.path.join(os.path.dirname(__file__), 'tests')
@@ -63,14 +219,48 @@ def main():
 
     for group in test_groups:
         test_framework.add_test_group(group)
+    if profiler:
+        profiler.attach_framework(test_framework)
+    if metrics:
+        metrics.attach_framework(test_framework)
 
     try:
         # Run all tests (TestFramework should handle initialization itself)
-        test_framework.run_all_tests()
+        if soak:
+            test_framework.run_soak(arguments.soak_iterations, arguments.soak_duration, arguments.soak_progress,
+                                    arguments.soak_group)
+        elif arguments.isolate:
+            test_framework.run_isolated(arguments.isolate_workers, arguments.group_timeout)
+        elif arguments.shard_worker:
+            host, _, port = arguments.shard_worker.rpartition(":")
+            capabilities = device_capabilities(peripheral_manager.devices, load_capabilities())
+            ShardWorker(test_framework, host, int(port), arguments.shard_name, capabilities).run()
+        else:
+            test_framework.run_all_tests()
+        if metrics:
+            metrics.record_run(True)
     except SystemExit as e:
         # If tests fail or are stopped
         logger.log(f"[INFO] Test execution stopped with exit code {e.code}.")
+        if metrics:
+            metrics.record_run(False)
         sys.exit(e.code)
+    finally:
+        if metrics:
+            metrics.detach()
+            stop_metrics_server(metrics_server, arguments.metrics_linger, logger)
+        if recorder:
+            recorder.close()
+            logger.log(f"[INFO] Recorded {recorder.records} records to {arguments.record}.", to_console=True)
+        if replay:
+            replay.report(results, logger)
+        if profiler:
+            profiler.detach()
+            events = profiler.write()
+            totals = ", ".join(f"{category}: {seconds:.3f} s" for category, seconds in profiler.totals().items())
+            logger.log(f"[INFO] Wrote {events} trace events to {arguments.profile} ({totals}).", to_console=True)
+            if profiler.dropped:
+                logger.log(f"[WARNING] {profiler.dropped} trace events dropped (buffer full).", to_console=True)
 
 if __name__ == "__main__":
     main()